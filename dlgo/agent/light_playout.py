@@ -0,0 +1,136 @@
+import random
+
+from dlgo.agent.helpers_fast import is_point_an_eye
+from dlgo.goboard_fast import Move
+from dlgo.scoring import compute_playout_result
+
+
+__all__ = [
+    'LightPlayoutPolicy',
+    'simulate_random_game',
+]
+
+
+class LightPlayoutPolicy():
+    """Random playout policy that tracks the empty points of one game.
+
+    Empty points are kept in a list with swap-remove, updated on every
+    stone placed and captured through play(), so choosing a move only
+    looks at empty points. Moves are drawn uniformly from the empty
+    points that pass the eye, self capture and ko tests, as
+    FastRandomBot would pick them.
+    """
+
+    def __init__(self, game_state):
+        board = game_state.board
+        self.point_table = board.point_table
+        self.empties = []
+        # position[idx] is where the point idx sits in empties, or -1.
+        self.position = [-1] * len(self.point_table.points)
+        for idx, point in enumerate(self.point_table.points):
+            if board.get(point) is None:
+                self._add(idx)
+
+    def _add(self, idx):
+        self.position[idx] = len(self.empties)
+        self.empties.append(idx)
+
+    def _remove(self, idx):
+        pos = self.position[idx]
+        last = self.empties.pop()
+        if last != idx:
+            self.empties[pos] = last
+            self.position[last] = pos
+        self.position[idx] = -1
+
+    def _is_acceptable(self, game_state, point):
+        board = game_state.board
+        player = game_state.next_player
+        if is_point_an_eye(board, point, player):
+            return False
+        if board.is_self_capture(player, point):
+            return False
+        # Only a capturing move can repeat an earlier position.
+        return not board.will_capture(player, point) or \
+            not game_state.does_move_violate_ko(player, Move.play(point))
+
+    def select_move(self, game_state):
+        """Choose a random acceptable move, or pass if there is none."""
+        empties = self.empties
+        position = self.position
+        points = self.point_table.points
+        remaining = len(empties)
+        while remaining > 0:
+            # Sample without replacement by swapping rejected points to
+            # the end of the untried part of the list.
+            i = random.randrange(remaining)
+            remaining -= 1
+            idx = empties[i]
+            last = empties[remaining]
+            empties[i], empties[remaining] = last, idx
+            position[last], position[idx] = i, remaining
+            if self._is_acceptable(game_state, points[idx]):
+                return self.point_table.moves[idx]
+        return Move.pass_turn()
+
+    def play(self, game_state, move):
+        """Apply move to game_state in place and update the empty points.
+
+        The move is not recorded for unmake_move, since a playout never
+        takes a move back.
+        """
+        if move.is_play:
+            board = game_state.board
+            player = game_state.next_player
+            captured = set()
+            for neighbor in board.neighbors(move.point):
+                if board.get(neighbor) == player.other:
+                    string = board.get_go_string(neighbor)
+                    if string.num_liberties == 1:
+                        captured |= string.stones
+            index = self.point_table.index
+            self._remove(index[move.point])
+            for point in captured:
+                self._add(index[point])
+        game_state.make_move(move, undo=False)
+
+    def play_out(self, game_state, played=None, cutoff=None):
+        """Play game_state to the end in place and return the winner.
+
+        If played is a list, (player, point) is appended to it for every
+        stone placed. cutoff, a mcts.rollout.RolloutCutoff, may stop the
+        game early with an estimated winner.
+        """
+        num_moves = 0
+        while not game_state.is_over():
+            if cutoff is not None:
+                winner = cutoff.check(game_state, num_moves)
+                if winner is not None:
+                    cutoff.record(num_moves)
+                    return winner
+            move = self.select_move(game_state)
+            if played is not None and move.is_play:
+                played.append((game_state.next_player, move.point))
+            self.play(game_state, move)
+            num_moves += 1
+        if cutoff is not None:
+            cutoff.record(num_moves)
+        return compute_playout_result(game_state).winner
+
+
+def simulate_random_game(game_state, played=None, cutoff=None):
+    """Play a light random playout from game_state and return the winner.
+
+    game_state itself is left unchanged. played and cutoff are passed on
+    to LightPlayoutPolicy.play_out.
+    """
+    if game_state.is_over():
+        # A resignation is not decided by counting the board.
+        return game_state.winner()
+    # Engines with their own loop for this policy (goboard_array) run it.
+    light_playout = getattr(game_state, 'light_playout', None)
+    if light_playout is not None:
+        return light_playout(played, cutoff)
+    game = game_state.detached()
+    game.board.disable_move_ages()
+    return LightPlayoutPolicy(game).play_out(game, played, cutoff)
@@ -2,8 +2,7 @@ import numpy as np
 
 from dlgo.agent.base import Agent
 from dlgo.agent.helpers_fast import is_point_an_eye
-from dlgo.goboard import Move
-from dlgo.gotypes import Point
+from dlgo.goboard_fast import Move, get_point_table
 
 
 __all__ = ['FastRandomBot']
@@ -14,14 +13,13 @@ class FastRandomBot(Agent):
         Agent.__init__(self)
         self.dim = None
         self.point_cache = []
+        self.move_cache = []
 
     def _update_cache(self, dim):
         self.dim = dim
-        rows, cols = dim
-        self.point_cache = []
-        for r in range(1, rows + 1):
-            for c in range(1, cols + 1):
-                self.point_cache.append(Point(row=r, col=c))
+        point_table = get_point_table(dim)
+        self.point_cache = point_table.points
+        self.move_cache = point_table.moves
 
     def select_move(self, game_state):
         """Choose a random valid move that preserves our own eyes."""
@@ -29,13 +27,14 @@ class FastRandomBot(Agent):
         if dim != self.dim:
             self._update_cache(dim)
 
-        idx = np.arange(len(self.point_cache))
-        np.random.shuffle(idx)
-        for i in idx:
+        # permutation shuffles an arange just as before; tolist gives
+        # plain ints, which index the caches faster than NumPy scalars.
+        for i in np.random.permutation(len(self.point_cache)).tolist():
             p = self.point_cache[i]
-            if game_state.is_valid_move(Move.play(p)) and \
+            move = self.move_cache[i]
+            if game_state.is_valid_move(move) and \
                     not is_point_an_eye(game_state.board,
                                         p,
                                         game_state.next_player):
-                return Move.play(p)
+                return move
         return Move.pass_turn()
\ No newline at end of file
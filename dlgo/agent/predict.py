@@ -2,7 +2,7 @@ import numpy as np
 from dlgo.agent.base import Agent
 from dlgo.agent.helpers import is_point_an_eye
 from dlgo import encoders
-from dlgo import goboard
+from dlgo import goboard_fast
 from dlgo import kerasutil
 
 
@@ -21,6 +21,15 @@ class DeepLearningAgent(Agent):
         input_tensor = np.array([encoded_state])
         return self.model.predict(input_tensor)[0]
 
+    def predict_batch(self, game_states):
+        """
+        複数の局面をまとめて一度のmodel.predictで評価する
+        局面ごとに呼ぶよりずっと速い(特にCPUでは)
+        """
+        input_tensor = np.array(
+            [self.encoder.encode(game_state) for game_state in game_states])
+        return self.model.predict(input_tensor)
+
     def select_move(self, game_state):
         num_moves = self.encoder.board_width * self.encoder.board_height
         move_probs = self.predict(game_state)
@@ -43,14 +52,25 @@ class DeepLearningAgent(Agent):
         )
 
         # ランキングの上位から調べていき，合法手を選んで打つ
+        # goboard_fast系の局面なら，合法手の判定は局面ごとにキャッシュ
+        # されたマスクを引くだけ．マスクを持たない局面(goboard,
+        # goboard_slow)はis_valid_moveで調べる
+        # 着手は盤の大きさごとに共有されたものを使い回す
+        legal_mask = game_state.legal_mask() \
+            if hasattr(game_state, 'legal_mask') else None
         for point_idx in ranked_moves:
             point = self.encoder.decode_point_index(point_idx)
-            if game_state.is_valid_move(goboard.Move.play(point)):
+            move = goboard_fast.Move.play(point)
+            if legal_mask is not None:
+                is_legal = legal_mask[point.row - 1, point.col - 1]
+            else:
+                is_legal = game_state.is_valid_move(move)
+            if is_legal:
                 if not is_point_an_eye(game_state.board, point, game_state.next_player):
-                    return goboard.Move.play(point)
+                    return move
 
         # 合法手がなければパス
-        return goboard.Move.pass_turn()
+        return goboard_fast.Move.pass_turn()
 
     def serialize(self, h5file):
         h5file.create_group('encoder')
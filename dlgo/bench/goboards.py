@@ -0,0 +1,185 @@
+import argparse
+import copy
+import random
+import time
+
+import numpy as np
+
+from dlgo import goboard_array
+from dlgo import goboard_batch
+from dlgo import goboard_bit
+from dlgo import goboard_fast
+from dlgo.agent import light_playout
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.goboard_fast import Move
+from dlgo.gotypes import Player, Point
+
+"""
+    碁盤実装ごとの速度比較
+    1. 記録した対局をplace_stoneだけで再生する速度(盤面のコピーあり/なし)
+    2. FastRandomBot同士のランダムプレイアウトの速度と，
+       light_playout.simulate_random_gameでのプレイアウトの速度
+       (goboard_arrayは盤の添字の上で直接打つ専用のループを使う)
+       x fastはlight/sのgoboard_fastとの比
+    3. BatchBoardで--batch-size局をまとめて打つランダムプレイアウトの速度
+    --checkを付けると，計測の前に各実装がgoboard_fastと同じ結果
+    (ハッシュ，連と呼吸点，合法手，劫)になることを確認する
+    python -m dlgo.bench.goboards --board-size 19 --num-games 5 --check
+"""
+
+ENGINES = {
+    'fast': goboard_fast,
+    'array': goboard_array,
+    'bit': goboard_bit,
+}
+
+
+def record_random_game(board_size, seed):
+    """Return the (player, point) sequence of a random game on goboard_fast."""
+    random.seed(seed)
+    np.random.seed(seed)
+    bot = FastRandomBot()
+    game = goboard_fast.GameState.new_game(board_size)
+    stones = []
+    while not game.is_over():
+        move = bot.select_move(game)
+        if move.is_play:
+            stones.append((game.next_player, move.point))
+        game = game.apply_move(move)
+    return stones
+
+
+def check_conformance(engine, board_size, seed):
+    """Play a random game on goboard_fast and engine side by side.
+
+    Raises AssertionError as soon as the two disagree on the stones,
+    strings, liberties, hash, legal moves or ko points of a position.
+    """
+    rng = random.Random(seed)
+    expected = goboard_fast.GameState.new_game(board_size)
+    actual = engine.GameState.new_game(board_size)
+    while not expected.is_over():
+        for name in ('legal_mask', 'ko_mask'):
+            assert (getattr(expected, name)() ==
+                    getattr(actual, name)()).all(), name
+        assert expected.board.zobrist_hash() == actual.board.zobrist_hash()
+        for row in range(1, board_size + 1):
+            for col in range(1, board_size + 1):
+                point = Point(row=row, col=col)
+                string = actual.board.get_go_string(point)
+                assert string == expected.board.get_go_string(point)
+                if string is not None:
+                    assert string.num_liberties == len(string.liberties)
+        moves = expected.legal_moves()
+        move = moves[rng.randint(0, len(moves) - 3)] \
+            if len(moves) > 2 and rng.random() > 0.02 else Move.pass_turn()
+        expected = expected.apply_move(move)
+        actual = actual.apply_move(move)
+
+
+def replay(engine, board_size, stones, copy_board):
+    board = engine.Board(board_size, board_size)
+    for player, point in stones:
+        if copy_board:
+            board = copy.deepcopy(board)
+        board.place_stone(player, point)
+
+
+def play_random_game(engine, board_size):
+    bots = {
+        Player.black: FastRandomBot(),
+        Player.white: FastRandomBot(),
+    }
+    game = engine.GameState.new_game(board_size)
+    game.board.disable_move_ages()
+    while not game.is_over():
+        game = game.apply_move(bots[game.next_player].select_move(game))
+
+
+def time_replay(engine, board_size, games, copy_board):
+    num_stones = sum(len(stones) for stones in games)
+    start = time.perf_counter()
+    for stones in games:
+        replay(engine, board_size, stones, copy_board)
+    return (time.perf_counter() - start) / num_stones * 1e6
+
+
+def time_playouts(engine, board_size, num_games, seed):
+    # 初回だけの準備(盤の表の作成や採点のnumbaのコンパイル)が
+    # 計測に入らないよう，時計の外で1局打っておく
+    play_random_game(engine, board_size)
+    random.seed(seed)
+    np.random.seed(seed)
+    start = time.perf_counter()
+    for _ in range(num_games):
+        play_random_game(engine, board_size)
+    return num_games / (time.perf_counter() - start)
+
+
+def time_light_playouts(engine, board_size, num_games, seed):
+    game = engine.GameState.new_game(board_size)
+    # time_playoutsと同じく，1局目は時計の外で打つ
+    light_playout.simulate_random_game(game)
+    random.seed(seed)
+    start = time.perf_counter()
+    for _ in range(num_games):
+        light_playout.simulate_random_game(game)
+    return num_games / (time.perf_counter() - start)
+
+
+def time_batch_playouts(board_size, batch_size, seed):
+    rng = np.random.RandomState(seed)
+    game = goboard_fast.GameState.new_game(board_size)
+    start = time.perf_counter()
+    goboard_batch.simulate_random_games(game, batch_size, rng)
+    return batch_size / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, default=19)
+    parser.add_argument('--num-games', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engines', nargs='+', default=sorted(ENGINES))
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--check', action='store_true')
+    args = parser.parse_args()
+
+    if args.check:
+        for name in args.engines:
+            for i in range(args.num_games):
+                check_conformance(ENGINES[name], args.board_size, args.seed + i)
+            print('%-8s conforms to goboard_fast' % name)
+
+    games = [record_random_game(args.board_size, args.seed + i)
+             for i in range(args.num_games)]
+    results = {}
+    for name in args.engines:
+        engine = ENGINES[name]
+        results[name] = (
+            time_replay(engine, args.board_size, games, False),
+            time_replay(engine, args.board_size, games, True),
+            time_playouts(engine, args.board_size, args.num_games,
+                          args.seed),
+            time_light_playouts(engine, args.board_size, args.num_games,
+                                args.seed))
+    # 倍率は同じlight_playout.simulate_random_gameでのgoboard_fastとの比
+    baseline = results['fast'][3] if 'fast' in results else None
+    print('%-8s %14s %14s %12s %12s %8s' % (
+        'engine', 'us/stone', 'us/stone+copy', 'playouts/s', 'light/s',
+        'x fast'))
+    for name in args.engines:
+        replay_us, copy_us, playouts, light = results[name]
+        speedup = '%7.1fx' % (light / baseline) \
+            if baseline else '-'
+        print('%-8s %14.2f %14.2f %12.2f %12.2f %8s' % (
+            name, replay_us, copy_us, playouts, light, speedup))
+    if args.batch_size > 0:
+        print('%-8s %14s %14s %12.2f %12s %8s' % (
+            'batch', '-', '-',
+            time_batch_playouts(args.board_size, args.batch_size,
+                                args.seed), '-', '-'))
+
+
+if __name__ == '__main__':
+    main()
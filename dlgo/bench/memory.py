@@ -0,0 +1,283 @@
+import argparse
+import array
+import enum
+import gc
+import random
+import tracemalloc
+
+import numpy as np
+
+from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.bench.goboards import ENGINES
+from dlgo.gotypes import Player
+from dlgo.mcts.mcts import MCTSNode
+from dlgo.mcts.pool import NodePool
+
+"""
+    探索木のノードや局面が1つあたり何バイト使うかの計測
+    tracemallocで確保されたメモリを数え，作ったオブジェクトの数で割る
+    __slots__を使う前の数字(before)は次のように出す
+    1. 作った局面や木を辿り，__dict__を持たないdlgoのクラス(GameState,
+       GoString, Move, Pointなど)のインスタンスを数える
+    2. クラスごとに，同じ属性の値を持つ__slots__版と__dict__版の
+       インスタンスを作って1つあたりのバイト数を測る
+    3. 今のバイト数に，(__dict__版 - __slots__版) x インスタンス数を足す
+    ノードのbeforeは，さらにMCTSNodeの代わりに__slots__を使う前の
+    MCTSNode(BaselineNode)で同じ木を作って測る
+    最後にPooledMCTSAgentのNodePoolの1ノードあたりのバイト数も出す
+    python -m dlgo.bench.memory --board-size 19 --num-nodes 2000
+"""
+
+
+def traced_bytes(build):
+    """Return the bytes still allocated by build() and its result."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return after - before
+
+
+def random_game_states(engine, board_size, seed):
+    """Return every GameState of one random game, oldest first."""
+    random.seed(seed)
+    np.random.seed(seed)
+    bots = {
+        Player.black: FastRandomBot(),
+        Player.white: FastRandomBot(),
+    }
+    game = engine.GameState.new_game(board_size)
+    states = [game]
+    while not game.is_over():
+        game = game.apply_move(bots[game.next_player].select_move(game))
+        states.append(game)
+    return states
+
+
+class BaselineNode(object):
+    """MCTSNode as it was before it used __slots__.
+
+    Each node has a __dict__ and a {Player: int} win_counts dict, and
+    lists its legal moves as soon as it is created.
+    """
+
+    def __init__(self, game_state, parent=None, move=None):
+        self.game_state = game_state
+        self.parent = parent
+        self.move = move
+        self.win_counts = {
+            Player.black: 0,
+            Player.white: 0,
+        }
+        self.num_rollouts = 0
+        self.children = []
+        self.unvisited_moves = game_state.legal_moves()
+
+    def add_random_child(self):
+        index = random.randint(0, len(self.unvisited_moves) - 1)
+        new_move = self.unvisited_moves.pop(index)
+        new_node = BaselineNode(
+            self.game_state.apply_move(new_move), self, new_move)
+        self.children.append(new_node)
+        return new_node
+
+    def can_add_child(self):
+        return len(self.unvisited_moves) > 0
+
+    def is_terminal(self):
+        return self.game_state.is_over()
+
+
+# 辿らない値．盤の配列や数は__slots__の有無で大きさが変わらない
+_LEAF_TYPES = (
+    int, float, str, bytes, type(None), enum.Enum, np.ndarray,
+    array.array, type)
+
+
+def slot_names(cls):
+    """Return the slot names of cls and its bases, base classes first."""
+    names = []
+    for klass in reversed(cls.__mro__):
+        slots = klass.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(
+            name for name in slots if name not in ('__dict__', '__weakref__'))
+    return names
+
+
+def is_slotted(obj):
+    return type(obj).__module__.startswith('dlgo') and \
+        not hasattr(obj, '__dict__')
+
+
+def slotted_instances(roots, skip=()):
+    """Return {class: [instance]} of the slotted dlgo objects under roots.
+
+    Objects reachable from skip (such as the per-size tables every
+    board shares) are not followed or counted.
+    """
+    seen = set()
+    found = {}
+    for stack, record in ((list(skip), False), (list(roots), True)):
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, _LEAF_TYPES) or id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            if is_slotted(obj):
+                if record:
+                    found.setdefault(type(obj), []).append(obj)
+                if isinstance(obj, tuple):
+                    stack.extend(obj)
+                else:
+                    stack.extend(getattr(obj, name, None)
+                                 for name in slot_names(type(obj)))
+            elif isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                stack.extend(obj)
+            elif type(obj).__module__.startswith('dlgo'):
+                stack.extend(vars(obj).values())
+    return found
+
+
+def _copies(cls, samples, with_dict):
+    """Return a builder of copies of samples, with or without __dict__."""
+    if issubclass(cls, tuple):
+        # 名前付きタプルの派生クラスは__slots__ = ()が無いと__dict__を持つ
+        target = type(cls.__name__, (cls,), {}) if with_dict else cls
+        return lambda: [tuple.__new__(target, obj) for obj in samples]
+    names = slot_names(cls)
+    target = type(cls.__name__, (object,), {}) if with_dict else cls
+
+    def build():
+        copies = []
+        for obj in samples:
+            copy = target.__new__(target)
+            # 古い__init__と同じく，属性をいつも同じ順に入れる
+            for name in names:
+                setattr(copy, name, getattr(obj, name, None))
+            copies.append(copy)
+        return copies
+    return build
+
+
+def bytes_per_instance(cls, samples, with_dict):
+    # 数個しか無いクラスも，同じ数だけ作って測る
+    samples = (samples * (1000 // len(samples) + 1))[:1000]
+    build = _copies(cls, samples, with_dict)
+    # クラスごとに1度だけ作られる属性名の表を数に入れない
+    build()
+    used = traced_bytes(build)
+    # 入れ物のリストの分を引く
+    used -= traced_bytes(lambda: [None for _ in samples])
+    return used / len(samples)
+
+
+class InstanceSizes(object):
+    """Bytes per instance of each slotted class, with and without slots."""
+
+    def __init__(self):
+        self.sizes = {}
+
+    def get(self, cls, samples):
+        if cls not in self.sizes:
+            self.sizes[cls] = (
+                bytes_per_instance(cls, samples, False),
+                bytes_per_instance(cls, samples, True))
+        return self.sizes[cls]
+
+    def dict_overhead(self, instances):
+        """Return the extra bytes the instances would take with __dict__."""
+        extra = 0
+        for cls, objs in instances.items():
+            slotted, with_dict = self.get(cls, objs)
+            extra += len(objs) * (with_dict - slotted)
+        return extra
+
+
+def random_tree(engine, board_size, num_nodes, seed, node_class=MCTSNode):
+    """Grow a tree of num_nodes nodes by adding random children."""
+    random.seed(seed)
+    root = node_class(engine.GameState.new_game(board_size))
+    nodes = [root]
+    while len(nodes) < num_nodes:
+        node = random.choice(nodes)
+        if node.can_add_child() and not node.is_terminal():
+            nodes.append(node.add_random_child())
+    return nodes
+
+
+def bytes_per_state(engine, board_size, seed, sizes, skip):
+    """Return bytes per GameState of a random game, now and before slots."""
+    states = random_game_states(engine, board_size, seed)
+    used = traced_bytes(
+        lambda: random_game_states(engine, board_size, seed))
+    before = used + sizes.dict_overhead(slotted_instances(states, skip))
+    return used / len(states), before / len(states)
+
+
+def bytes_per_node(engine, board_size, num_nodes, seed, sizes, skip):
+    """Return bytes per node of a random tree, now and before slots."""
+    used = traced_bytes(
+        lambda: random_tree(engine, board_size, num_nodes, seed))
+    baseline = traced_bytes(
+        lambda: random_tree(
+            engine, board_size, num_nodes, seed, BaselineNode))
+    tree = random_tree(engine, board_size, num_nodes, seed, BaselineNode)
+    before = baseline + sizes.dict_overhead(slotted_instances(tree, skip))
+    return used / num_nodes, before / num_nodes
+
+
+def bytes_per_pooled_node(num_nodes):
+    used = traced_bytes(lambda: NodePool(num_nodes))
+    return used / num_nodes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, default=19)
+    parser.add_argument('--num-nodes', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--engines', nargs='+', default=sorted(ENGINES))
+    args = parser.parse_args()
+
+    sizes = InstanceSizes()
+    print('%-8s %12s %12s %7s %12s %12s %7s' % (
+        'engine', 'state', 'before', 'saved', 'node', 'before', 'saved'))
+    for name in args.engines:
+        engine = ENGINES[name]
+        # 盤の大きさごとの表は最初の1回だけ作られるので，計測の前に作っておく
+        # 表にあるPointなどは局面や木の数に入れない
+        skip = engine.GameState.new_game(args.board_size)
+        skip.legal_moves()
+        state, state_before = bytes_per_state(
+            engine, args.board_size, args.seed, sizes, [skip])
+        node, node_before = bytes_per_node(
+            engine, args.board_size, args.num_nodes, args.seed, sizes,
+            [skip])
+        print('%-8s %12.0f %12.0f %6.0f%% %12.0f %12.0f %6.0f%%' % (
+            name, state, state_before, 100 * (1 - state / state_before),
+            node, node_before, 100 * (1 - node / node_before)))
+    print('%-8s %12s %12s %7s %12.0f %12s %7s' % (
+        'pool', '-', '-', '-', bytes_per_pooled_node(args.num_nodes),
+        '-', '-'))
+
+    print()
+    print('%-36s %10s %10s' % ('bytes/instance', 'slots', '__dict__'))
+    for cls, (slotted, with_dict) in sorted(
+            sizes.sizes.items(),
+            key=lambda item: (item[0].__module__, item[0].__name__)):
+        print('%-36s %10.0f %10.0f' % (
+            '%s.%s' % (cls.__module__, cls.__name__), slotted, with_dict))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from dlgo.agent import light_playout
+from dlgo.agent.light_playout import LightPlayoutPolicy
+from dlgo.bench.goboards import ENGINES
+from dlgo.mcts.rollout import RolloutCutoff
+from dlgo.scoring import compute_playout_result
+
+"""
+    ロールアウトの打ち切りの速さと正確さの計測
+    打ち切りの設定ごとに，
+    1. 打ち切りありのロールアウトの1秒あたりの回数と平均手数
+    2. 同じロールアウトを最後まで打った時の勝者と，打ち切った時点の
+       見積もりの勝者が一致した割合
+    を出す
+    python -m dlgo.bench.rollouts --board-size 9 --num-games 200
+"""
+
+
+def cutoff_agreement(cutoff, game_state, num_games):
+    """Return how often cutoff's early winner matches the real winner.
+
+    Each game is played to the end; the first winner cutoff.check
+    returns is compared with the winner of the finished game.
+    """
+    agreed = 0
+    for _ in range(num_games):
+        game = game_state.detached()
+        game.board.disable_move_ages()
+        policy = LightPlayoutPolicy(game)
+        early_winner = None
+        num_moves = 0
+        while not game.is_over():
+            if early_winner is None:
+                early_winner = cutoff.check(game, num_moves)
+            policy.play(game, policy.select_move(game))
+            num_moves += 1
+        winner = compute_playout_result(game).winner
+        agreed += early_winner is None or early_winner == winner
+    return agreed / float(num_games)
+
+
+def time_rollouts(cutoff, game_state, num_games):
+    start = time.perf_counter()
+    for _ in range(num_games):
+        light_playout.simulate_random_game(game_state, cutoff=cutoff)
+    return num_games / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, default=9)
+    parser.add_argument('--num-games', type=int, default=200)
+    parser.add_argument('--engine', default='array', choices=sorted(ENGINES))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    num_points = args.board_size * args.board_size
+    settings = [
+        ('full', None, None),
+        ('moves=1.0', num_points, None),
+        ('moves=0.5', num_points // 2, None),
+        ('margin=%d' % (num_points // 4), None, num_points // 4),
+        ('margin=%d' % (num_points // 8), None, num_points // 8),
+    ]
+    game_state = ENGINES[args.engine].GameState.new_game(args.board_size)
+    print('%-12s %12s %12s %10s %10s' % (
+        'cutoff', 'rollouts/s', 'moves', 'cut', 'agree'))
+    for name, max_moves, margin in settings:
+        random.seed(args.seed)
+        np.random.seed(args.seed)
+        cutoff = RolloutCutoff(max_moves, margin)
+        speed = time_rollouts(cutoff, game_state, args.num_games)
+        moves = cutoff.moves_per_rollout
+        cut_rate = cutoff.cut_rate
+        agreement = cutoff_agreement(
+            RolloutCutoff(max_moves, margin), game_state, args.num_games)
+        print('%-12s %12.1f %12.1f %9.0f%% %9.1f%%' % (
+            name, speed, moves, 100 * cut_rate, 100 * agreement))
+
+
+if __name__ == '__main__':
+    main()
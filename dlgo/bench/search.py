@@ -0,0 +1,114 @@
+import argparse
+import random
+import time
+
+import numpy as np
+
+from dlgo.bench.goboards import ENGINES
+from dlgo.mcts.mcts import MCTSAgent
+
+"""
+    MCTSの探索の速度の計測
+    1. 子の統計を配列で持つselect_childと，子を1つずつ見てuct_scoreを
+       呼ぶ元の選び方(select_child_loop)の1回あたりの時間
+    2. MCTSAgent.select_moveの1秒あたりのラウンド数
+    --transposition-sizeを付けると置換表を使い，その当たりの割合も出す
+    python -m dlgo.bench.search --board-size 19 --num-rounds 2000
+"""
+
+
+def select_child_loop(agent, node):
+    """The per-child Python selection that select_child replaced."""
+    total_rollouts = sum(child.num_rollouts for child in node.children)
+    best_score = -1
+    best_child = None
+    for child in node.children:
+        score = agent.uct_score(
+            total_rollouts,
+            child.num_rollouts,
+            child.winning_pct(node.game_state.next_player),
+            agent.temperature)
+        if score > best_score:
+            best_score = score
+            best_child = child
+    return best_child
+
+
+def grow_tree(agent, engine, board_size, seed):
+    """Return the root of one search by agent from an empty board."""
+    random.seed(seed)
+    np.random.seed(seed)
+    return agent.search(engine.GameState.new_game(board_size))
+
+
+def expanded_nodes(root):
+    """Return every node the search descends through with select_child.
+
+    Those are the nodes whose legal moves all have a child already.
+    """
+    return [node for node in MCTSAgent.iter_nodes(root)
+            if node.children and not node.can_add_child()]
+
+
+def time_selection(select, agent, nodes, repeat):
+    """Return microseconds per child and per call of select(agent, node)."""
+    num_children = sum(len(node.children) for node in nodes)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for node in nodes:
+            select(agent, node)
+    elapsed = (time.perf_counter() - start) / repeat * 1e6
+    return elapsed / num_children, elapsed / len(nodes)
+
+
+def time_search(agent, engine, board_size, num_rounds, seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    game = engine.GameState.new_game(board_size)
+    start = time.perf_counter()
+    agent.select_move(game)
+    return num_rounds / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, default=19)
+    parser.add_argument('--num-rounds', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--temperature', type=float, default=1.5)
+    parser.add_argument('--playout', default='light')
+    parser.add_argument('--engine', default='array', choices=sorted(ENGINES))
+    parser.add_argument('--transposition-size', type=int)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    engine = ENGINES[args.engine]
+    agent = MCTSAgent(args.num_rounds, args.temperature, args.playout,
+                      reuse_tree=False,
+                      transposition_size=args.transposition_size)
+    root = grow_tree(agent, engine, args.board_size, args.seed)
+    nodes = expanded_nodes(root)
+    if agent.table is None:
+        # Shared nodes also count rollouts from their other parents, so
+        # the loop only agrees with the per-edge arrays on a plain tree.
+        for node in nodes:
+            assert select_child_loop(agent, node) is \
+                MCTSAgent.select_child(agent, node)
+
+    print('%d expanded nodes, %.1f children each' % (
+        len(nodes), sum(len(node.children) for node in nodes) / len(nodes)))
+    print('%-12s %14s %14s' % ('select', 'us/child', 'us/call'))
+    for name, select in (('loop', select_child_loop),
+                         ('vectorized', MCTSAgent.select_child)):
+        print('%-12s %14.3f %14.2f' % ((name,) + time_selection(
+            select, agent, nodes, args.repeat)))
+    print('%-12s %14.1f' % ('rounds/s', time_search(
+        agent, engine, args.board_size, args.num_rounds, args.seed)))
+    if agent.table is not None:
+        print('%-12s %13.1f%% of %d lookups, %d evicted' % (
+            'table hits', 100 * agent.table.hit_rate, agent.table.lookups,
+            agent.table.evictions))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import random
+
+import numpy as np
+
+from dlgo.bench.goboards import ENGINES
+from dlgo.gotypes import Player
+from dlgo.mcts.mcts import MCTSAgent
+from dlgo.scoring import compute_game_result
+
+"""
+    MCTSAgentの設定同士の強さの比較
+    同じ1手あたりの時間(--time-budget-ms)で，RAVEを使うエージェントと
+    使わないエージェントを先後を入れ替えながら対局させ，勝ち数と
+    1手あたりの平均ラウンド数を出す
+    python -m dlgo.bench.strength --board-size 9 --num-games 10 --time-budget-ms 200
+"""
+
+
+def play_game(engine, board_size, agents, max_moves, rounds):
+    """Play one game between agents[Player] and return the winner.
+
+    The rounds each agent completed are appended to rounds[agent]. A
+    game that reaches max_moves is scored as it stands.
+    """
+    game = engine.GameState.new_game(board_size)
+    num_moves = 0
+    while not game.is_over() and num_moves < max_moves:
+        agent = agents[game.next_player]
+        game = game.apply_move(agent.select_move(game))
+        rounds[agent].append(agent.rounds_completed)
+        num_moves += 1
+    if game.is_over():
+        return game.winner()
+    return compute_game_result(game).winner
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--board-size', type=int, default=9)
+    parser.add_argument('--num-games', type=int, default=10)
+    parser.add_argument('--time-budget-ms', type=float, default=200)
+    parser.add_argument('--temperature', type=float, default=1.5)
+    parser.add_argument('--rave-equivalence', type=float, default=1000)
+    parser.add_argument('--playout', default='light')
+    parser.add_argument('--engine', default='array', choices=sorted(ENGINES))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    engine = ENGINES[args.engine]
+    contenders = {
+        'uct': MCTSAgent(None, args.temperature, args.playout,
+                         time_budget_ms=args.time_budget_ms),
+        'rave': MCTSAgent(None, args.temperature, args.playout,
+                          time_budget_ms=args.time_budget_ms, rave=True,
+                          rave_equivalence=args.rave_equivalence),
+    }
+    wins = dict.fromkeys(contenders, 0)
+    rounds = {agent: [] for agent in contenders.values()}
+    max_moves = 2 * args.board_size * args.board_size
+    for i in range(args.num_games):
+        # 先後を1局ごとに入れ替える
+        black, white = ('rave', 'uct') if i % 2 == 0 else ('uct', 'rave')
+        winner = play_game(engine, args.board_size, {
+            Player.black: contenders[black],
+            Player.white: contenders[white],
+        }, max_moves, rounds)
+        wins[black if winner == Player.black else white] += 1
+
+    print('%-8s %8s %14s' % ('agent', 'wins', 'rounds/move'))
+    for name, agent in contenders.items():
+        print('%-8s %8d %14.1f' % (
+            name, wins[name], np.mean(rounds[agent])))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,9 @@
 import importlib
 
+import numpy as np
+
+from dlgo.goboard_fast import Move, get_point_table
+
 class Encoder():
     def name(self):
         """ ログ, 保存 """
@@ -32,4 +36,23 @@ def get_encoder_by_name(name, board_size):
         board_size = (board_size, board_size)
     module = importlib.import_module("dlgo.encoders." + name)
     constructor = getattr(module, 'create')
-    return constructor(board_size)
\ No newline at end of file
+    return constructor(board_size)
+
+
+def ko_mask(game_state):
+    """
+    劫で打てない点を表す(高さ, 幅)のbool配列
+    goboard_fast系の局面はキャッシュされたko_maskをそのまま使う
+    ko_maskを持たない局面(goboard, goboard_slow)は空点ごとに
+    does_move_violate_koで調べる
+    """
+    if hasattr(game_state, 'ko_mask'):
+        return game_state.ko_mask()
+    board = game_state.board
+    point_table = get_point_table((board.num_rows, board.num_cols))
+    mask = np.zeros((board.num_rows, board.num_cols), dtype=bool)
+    for idx, point in enumerate(point_table.points):
+        if board.get(point) is None and game_state.does_move_violate_ko(
+                game_state.next_player, Move.play(point)):
+            mask.flat[idx] = True
+    return mask
@@ -1,6 +1,6 @@
 import numpy as np
 from dlgo.encoders.base import Encoder
-from dlgo.gotypes import Point
+from dlgo.goboard_fast import get_point_table
 
 
 class OnePlaneEncoder(Encoder):
@@ -10,6 +10,8 @@ class OnePlaneEncoder(Encoder):
         # あとで複数の盤面を持つことになる他のエンコーダと比較するため
         # 便宜上num_planesを1にし，(1, height, width)にエンコードする
         self.num_planes = 1
+        self.point_table = get_point_table(
+            (self.board_height, self.board_width))
 
     def name(self):
         return 'oneplane'
@@ -19,7 +21,7 @@ class OnePlaneEncoder(Encoder):
         next_player = game_state.next_player
         for r in range(self.board_height):
             for c in range(self.board_width):
-                p = Point(row=r+1, col=c+1)
+                p = self.point_table.point(r+1, c+1)
                 go_string = game_state.board.get_go_string(p)
                 if go_string is None:
                     continue
@@ -35,9 +37,7 @@ class OnePlaneEncoder(Encoder):
 
     def decode_point_index(self, index):
         """ flattenした盤面のインデックスを盤面上の点(の座標)に変換"""
-        row = index // self.board_width
-        col = index % self.board_width
-        return Point(row=row+1, col=col+1)
+        return self.point_table.points[index]
 
     def num_points(self):
         return self.board_width * self.board_height
@@ -1,7 +1,7 @@
 import numpy as np
 
-from dlgo.encoders.base import Encoder
-from dlgo.goboard import Move, Point
+from dlgo.encoders.base import Encoder, ko_mask
+from dlgo.goboard_fast import get_point_table
 
 
 class SevenPlaneEncoder(Encoder):
@@ -13,6 +13,9 @@ class SevenPlaneEncoder(Encoder):
     def __init__(self, board_size):
         self.board_width, self.board_height = board_size
         self.num_planes = 7
+        # 盤上の点は盤の大きさごとに共有されたものを使い回す
+        self.point_table = get_point_table(
+            (self.board_height, self.board_width))
 
     def name(self):
         return 'sevenplane'
@@ -27,18 +30,18 @@ class SevenPlaneEncoder(Encoder):
             game_state.next_player.other: 3
         }
 
+        # 石が置かれていない点は劫かどうかだけ調べればよい
+        # 劫の判定はgoboard_fast系なら局面ごとにキャッシュされたマスクを使う
+        board_tensor[6] = ko_mask(game_state)
+
         # 全ての盤上の点を探索
         for row in range(self.board_height):
             for col in range(self.board_width):
 
-                p = Point(row=row+1, col=col+1)
+                p = self.point_table.point(row+1, col+1)
                 go_string = game_state.board.get_go_string(p)
 
-                # 石が置かれていない点は劫かどうかだけ調べればよい
-                if go_string is None:
-                    if game_state.does_move_violate_ko(game_state.next_player, Move.play(p)):
-                        board_tensor[6][row][col] = 1
-                else:
+                if go_string is not None:
                     # 呼吸点が3以上か，2か，1か
                     liberty_plane = min(3, go_string.num_liberties) - 1
                     liberty_plane += base_plane[go_string.color]
@@ -50,9 +53,7 @@ class SevenPlaneEncoder(Encoder):
         return self.board_width * (point.row - 1) + (point.col - 1)
 
     def decode_point_index(self, index):
-        row = index // self.board_height
-        col = index % self.boad_width
-        return Point(row=row+1, col=col+1)
+        return self.point_table.points[index]
 
     def num_points(self):
         return self.board_width * self.board_height
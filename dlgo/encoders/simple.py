@@ -1,8 +1,8 @@
 import numpy as np
 
-from dlgo.encoders.base import Encoder
-from dlgo.goboard import Move
-from dlgo.gotypes import Player, Point
+from dlgo.encoders.base import Encoder, ko_mask
+from dlgo.goboard_fast import get_point_table
+from dlgo.gotypes import Player
 
 
 class SimpleEncoder(Encoder):
@@ -18,6 +18,8 @@ class SimpleEncoder(Encoder):
         # 9. white plays next
         # 10. move would be illegal due to ko
         self.num_planes = 11
+        self.point_table = get_point_table(
+            (self.board_height, self.board_width))
 
     def name(self):
         return 'simple'
@@ -28,16 +30,13 @@ class SimpleEncoder(Encoder):
             board_tensor[8] = 1
         else:
             board_tensor[9] = 1
+        board_tensor[10] = ko_mask(game_state)
         for r in range(self.board_height):
             for c in range(self.board_width):
-                p = Point(row=r + 1, col=c + 1)
+                p = self.point_table.point(r + 1, c + 1)
                 go_string = game_state.board.get_go_string(p)
 
-                if go_string is None:
-                    if game_state.does_move_violate_ko(game_state.next_player,
-                                                       Move.play(p)):
-                        board_tensor[10][r][c] = 1
-                else:
+                if go_string is not None:
                     liberty_plane = min(4, go_string.num_liberties) - 1
                     if go_string.color == Player.white:
                         liberty_plane += 4
@@ -52,9 +51,7 @@ class SimpleEncoder(Encoder):
 
     def decode_point_index(self, index):
         """Turn an integer index into a board point."""
-        row = index // self.board_width
-        col = index % self.board_width
-        return Point(row=row + 1, col=col + 1)
+        return self.point_table.points[index]
 
     def num_points(self):
         return self.board_width * self.board_height
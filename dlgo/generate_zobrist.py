@@ -1,10 +1,12 @@
-import random
-from gotypes import Player, Point
+from dlgo.gotypes import Player, Point
+from dlgo.zobrist import HASH_CODE
 
 """
-    碁盤のゾブリストハッシュ生成用スクリプト
-    19 * 19碁盤のゾブリストハッシュ生成
-    出力をzobrist.pyに書き出す
+    碁盤のゾブリストハッシュ表を旧形式の辞書リテラルとして出力するスクリプト
+    zobrist.pyは起動時にシードから配列の表を生成するようになったので，
+    このスクリプトは旧形式の HASH_CODE = {(Point, Player): int} が
+    必要なときの互換用にだけ残している
+    python -m dlgo.generate_zobrist > zobrist_dict.py
 """
 
 
@@ -16,23 +18,16 @@ def to_python(state):
     return Player.white
 
 
-MAX63 = 0x7fffffffffffffff
-
-table = {}
-empty_board = 0
-for row in range(1, 20):
-    for col in range(1, 20):
-        for state in (Player.black, Player.white, None):
-            code = random.randint(0, MAX63)
-            table[Point(row, col), state] = code
-
 print('from .gotypes import Player, Point')
 print('')
 # from zobrish import * で取得する変数を指定している
 print("__all__ = ['HASH_CODE', 'EMPTY_BOARD']")
 print('')
 print('HASH_CODE = {')
-for (pt, state), hash_code in table.items():
-    print('    (%r, %s): %r,' % (pt, to_python(state), hash_code))
+for row in range(1, 20):
+    for col in range(1, 20):
+        for state in (Player.black, Player.white, None):
+            pt = Point(row, col)
+            print('    (%r, %s): %r,' % (pt, to_python(state), HASH_CODE[pt, state]))
 print('}')
-print('EMPTY_BOARD = %d' % (empty_board,))
+print('EMPTY_BOARD = %d' % (0,))
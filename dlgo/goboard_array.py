@@ -0,0 +1,723 @@
+import random
+from array import array
+
+import numpy as np
+from dlgo import goboard_fast
+from dlgo.goboard_fast import Move, corner_tables, get_point_table, \
+    init_corner_table, init_neighbor_table, neighbor_tables
+from dlgo.gotypes import Player
+from dlgo.scoring import compute_playout_result
+import dlgo.zobrist as zobrist
+from dlgo.utils import MoveAge
+
+"""
+    goboard_fast.Boardと同じ公開APIを持つ配列ベースの碁盤
+    盤面は周囲を番兵で囲んだ一次元の整数リストで表現し，
+    連は代表点のインデックス(string id)で管理する
+    呼吸点の数は連ごとに差分で更新するので，frozensetの作り直しが起きない
+"""
+
+__all__ = [
+    'Board',
+    'GameState',
+    'Move',
+]
+
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+BORDER = 3
+
+COLOR_TO_PLAYER = [None, Player.black, Player.white, None]
+
+index_tables = {}
+
+
+class IndexTable():
+    """Flat index geometry shared by every board of one size.
+
+    The grid is padded with one ring of BORDER cells, so point (row, col)
+    lives at index row * stride + col and its four neighbors are always
+    at idx - 1, idx + 1, idx - stride and idx + stride.
+    """
+
+    def __init__(self, dim):
+        rows, cols = dim
+        points = get_point_table(dim)
+        self.stride = cols + 2
+        self.size = (rows + 2) * self.stride
+        self.point_to_index = {}
+        self.index_to_point = [None] * self.size
+        self.empty_grid = [BORDER] * self.size
+        self.zeros = [0] * self.size
+        # hash_deltas[idx][color] flips an empty point to a stone.
+        self.hash_deltas = [(0, 0, 0)] * self.size
+        deltas = zobrist.hash_deltas(rows, cols)
+        for r in range(1, rows + 1):
+            for c in range(1, cols + 1):
+                p = points.point(r, c)
+                idx = r * self.stride + c
+                self.point_to_index[p] = idx
+                self.index_to_point[idx] = p
+                self.empty_grid[idx] = EMPTY
+                self.hash_deltas[idx] = deltas[(r - 1) * cols + (c - 1)]
+
+
+def init_index_table(dim):
+    index_tables[dim] = IndexTable(dim)
+
+
+class GoString():
+    """A view of one string on an array board.
+
+    Color and liberty count are read when the view is created; stones
+    and liberties are collected on first access, so the view is only
+    meaningful until the board changes.
+    """
+
+    __slots__ = (
+        '_board', '_root', 'color', 'num_liberties', '_stones', '_liberties')
+
+    def __init__(self, board, root):
+        self._board = board
+        self._root = root
+        self.color = COLOR_TO_PLAYER[board._grid[root]]
+        self.num_liberties = board._liberties[root]
+        self._stones = None
+        self._liberties = None
+
+    @property
+    def stones(self):
+        if self._stones is None:
+            board = self._board
+            self._stones = frozenset(
+                board._index_to_point[idx]
+                for idx in board._string_indices(self._root))
+        return self._stones
+
+    @property
+    def liberties(self):
+        if self._liberties is None:
+            board = self._board
+            self._liberties = frozenset(
+                board._index_to_point[idx]
+                for idx in board._liberty_indices(self._root))
+        return self._liberties
+
+    def __eq__(self, other):
+        return isinstance(other, (GoString, goboard_fast.GoString)) and \
+            self.color == other.color and \
+            self.stones == other.stones and \
+            self.liberties == other.liberties
+
+
+class Board():
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+        dim = (num_rows, num_cols)
+        if dim not in neighbor_tables:
+            init_neighbor_table(dim)
+        if dim not in corner_tables:
+            init_corner_table(dim)
+        if dim not in index_tables:
+            init_index_table(dim)
+        self.point_table = get_point_table(dim)
+        self.neighbor_table = neighbor_tables[dim]
+        self.corner_table = corner_tables[dim]
+        self._set_index_table(index_tables[dim])
+
+        table = self._index_table
+        self._grid = bytearray(table.empty_grid)
+        # Union-find over stones: every stone points at the root of its
+        # string. Strings are relabelled eagerly on merge (smaller into
+        # larger), so a lookup is a single list access.
+        self._string_id = array('H', table.zeros)
+        # Circular linked list threading the stones of each string.
+        self._next_stone = array('H', table.zeros)
+        # Per-string counters, only valid at the root index.
+        self._num_stones = array('H', table.zeros)
+        self._liberties = array('H', table.zeros)
+        self._hash = zobrist.EMPTY_BOARD
+        self.move_ages = MoveAge(self)
+        self._undo_log = []
+
+    def _set_index_table(self, table):
+        self._index_table = table
+        self._stride = table.stride
+        self._point_to_index = table.point_to_index
+        self._index_to_point = table.index_to_point
+        self._hash_deltas = table.hash_deltas
+
+    def disable_move_ages(self):
+        """Stop tracking move ages on this board and on its copies.
+
+        Only encoders that read move_ages need them; random playouts can
+        skip the bookkeeping entirely.
+        """
+        self.move_ages = None
+
+    def _move_ages_state(self, points):
+        if self.move_ages is None:
+            return None
+        return self.move_ages.state(points)
+
+    def neighbors(self, point):
+        return self.neighbor_table[point]
+
+    def corners(self, point):
+        return self.corner_table[point]
+
+    def place_stone(self, player, point):
+        assert self.is_on_grid(point)
+        idx = self._point_to_index[point]
+        grid = self._grid
+        if grid[idx] != EMPTY:
+            print('Illegal play on %s' % str(point))
+        assert grid[idx] == EMPTY
+        if self.move_ages is not None:
+            self.move_ages.increment_all()
+            self.move_ages.add(point)
+        self._place(idx, player.value)
+
+    def _place(self, idx, color):
+        """Put a stone of color on the empty index idx.
+
+        Returns the indices of the stones it captured.
+        """
+        grid = self._grid
+        string_id = self._string_id
+        liberties = self._liberties
+        stride = self._stride
+
+        # 0. Examine the adjacent points.
+        adjacent_same_color = []
+        adjacent_opposite_color = []
+        num_empty = 0
+        for neighbor in (idx - stride, idx + stride, idx - 1, idx + 1):
+            neighbor_color = grid[neighbor]
+            if neighbor_color == EMPTY:
+                num_empty += 1
+            elif neighbor_color == BORDER:
+                continue
+            elif neighbor_color == color:
+                root = string_id[neighbor]
+                if root not in adjacent_same_color:
+                    adjacent_same_color.append(root)
+            else:
+                root = string_id[neighbor]
+                if root not in adjacent_opposite_color:
+                    adjacent_opposite_color.append(root)
+
+        grid[idx] = color
+        self._hash ^= self._hash_deltas[idx][color]
+        string_id[idx] = idx
+        self._next_stone[idx] = idx
+        self._num_stones[idx] = 1
+
+        # 1. Merge any adjacent strings of the same color.
+        if not adjacent_same_color:
+            liberties[idx] = num_empty
+        elif len(adjacent_same_color) == 1:
+            root = adjacent_same_color[0]
+            # The new stone used up one liberty and may add the empty
+            # points next to it that the string did not touch yet.
+            new_liberties = liberties[root] - 1
+            for neighbor in (idx - stride, idx + stride, idx - 1, idx + 1):
+                if grid[neighbor] == EMPTY and \
+                        string_id[neighbor - stride] != root and \
+                        string_id[neighbor + stride] != root and \
+                        string_id[neighbor - 1] != root and \
+                        string_id[neighbor + 1] != root:
+                    new_liberties += 1
+            self._join(root, idx)
+            liberties[root] = new_liberties
+        else:
+            root = max(adjacent_same_color, key=self._num_stones.__getitem__)
+            self._join(root, idx)
+            for other in adjacent_same_color:
+                if other != root:
+                    self._join(root, other)
+            liberties[root] = len(self._liberty_indices(root))
+
+        # 2. Reduce liberties of any adjacent strings of the opposite
+        #    color.
+        # 3. If any opposite color strings now have zero liberties,
+        #    remove them.
+        captured = []
+        for other_root in adjacent_opposite_color:
+            liberties[other_root] -= 1
+            if liberties[other_root] == 0:
+                captured.extend(self._remove_string(other_root))
+        return captured
+
+    def make_move(self, player, point):
+        """Place a stone in place, recording how to take it back.
+
+        Every table entry place_stone can write is saved first: the new
+        point, the roots of adjacent strings, the relabelled stones of
+        friendly strings merged into the largest one, and for a capture
+        the removed stones plus the roots of strings touching them.
+        """
+        idx = self._point_to_index[point]
+        grid = self._grid
+        string_id = self._string_id
+        num_stones = self._num_stones
+        stride = self._stride
+        color = player.value
+        changed = [idx]
+        captured = []
+        adjacent_roots = []
+        friendly_roots = []
+        for neighbor in (idx - stride, idx + stride, idx - 1, idx + 1):
+            neighbor_color = grid[neighbor]
+            if neighbor_color == EMPTY or neighbor_color == BORDER:
+                continue
+            root = string_id[neighbor]
+            if root in adjacent_roots:
+                continue
+            adjacent_roots.append(root)
+            changed.append(root)
+            if neighbor_color == color:
+                friendly_roots.append(root)
+            elif self._liberties[root] == 1:
+                for stone in self._string_indices(root):
+                    changed.append(stone)
+                    captured.append(stone)
+                    for adjacent in (stone - stride, stone + stride,
+                                     stone - 1, stone + 1):
+                        if EMPTY < grid[adjacent] < BORDER:
+                            changed.append(string_id[adjacent])
+        if len(friendly_roots) > 1:
+            largest = max(friendly_roots, key=num_stones.__getitem__)
+            for root in friendly_roots:
+                if root != largest:
+                    changed.extend(self._string_indices(root))
+        saved = [
+            (i, grid[i], string_id[i], self._next_stone[i],
+             num_stones[i], self._liberties[i])
+            for i in set(changed)]
+        index_to_point = self._index_to_point
+        self._undo_log.append((
+            saved, self._hash,
+            self._move_ages_state(
+                [point] + [index_to_point[i] for i in captured])))
+        self.place_stone(player, point)
+
+    def unmake_move(self):
+        """Take back the last stone placed with make_move."""
+        saved, self._hash, move_ages = self._undo_log.pop()
+        grid = self._grid
+        string_id = self._string_id
+        next_stone = self._next_stone
+        num_stones = self._num_stones
+        liberties = self._liberties
+        for i, color, root, next_idx, stones, libs in saved:
+            grid[i] = color
+            string_id[i] = root
+            next_stone[i] = next_idx
+            num_stones[i] = stones
+            liberties[i] = libs
+        if move_ages is not None:
+            self.move_ages.restore(move_ages)
+
+    def _join(self, root, other):
+        """Relabel the string at `other` into the string at `root`."""
+        string_id = self._string_id
+        next_stone = self._next_stone
+        idx = other
+        while True:
+            string_id[idx] = root
+            idx = next_stone[idx]
+            if idx == other:
+                break
+        # Splice the two circular lists together.
+        next_stone[root], next_stone[other] = \
+            next_stone[other], next_stone[root]
+        self._num_stones[root] += self._num_stones[other]
+
+    def _string_indices(self, root):
+        next_stone = self._next_stone
+        indices = [root]
+        idx = next_stone[root]
+        while idx != root:
+            indices.append(idx)
+            idx = next_stone[idx]
+        return indices
+
+    def _liberty_indices(self, root):
+        grid = self._grid
+        stride = self._stride
+        found = set()
+        for idx in self._string_indices(root):
+            for neighbor in (idx - stride, idx + stride, idx - 1, idx + 1):
+                if grid[neighbor] == EMPTY:
+                    found.add(neighbor)
+        return found
+
+    def _remove_string(self, root):
+        grid = self._grid
+        string_id = self._string_id
+        liberties = self._liberties
+        stride = self._stride
+        color = grid[root]
+        hash_deltas = self._hash_deltas
+        removed = self._string_indices(root)
+        for idx in removed:
+            if self.move_ages is not None:
+                self.move_ages.reset_age(self._index_to_point[idx])
+            grid[idx] = EMPTY
+            string_id[idx] = 0
+            # Remove filled point hash code, add empty point hash code.
+            self._hash ^= hash_deltas[idx][color]
+        # Removing a string can create liberties for other strings.
+        for idx in removed:
+            touched = []
+            for neighbor in (idx - stride, idx + stride, idx - 1, idx + 1):
+                if EMPTY < grid[neighbor] < BORDER:
+                    neighbor_root = string_id[neighbor]
+                    if neighbor_root not in touched:
+                        touched.append(neighbor_root)
+                        liberties[neighbor_root] += 1
+        return removed
+
+    def is_self_capture(self, player, point):
+        idx = self._point_to_index[point]
+        grid = self._grid
+        string_id = self._string_id
+        liberties = self._liberties
+        stride = self._stride
+        color = player.value
+        all_friendly_in_atari = True
+        for neighbor in (idx - stride, idx + stride, idx - 1, idx + 1):
+            neighbor_color = grid[neighbor]
+            if neighbor_color == EMPTY:
+                # This point has a liberty. Can't be self capture.
+                return False
+            elif neighbor_color == BORDER:
+                continue
+            elif neighbor_color == color:
+                if liberties[string_id[neighbor]] != 1:
+                    all_friendly_in_atari = False
+            elif liberties[string_id[neighbor]] == 1:
+                # This move is real capture, not a self capture.
+                return False
+        return all_friendly_in_atari
+
+    def will_capture(self, player, point):
+        idx = self._point_to_index[point]
+        grid = self._grid
+        string_id = self._string_id
+        liberties = self._liberties
+        stride = self._stride
+        opponent = player.other.value
+        for neighbor in (idx - stride, idx + stride, idx - 1, idx + 1):
+            if grid[neighbor] == opponent and \
+                    liberties[string_id[neighbor]] == 1:
+                # This move would capture.
+                return True
+        return False
+
+    def zobrist_hash_after(self, player, point):
+        """Return the hash the board would have after player plays point.
+
+        Only the XOR deltas of the new stone and of any captured stones
+        are applied, so the board is neither copied nor changed.
+        """
+        idx = self._point_to_index[point]
+        grid = self._grid
+        string_id = self._string_id
+        hash_deltas = self._hash_deltas
+        stride = self._stride
+        opponent = player.other.value
+        next_hash = self._hash ^ hash_deltas[idx][player.value]
+        captured = []
+        for neighbor in (idx - stride, idx + stride, idx - 1, idx + 1):
+            if grid[neighbor] != opponent:
+                continue
+            root = string_id[neighbor]
+            if self._liberties[root] != 1 or root in captured:
+                continue
+            captured.append(root)
+            for stone in self._string_indices(root):
+                next_hash ^= hash_deltas[stone][opponent]
+        return next_hash
+
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and \
+            1 <= point.col <= self.num_cols
+
+    def is_point_an_eye(self, point, color):
+        """Same rule as helpers_fast.is_point_an_eye, read off the grid.
+
+        Off-board neighbors and corners are BORDER cells of the padding.
+        """
+        idx = self._point_to_index[point]
+        grid = self._grid
+        if grid[idx] != EMPTY:
+            return False
+        stride = self._stride
+        color = color.value
+        # All adjacent points must contain friendly stones.
+        for neighbor in (idx - stride, idx + stride, idx - 1, idx + 1):
+            neighbor_color = grid[neighbor]
+            if neighbor_color != color and neighbor_color != BORDER:
+                return False
+        friendly_corners = 0
+        off_board_corners = 0
+        for corner in (idx - stride - 1, idx - stride + 1,
+                       idx + stride - 1, idx + stride + 1):
+            corner_color = grid[corner]
+            if corner_color == color:
+                friendly_corners += 1
+            elif corner_color == BORDER:
+                off_board_corners += 1
+        if off_board_corners > 0:
+            return off_board_corners + friendly_corners == 4
+        return friendly_corners >= 3
+
+    def get(self, point):
+        """Return the content of a point on the board.
+
+        Returns None if the point is empty, or a Player if there is a
+        stone on that point.
+        """
+        return COLOR_TO_PLAYER[self._grid[self._point_to_index[point]]]
+
+    def get_go_string(self, point):
+        """Return the entire string of stones at a point.
+
+        Returns None if the point is empty, or a GoString if there is
+        a stone on that point.
+        """
+        idx = self._point_to_index[point]
+        if self._grid[idx] == EMPTY:
+            return None
+        return GoString(self, self._string_id[idx])
+
+    def color_array(self):
+        """Return the colors part of stone_arrays() on its own."""
+        shape = (self.num_rows + 2, self.num_cols + 2)
+        # int8 like the other engines, so compiled kernels that take the
+        # colors are specialized only once.
+        return np.frombuffer(self._grid, dtype=np.int8).reshape(shape).copy()
+
+    def stone_arrays(self):
+        """Return (colors, liberties) as padded (rows + 2, cols + 2) arrays.
+
+        colors holds Player.value for stones, 0 for empty points and 3 on
+        the ring of off-board points around the edge; liberties holds the
+        liberty count of the string on each stone.
+        """
+        shape = (self.num_rows + 2, self.num_cols + 2)
+        colors = np.frombuffer(self._grid, dtype=np.int8)
+        roots = np.frombuffer(self._string_id, dtype=np.uint16)
+        liberties = np.frombuffer(
+            self._liberties, dtype=np.uint16)[roots].astype(np.int16)
+        return colors.reshape(shape).copy(), liberties.reshape(shape)
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and \
+            self.num_rows == other.num_rows and \
+            self.num_cols == other.num_cols and \
+            self._grid == other._grid
+
+    def copy(self):
+        """Return a copy of the board, as copy.deepcopy(board) does."""
+        copied = Board.__new__(Board)
+        copied.num_rows = self.num_rows
+        copied.num_cols = self.num_cols
+        copied.point_table = self.point_table
+        copied.neighbor_table = self.neighbor_table
+        copied.corner_table = self.corner_table
+        copied._set_index_table(self._index_table)
+        # All tables are flat arrays of ints, so slicing copies them
+        # with a single memcpy.
+        copied._grid = self._grid[:]
+        copied._string_id = self._string_id[:]
+        copied._next_stone = self._next_stone[:]
+        copied._num_stones = self._num_stones[:]
+        copied._liberties = self._liberties[:]
+        copied._hash = self._hash
+        copied.move_ages = None if self.move_ages is None \
+            else self.move_ages.copy()
+        copied._undo_log = []
+        return copied
+
+    def __deepcopy__(self, memodict={}):
+        return self.copy()
+
+    def zobrist_hash(self):
+        return self._hash
+
+
+class GameState(goboard_fast.GameState):
+    """goboard_fast.GameState playing on an array-backed Board."""
+
+    __slots__ = ()
+
+    def apply_move(self, move):
+        """Return the new GameState after applying the move."""
+        if move.is_play:
+            next_board = self.board.copy()
+            next_board.place_stone(self.next_player, move.point)
+        else:
+            next_board = self.board
+        return self.__class__(
+            next_board, self.next_player.other, self, move)
+
+    def is_valid_move(self, move):
+        if not move.is_play:
+            return not self.is_over()
+        # Random players mostly propose occupied points, so look at the
+        # grid before anything else.
+        board = self.board
+        point = move.point
+        if board._grid[board._point_to_index[point]] != EMPTY:
+            return False
+        if self.is_over():
+            return False
+        if self._legal_mask is not None:
+            return bool(self._legal_mask[point.row - 1, point.col - 1])
+        player = self.next_player
+        return not board.is_self_capture(player, point) and \
+            not self.does_move_violate_ko(player, move)
+
+    def light_playout(self, played=None, cutoff=None):
+        """Return the winner of a light random playout from this state.
+
+        Plays the policy of light_playout.LightPlayoutPolicy (uniform over
+        the empty points that are not own eyes, self captures or superko
+        violations; pass if there are none) directly on the grid indices
+        of a copy of the board, without a GameState per move. played and
+        cutoff work as in LightPlayoutPolicy.play_out. This state is left
+        unchanged.
+        """
+        game = self.detached()
+        board = game.board
+        board.disable_move_ages()
+        grid = board._grid
+        string_id = board._string_id
+        liberties = board._liberties
+        hash_deltas = board._hash_deltas
+        stride = board._stride
+        index_to_point = board._index_to_point
+        history = self.previous_states
+        seen = set()
+        rand = random.random
+
+        empties = [idx for idx in board._point_to_index.values()
+                   if grid[idx] == EMPTY]
+        # position[idx] is where idx sits in empties.
+        position = [0] * len(grid)
+        for i, idx in enumerate(empties):
+            position[idx] = i
+
+        color = self.next_player.value
+        passes = 1 if self.last_move is not None and \
+            self.last_move.is_pass else 0
+        num_moves = 0
+        while passes < 2:
+            if cutoff is not None:
+                winner = cutoff.check(game, num_moves)
+                if winner is not None:
+                    cutoff.record(num_moves)
+                    return winner
+            opponent = 3 - color
+            seen.add((COLOR_TO_PLAYER[color], board._hash))
+            move = -1
+            remaining = len(empties)
+            while remaining > 0:
+                # Sample without replacement, swapping rejected points to
+                # the end of the untried part of the list.
+                i = int(rand() * remaining)
+                remaining -= 1
+                idx = empties[i]
+                last = empties[remaining]
+                empties[i] = last
+                empties[remaining] = idx
+                position[last] = i
+                position[idx] = remaining
+
+                neighbors = (idx - stride, idx + stride, idx - 1, idx + 1)
+                # Own eye: every neighbor is a friendly stone or off the
+                # board, and enough diagonals are friendly.
+                eye = True
+                for neighbor in neighbors:
+                    if grid[neighbor] != color and grid[neighbor] != BORDER:
+                        eye = False
+                        break
+                if eye:
+                    friendly = 0
+                    off_board = 0
+                    for corner in (idx - stride - 1, idx - stride + 1,
+                                   idx + stride - 1, idx + stride + 1):
+                        if grid[corner] == color:
+                            friendly += 1
+                        elif grid[corner] == BORDER:
+                            off_board += 1
+                    if (off_board + friendly == 4) if off_board \
+                            else friendly >= 3:
+                        continue
+
+                # The new stone needs an empty neighbor, a friendly string
+                # with liberties to spare or a capture.
+                breathes = False
+                captures = []
+                for neighbor in neighbors:
+                    neighbor_color = grid[neighbor]
+                    if neighbor_color == EMPTY:
+                        breathes = True
+                    elif neighbor_color == color:
+                        if liberties[string_id[neighbor]] > 1:
+                            breathes = True
+                    elif neighbor_color == opponent:
+                        root = string_id[neighbor]
+                        if liberties[root] == 1 and root not in captures:
+                            captures.append(root)
+                if not captures:
+                    if breathes:
+                        move = idx
+                        break
+                    continue
+                # Only a capturing move can repeat an earlier position.
+                next_hash = board._hash ^ hash_deltas[idx][color]
+                for root in captures:
+                    for stone in board._string_indices(root):
+                        next_hash ^= hash_deltas[stone][opponent]
+                situation = (COLOR_TO_PLAYER[opponent], next_hash)
+                if situation not in seen and situation not in history:
+                    move = idx
+                    break
+
+            if move < 0:
+                passes += 1
+            else:
+                passes = 0
+                if played is not None:
+                    played.append((COLOR_TO_PLAYER[color],
+                                   index_to_point[move]))
+                # Swap-remove the point from the empty list and add back
+                # whatever the stone captured.
+                i = position[move]
+                last = empties.pop()
+                if last != move:
+                    empties[i] = last
+                    position[last] = i
+                for stone in board._place(move, color):
+                    position[stone] = len(empties)
+                    empties.append(stone)
+            color = opponent
+            num_moves += 1
+
+        if cutoff is not None:
+            cutoff.record(num_moves)
+        return compute_playout_result(game).winner
+
+    @classmethod
+    def new_game(cls, board_size):
+        if isinstance(board_size, int):
+            board_size = (board_size, board_size)
+        board = Board(*board_size)
+        return GameState(board, Player.black, None, None)
@@ -0,0 +1,404 @@
+import numpy as np
+from dlgo import goboard_fast
+from dlgo.goboard_fast import Move, corner_tables, get_point_table, \
+    init_corner_table, init_neighbor_table, neighbor_tables
+from dlgo.gotypes import Player
+import dlgo.zobrist as zobrist
+from dlgo.utils import MoveAge
+
+"""
+    Pythonの多倍長整数をビット集合として使う碁盤
+    黒石・白石をそれぞれ一つの整数で持ち，連の探索(flood fill)や呼吸点，
+    石の取り上げはシフトとマスクの演算で行う
+    各行の右端に1ビットの空きを入れているので，左右のシフトで行をまたがない
+"""
+
+__all__ = [
+    'Board',
+    'GameState',
+    'Move',
+]
+
+bit_tables = {}
+
+
+def popcount(bits):
+    return bin(bits).count('1')
+
+
+def iter_bits(bits):
+    """Yield the index of every set bit, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class BitTable():
+    """Bit layout shared by every board of one size.
+
+    Point (row, col) is bit (row - 1) * width + (col - 1), where width is
+    num_cols + 1. The spare column is never part of on_board, so a shift
+    by one never wraps a stone onto the next row.
+    """
+
+    def __init__(self, dim):
+        rows, cols = dim
+        points = get_point_table(dim)
+        self.width = cols + 1
+        self.num_bits = rows * self.width
+        self.num_bytes = (self.num_bits + 7) // 8
+        self.on_board = 0
+        self.point_to_index = {}
+        self.index_to_point = [None] * self.num_bits
+        # hash_deltas[idx][color] flips an empty point to a stone.
+        self.hash_deltas = [(0, 0, 0)] * self.num_bits
+        deltas = zobrist.hash_deltas(rows, cols)
+        for r in range(1, rows + 1):
+            for c in range(1, cols + 1):
+                p = points.point(r, c)
+                idx = (r - 1) * self.width + (c - 1)
+                self.on_board |= 1 << idx
+                self.point_to_index[p] = idx
+                self.index_to_point[idx] = p
+                self.hash_deltas[idx] = deltas[(r - 1) * cols + (c - 1)]
+        self.neighbor_bits = [0] * self.num_bits
+        for idx in self.point_to_index.values():
+            bit = 1 << idx
+            self.neighbor_bits[idx] = self.dilate(bit) & ~bit
+
+    def dilate(self, bits):
+        """Return bits plus every on-board point next to one of them."""
+        width = self.width
+        return (bits | bits << 1 | bits >> 1 | bits << width |
+                bits >> width) & self.on_board
+
+    def flood(self, seed, region):
+        """Return the connected part of region that contains seed."""
+        dilate = self.dilate
+        string = seed
+        while True:
+            grown = dilate(string) & region
+            if grown == string:
+                return string
+            string = grown
+
+    def unpack(self, bits):
+        """Return bits as a (rows, cols) array of 0 and 1."""
+        data = np.frombuffer(
+            bits.to_bytes(self.num_bytes, 'little'), dtype=np.uint8)
+        # unpackbits is most-significant-bit first within each byte.
+        unpacked = np.unpackbits(data).reshape(-1, 8)[:, ::-1].ravel()
+        return unpacked[:self.num_bits].reshape(-1, self.width)[:, :-1]
+
+
+def init_bit_table(dim):
+    bit_tables[dim] = BitTable(dim)
+
+
+class GoString():
+    """A string on a bit board, kept as stone and liberty bit sets."""
+
+    __slots__ = (
+        '_table', 'color', 'stone_bits', 'liberty_bits', 'num_liberties')
+
+    def __init__(self, table, color, stone_bits, liberty_bits):
+        self._table = table
+        self.color = color
+        self.stone_bits = stone_bits
+        self.liberty_bits = liberty_bits
+        self.num_liberties = popcount(liberty_bits)
+
+    @property
+    def stones(self):
+        index_to_point = self._table.index_to_point
+        return frozenset(
+            index_to_point[idx] for idx in iter_bits(self.stone_bits))
+
+    @property
+    def liberties(self):
+        index_to_point = self._table.index_to_point
+        return frozenset(
+            index_to_point[idx] for idx in iter_bits(self.liberty_bits))
+
+    def __eq__(self, other):
+        return isinstance(other, (GoString, goboard_fast.GoString)) and \
+            self.color == other.color and \
+            self.stones == other.stones and \
+            self.liberties == other.liberties
+
+
+class Board():
+    def __init__(self, num_rows, num_cols):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+
+        dim = (num_rows, num_cols)
+        if dim not in neighbor_tables:
+            init_neighbor_table(dim)
+        if dim not in corner_tables:
+            init_corner_table(dim)
+        if dim not in bit_tables:
+            init_bit_table(dim)
+        self.point_table = get_point_table(dim)
+        self.neighbor_table = neighbor_tables[dim]
+        self.corner_table = corner_tables[dim]
+        self._table = bit_tables[dim]
+        self._black = 0
+        self._white = 0
+        self._hash = zobrist.EMPTY_BOARD
+        self.move_ages = MoveAge(self)
+        self._undo_log = []
+
+    def disable_move_ages(self):
+        """Stop tracking move ages on this board and on its copies.
+
+        Only encoders that read move_ages need them; random playouts can
+        skip the bookkeeping entirely.
+        """
+        self.move_ages = None
+
+    def _move_ages_state(self, player, point):
+        """Return the move ages that placing a stone at point changes.
+
+        Those are the point itself and the opponent strings whose only
+        liberty it is.
+        """
+        if self.move_ages is None:
+            return None
+        table = self._table
+        idx = table.point_to_index[point]
+        bit = 1 << idx
+        points = [point]
+        for string in self._adjacent_strings(
+                idx, self._stones_of(player.other)):
+            if self._liberty_bits(string) == bit:
+                points.extend(table.index_to_point[i]
+                              for i in iter_bits(string))
+        return self.move_ages.state(points)
+
+    def neighbors(self, point):
+        return self.neighbor_table[point]
+
+    def corners(self, point):
+        return self.corner_table[point]
+
+    def _stones_of(self, player):
+        return self._black if player == Player.black else self._white
+
+    def _empty(self):
+        return self._table.on_board & ~(self._black | self._white)
+
+    def _adjacent_strings(self, idx, region):
+        """Yield each string of region that touches the point idx."""
+        flood = self._table.flood
+        candidates = self._table.neighbor_bits[idx] & region
+        while candidates:
+            string = flood(candidates & -candidates, region)
+            candidates &= ~string
+            yield string
+
+    def _liberty_bits(self, string):
+        return self._table.dilate(string) & self._empty()
+
+    def place_stone(self, player, point):
+        assert self.is_on_grid(point)
+        idx = self._table.point_to_index[point]
+        bit = 1 << idx
+        if (self._black | self._white) & bit:
+            print('Illegal play on %s' % str(point))
+        assert not (self._black | self._white) & bit
+        if self.move_ages is not None:
+            self.move_ages.increment_all()
+            self.move_ages.add(point)
+
+        # Adding the stone merges adjacent friendly strings for free:
+        # strings are recomputed by flood fill whenever they are needed.
+        if player == Player.black:
+            self._black |= bit
+        else:
+            self._white |= bit
+        self._hash ^= self._table.hash_deltas[idx][player.value]
+
+        # Remove any opposite color strings left without liberties.
+        other = player.other
+        for string in list(self._adjacent_strings(idx, self._stones_of(other))):
+            if not self._liberty_bits(string):
+                self._remove_string(other, string)
+
+    def _remove_string(self, player, string):
+        if player == Player.black:
+            self._black &= ~string
+        else:
+            self._white &= ~string
+        hash_deltas = self._table.hash_deltas
+        index_to_point = self._table.index_to_point
+        for idx in iter_bits(string):
+            if self.move_ages is not None:
+                self.move_ages.reset_age(index_to_point[idx])
+            self._hash ^= hash_deltas[idx][player.value]
+
+    def make_move(self, player, point):
+        """Place a stone in place, recording how to take it back.
+
+        The whole position is two ints and a hash, so the undo record
+        is just the previous values plus the move ages that change.
+        """
+        self._undo_log.append((
+            self._black, self._white, self._hash,
+            self._move_ages_state(player, point)))
+        self.place_stone(player, point)
+
+    def unmake_move(self):
+        """Take back the last stone placed with make_move."""
+        self._black, self._white, self._hash, move_ages = \
+            self._undo_log.pop()
+        if move_ages is not None:
+            self.move_ages.restore(move_ages)
+
+    def is_self_capture(self, player, point):
+        idx = self._table.point_to_index[point]
+        if self._table.neighbor_bits[idx] & self._empty():
+            # This point has a liberty. Can't be self capture.
+            return False
+        for string in self._adjacent_strings(
+                idx, self._stones_of(player.other)):
+            if popcount(self._liberty_bits(string)) == 1:
+                # This move is real capture, not a self capture.
+                return False
+        for string in self._adjacent_strings(idx, self._stones_of(player)):
+            if popcount(self._liberty_bits(string)) != 1:
+                return False
+        return True
+
+    def will_capture(self, player, point):
+        idx = self._table.point_to_index[point]
+        for string in self._adjacent_strings(
+                idx, self._stones_of(player.other)):
+            if popcount(self._liberty_bits(string)) == 1:
+                # This move would capture.
+                return True
+        return False
+
+    def zobrist_hash_after(self, player, point):
+        """Return the hash the board would have after player plays point.
+
+        Only the XOR deltas of the new stone and of any captured stones
+        are applied, so the board is neither copied nor changed.
+        """
+        idx = self._table.point_to_index[point]
+        hash_deltas = self._table.hash_deltas
+        next_hash = self._hash ^ hash_deltas[idx][player.value]
+        other = player.other
+        for string in self._adjacent_strings(idx, self._stones_of(other)):
+            if popcount(self._liberty_bits(string)) == 1:
+                for stone in iter_bits(string):
+                    next_hash ^= hash_deltas[stone][other.value]
+        return next_hash
+
+    def is_on_grid(self, point):
+        return 1 <= point.row <= self.num_rows and \
+            1 <= point.col <= self.num_cols
+
+    def get(self, point):
+        """Return the content of a point on the board.
+
+        Returns None if the point is empty, or a Player if there is a
+        stone on that point.
+        """
+        bit = 1 << self._table.point_to_index[point]
+        if self._black & bit:
+            return Player.black
+        if self._white & bit:
+            return Player.white
+        return None
+
+    def get_go_string(self, point):
+        """Return the entire string of stones at a point.
+
+        Returns None if the point is empty, or a GoString if there is
+        a stone on that point.
+        """
+        color = self.get(point)
+        if color is None:
+            return None
+        bit = 1 << self._table.point_to_index[point]
+        string = self._table.flood(bit, self._stones_of(color))
+        return GoString(
+            self._table, color, string, self._liberty_bits(string))
+
+    def color_array(self):
+        """Return the colors part of stone_arrays() on its own."""
+        table = self._table
+        colors = np.full(
+            (self.num_rows + 2, self.num_cols + 2), 3, dtype=np.int8)
+        colors[1:-1, 1:-1] = table.unpack(self._black) + \
+            2 * table.unpack(self._white)
+        return colors
+
+    def stone_arrays(self):
+        """Return (colors, liberties) as padded (rows + 2, cols + 2) arrays.
+
+        colors holds Player.value for stones, 0 for empty points and 3 on
+        the ring of off-board points around the edge; liberties holds the
+        liberty count of the string on each stone.
+        """
+        table = self._table
+        shape = (self.num_rows + 2, self.num_cols + 2)
+        colors = self.color_array()
+        liberties = np.zeros(shape, dtype=np.int16)
+        width = self.num_cols + 2
+        indices = []
+        stone_liberties = []
+        for stones in (self._black, self._white):
+            remaining = stones
+            while remaining:
+                string = table.flood(remaining & -remaining, stones)
+                remaining &= ~string
+                num_liberties = popcount(self._liberty_bits(string))
+                for idx in iter_bits(string):
+                    row, col = divmod(idx, table.width)
+                    indices.append((row + 1) * width + col + 1)
+                    stone_liberties.append(num_liberties)
+        liberties.put(indices, stone_liberties)
+        return colors, liberties
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and \
+            self.num_rows == other.num_rows and \
+            self.num_cols == other.num_cols and \
+            self._black == other._black and \
+            self._white == other._white
+
+    def __deepcopy__(self, memodict={}):
+        copied = Board.__new__(Board)
+        copied.num_rows = self.num_rows
+        copied.num_cols = self.num_cols
+        copied.point_table = self.point_table
+        copied.neighbor_table = self.neighbor_table
+        copied.corner_table = self.corner_table
+        copied._table = self._table
+        # ints are immutable, so the copy can share them.
+        copied._black = self._black
+        copied._white = self._white
+        copied._hash = self._hash
+        copied.move_ages = None if self.move_ages is None \
+            else self.move_ages.copy()
+        copied._undo_log = []
+        return copied
+
+    def zobrist_hash(self):
+        return self._hash
+
+
+class GameState(goboard_fast.GameState):
+    """goboard_fast.GameState playing on a bitboard."""
+
+    __slots__ = ()
+
+    @classmethod
+    def new_game(cls, board_size):
+        if isinstance(board_size, int):
+            board_size = (board_size, board_size)
+        board = Board(*board_size)
+        return GameState(board, Player.black, None, None)
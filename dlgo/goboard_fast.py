@@ -1,4 +1,5 @@
 import copy
+import numpy as np
 from dlgo.gotypes import Player, Point
 from dlgo.scoring import compute_game_result
 import dlgo.zobrist as zobrist
@@ -8,45 +9,98 @@ __all__ = [
     'Board',
     'GameState',
     'Move',
+    'PointTable',
+    'get_point_table',
 ]
 
 neighbor_tables = {}
 corner_tables = {}
+hash_delta_tables = {}
+point_tables = {}
+# Canonical Move.play(point) for every point of every table built so far.
+interned_moves = {}
+
+
+class PointTable():
+    """Canonical Point and Move.play objects for one board size.
+
+    points and moves are row-major, so the flat index
+    (row - 1) * num_cols + (col - 1) works for both, and index maps a
+    Point back to it. Hot loops can reuse these objects instead of
+    building new ones; the same Point is shared by every board size.
+    """
+
+    def __init__(self, dim):
+        self.num_rows, self.num_cols = dim
+        self.points = []
+        self.moves = []
+        self.index = {}
+        for r in range(1, self.num_rows + 1):
+            for c in range(1, self.num_cols + 1):
+                p = Point(row=r, col=c)
+                move = interned_moves.get(p)
+                if move is None:
+                    move = Move(point=p)
+                    interned_moves[p] = move
+                self.index[move.point] = len(self.points)
+                self.points.append(move.point)
+                self.moves.append(move)
+
+    def point(self, row, col):
+        return self.points[(row - 1) * self.num_cols + (col - 1)]
+
+
+def init_point_table(dim):
+    point_tables[dim] = PointTable(dim)
+
+
+def get_point_table(dim):
+    if dim not in point_tables:
+        init_point_table(dim)
+    return point_tables[dim]
 
 
 def init_neighbor_table(dim):
     rows, cols = dim
+    points = get_point_table(dim)
     new_table = {}
-    for r in range(1, rows + 1):
-        for c in range(1, cols + 1):
-            p = Point(row=r, col=c)
-            full_neighbors = p.neighbors()
-            true_neighbors = [
-                n for n in full_neighbors
-                if 1 <= n.row <= rows and 1 <= n.col <= cols]
-            new_table[p] = true_neighbors
+    for p in points.points:
+        full_neighbors = p.neighbors()
+        true_neighbors = [
+            points.point(n.row, n.col) for n in full_neighbors
+            if 1 <= n.row <= rows and 1 <= n.col <= cols]
+        new_table[p] = true_neighbors
     neighbor_tables[dim] = new_table
 
 
 def init_corner_table(dim):
     rows, cols = dim
+    points = get_point_table(dim)
     new_table = {}
-    for r in range(1, rows + 1):
-        for c in range(1, cols + 1):
-            p = Point(row=r, col=c)
-            full_corners = [
-                Point(row=p.row - 1, col=p.col - 1),
-                Point(row=p.row - 1, col=p.col + 1),
-                Point(row=p.row + 1, col=p.col - 1),
-                Point(row=p.row + 1, col=p.col + 1),
-            ]
-            true_corners = [
-                n for n in full_corners
-                if 1 <= n.row <= rows and 1 <= n.col <= cols]
-            new_table[p] = true_corners
+    for p in points.points:
+        full_corners = [
+            Point(row=p.row - 1, col=p.col - 1),
+            Point(row=p.row - 1, col=p.col + 1),
+            Point(row=p.row + 1, col=p.col - 1),
+            Point(row=p.row + 1, col=p.col + 1),
+        ]
+        true_corners = [
+            points.point(n.row, n.col) for n in full_corners
+            if 1 <= n.row <= rows and 1 <= n.col <= cols]
+        new_table[p] = true_corners
     corner_tables[dim] = new_table
 
 
+def init_hash_delta_table(dim):
+    rows, cols = dim
+    deltas = zobrist.hash_deltas(rows, cols)
+    points = get_point_table(dim)
+    new_table = {}
+    for idx, p in enumerate(points.points):
+        new_table[p] = deltas[idx]
+    hash_delta_tables[dim] = new_table
+
+
 class IllegalMoveError(Exception):
     pass
 
@@ -56,6 +110,8 @@ class GoString():
     same color.
     """
 
+    __slots__ = ('color', 'stones', 'liberties')
+
     def __init__(self, color, stones, liberties):
         self.color = color
         self.stones = frozenset(stones)
@@ -105,9 +161,27 @@ class Board():
             init_neighbor_table(dim)
         if dim not in corner_tables:
             init_corner_table(dim)
+        if dim not in hash_delta_tables:
+            init_hash_delta_table(dim)
+        self.point_table = get_point_table(dim)
         self.neighbor_table = neighbor_tables[dim]
         self.corner_table = corner_tables[dim]
+        self.hash_delta_table = hash_delta_tables[dim]
         self.move_ages = MoveAge(self)
+        self._undo_log = []
+
+    def disable_move_ages(self):
+        """Stop tracking move ages on this board and on its copies.
+
+        Only encoders that read move_ages need them; random playouts can
+        skip the bookkeeping entirely.
+        """
+        self.move_ages = None
+
+    def _move_ages_state(self, points):
+        if self.move_ages is None:
+            return None
+        return self.move_ages.state(points)
 
     def neighbors(self, point):
         return self.neighbor_table[point]
@@ -124,8 +198,9 @@ class Board():
         adjacent_same_color = []
         adjacent_opposite_color = []
         liberties = []
-        self.move_ages.increment_all()
-        self.move_ages.add(point)
+        if self.move_ages is not None:
+            self.move_ages.increment_all()
+            self.move_ages.add(point)
         for neighbor in self.neighbor_table[point]:
             neighbor_string = self._grid.get(neighbor)
             if neighbor_string is None:
@@ -143,10 +218,8 @@ class Board():
             new_string = new_string.merged_with(same_color_string)
         for new_string_point in new_string.stones:
             self._grid[new_string_point] = new_string
-        # Remove empty-point hash code.
-        self._hash ^= zobrist.HASH_CODE[point, None]
-        # Add filled point hash code.
-        self._hash ^= zobrist.HASH_CODE[point, player]
+        # Remove empty-point hash code and add filled point hash code.
+        self._hash ^= self.hash_delta_table[point][player.value]
 # end::apply_zobrist[]
 
         # 2. Reduce liberties of any adjacent strings of the opposite
@@ -160,13 +233,57 @@ class Board():
             else:
                 self._remove_string(other_color_string)
 
+    def make_move(self, player, point):
+        """Place a stone in place, recording how to take it back.
+
+        Only the grid entries that place_stone can overwrite are saved:
+        the point itself, every string next to it, and for a capture the
+        strings that gain liberties from the removed stones. Move ages are
+        restored from the points of the captured stones.
+        """
+        changed = {point: self._grid.get(point)}
+        captured = []
+        for neighbor in self.neighbor_table[point]:
+            neighbor_string = self._grid.get(neighbor)
+            if neighbor_string is None:
+                continue
+            for stone in neighbor_string.stones:
+                changed[stone] = neighbor_string
+            if neighbor_string.color != player and \
+                    neighbor_string.num_liberties == 1 and \
+                    neighbor_string not in captured:
+                captured.append(neighbor_string)
+                for stone in neighbor_string.stones:
+                    for adjacent in self.neighbor_table[stone]:
+                        adjacent_string = self._grid.get(adjacent)
+                        if adjacent_string is None or \
+                                adjacent_string is neighbor_string:
+                            continue
+                        for other_stone in adjacent_string.stones:
+                            changed[other_stone] = adjacent_string
+        captured_stones = [
+            stone for string in captured for stone in string.stones]
+        self._undo_log.append((
+            changed, self._hash,
+            self._move_ages_state([point] + captured_stones)))
+        self.place_stone(player, point)
+
+    def unmake_move(self):
+        """Take back the last stone placed with make_move."""
+        changed, self._hash, move_ages = self._undo_log.pop()
+        for point, string in changed.items():
+            self._grid[point] = string
+        if move_ages is not None:
+            self.move_ages.restore(move_ages)
+
     def _replace_string(self, new_string):
         for point in new_string.stones:
             self._grid[point] = new_string
 
     def _remove_string(self, string):
         for point in string.stones:
-            self.move_ages.reset_age(point)
+            if self.move_ages is not None:
+                self.move_ages.reset_age(point)
             # Removing a string can create liberties for other strings.
             for neighbor in self.neighbor_table[point]:
                 neighbor_string = self._grid.get(neighbor)
@@ -175,10 +292,8 @@ class Board():
                 if neighbor_string is not string:
                     self._replace_string(neighbor_string.with_liberty(point))
             self._grid[point] = None
-            # Remove filled point hash code.
-            self._hash ^= zobrist.HASH_CODE[point, string.color]
-            # Add empty point hash code.
-            self._hash ^= zobrist.HASH_CODE[point, None]
+            # Remove filled point hash code and add empty point hash code.
+            self._hash ^= self.hash_delta_table[point][string.color.value]
 
     def is_self_capture(self, player, point):
         friendly_strings = []
@@ -211,6 +326,28 @@ class Board():
                     return True
         return False
 
+    def zobrist_hash_after(self, player, point):
+        """Return the hash the board would have after player plays point.
+
+        Only the XOR deltas of the new stone and of any captured stones
+        are applied, so the board is neither copied nor changed.
+        """
+        hash_delta_table = self.hash_delta_table
+        next_hash = self._hash ^ hash_delta_table[point][player.value]
+        captured = []
+        for neighbor in self.neighbor_table[point]:
+            neighbor_string = self._grid.get(neighbor)
+            if neighbor_string is None or \
+                    neighbor_string.color == player or \
+                    neighbor_string.num_liberties != 1 or \
+                    neighbor_string in captured:
+                continue
+            captured.append(neighbor_string)
+            color = neighbor_string.color.value
+            for stone in neighbor_string.stones:
+                next_hash ^= hash_delta_table[stone][color]
+        return next_hash
+
     def is_on_grid(self, point):
         return 1 <= point.row <= self.num_rows and \
             1 <= point.col <= self.num_cols
@@ -237,6 +374,48 @@ class Board():
             return None
         return string
 
+    def color_array(self):
+        """Return the colors part of stone_arrays() on its own."""
+        width = self.num_cols + 2
+        colors = np.full((self.num_rows + 2, width), 3, dtype=np.int8)
+        colors[1:-1, 1:-1] = 0
+        black = Player.black
+        black_stones = []
+        white_stones = []
+        for (row, col), string in self._grid.items():
+            if string is not None:
+                stones = black_stones if string.color is black \
+                    else white_stones
+                stones.append(row * width + col)
+        colors.put(black_stones, 1)
+        colors.put(white_stones, 2)
+        return colors
+
+    def stone_arrays(self):
+        """Return (colors, liberties) as padded (rows + 2, cols + 2) arrays.
+
+        colors holds Player.value for stones, 0 for empty points and 3 on
+        the ring of off-board points around the edge; liberties holds the
+        liberty count of the string on each stone.
+        """
+        width = self.num_cols + 2
+        shape = (self.num_rows + 2, width)
+        colors = np.full(shape, 3, dtype=np.int8)
+        colors[1:-1, 1:-1] = 0
+        liberties = np.zeros(shape, dtype=np.int16)
+        black = Player.black
+        indices = []
+        stone_colors = []
+        stone_liberties = []
+        for (row, col), string in self._grid.items():
+            if string is not None:
+                indices.append(row * width + col)
+                stone_colors.append(1 if string.color is black else 2)
+                stone_liberties.append(len(string.liberties))
+        colors.put(indices, stone_colors)
+        liberties.put(indices, stone_liberties)
+        return colors, liberties
+
     def __eq__(self, other):
         return isinstance(other, Board) and \
             self.num_rows == other.num_rows and \
@@ -249,6 +428,10 @@ class Board():
         # (immutable) to GoStrings (also immutable)
         copied._grid = copy.copy(self._grid)
         copied._hash = self._hash
+        copied.move_ages = None if self.move_ages is None \
+            else self.move_ages.copy()
+        # The copy is a snapshot; moves made on this board cannot be
+        # unmade on it.
         return copied
 
 # tag::return_zobrist[]
@@ -263,25 +446,38 @@ class Move():
     Exactly one of is_play, is_pass, is_resign will be set.
     """
 
+    __slots__ = ('point', 'is_play', 'is_pass', 'is_resign', '_hash')
+
     def __init__(self, point=None, is_pass=False, is_resign=False):
         assert (point is not None) ^ is_pass ^ is_resign
         self.point = point
         self.is_play = (self.point is not None)
         self.is_pass = is_pass
         self.is_resign = is_resign
+        self._hash = hash((
+            self.is_play,
+            self.is_pass,
+            self.is_resign,
+            self.point))
 
     @classmethod
     def play(cls, point):
-        """A move that places a stone on the board."""
-        return Move(point=point)
+        """A move that places a stone on the board.
+
+        Points of any board size seen so far get their canonical Move.
+        """
+        move = interned_moves.get(point)
+        if move is None:
+            move = Move(point=point)
+        return move
 
     @classmethod
     def pass_turn(cls):
-        return Move(is_pass=True)
+        return PASS
 
     @classmethod
     def resign(cls):
-        return Move(is_resign=True)
+        return RESIGN
 
     def __str__(self):
         if self.is_pass:
@@ -291,13 +487,11 @@ class Move():
         return '(r %d, c %d)' % (self.point.row, self.point.col)
 
     def __hash__(self):
-        return hash((
-            self.is_play,
-            self.is_pass,
-            self.is_resign,
-            self.point))
+        return self._hash
 
     def __eq__(self, other):
+        if self is other:
+            return True
         return (
             self.is_play,
             self.is_pass,
@@ -309,17 +503,110 @@ class Move():
             other.point)
 
 
+PASS = Move(is_pass=True)
+RESIGN = Move(is_resign=True)
+
+
+class _HistoryBranch():
+    """One line of play in a SituationHistory tree.
+
+    The first fork_depth entries of the line belong to the parent branch;
+    first_seen maps each situation added on this branch to the earliest
+    depth it was added at.
+    """
+
+    __slots__ = ('parent', 'fork_depth', 'length', 'first_seen')
+
+    def __init__(self, parent, fork_depth):
+        self.parent = parent
+        self.fork_depth = fork_depth
+        self.length = fork_depth
+        self.first_seen = {}
+
+
+class SituationHistory():
+    """Persistent set of the (player, zobrist hash) situations seen so far.
+
+    Histories that extend one another share branches, so adding a
+    situation is O(1) and lookups only visit one dict per fork in the
+    line of play instead of copying a frozenset on every move.
+    """
+
+    __slots__ = ('_branch', '_length')
+
+    def __init__(self, branch=None, length=0):
+        if branch is None:
+            branch = _HistoryBranch(None, 0)
+        self._branch = branch
+        self._length = length
+
+    def add(self, situation):
+        """Return a new history that also contains situation."""
+        branch = self._branch
+        if branch.length != self._length:
+            # Someone already extended this line; fork a new branch.
+            branch = _HistoryBranch(branch, self._length)
+        branch.first_seen.setdefault(situation, self._length)
+        branch.length += 1
+        return SituationHistory(branch, self._length + 1)
+
+    def __contains__(self, situation):
+        branch = self._branch
+        limit = self._length
+        while branch is not None:
+            depth = branch.first_seen.get(situation)
+            if depth is not None and depth < limit:
+                return True
+            limit = branch.fork_depth
+            branch = branch.parent
+        return False
+
+    def __iter__(self):
+        seen = set()
+        branch = self._branch
+        limit = self._length
+        while branch is not None:
+            for situation, depth in branch.first_seen.items():
+                if depth < limit and situation not in seen:
+                    seen.add(situation)
+                    yield situation
+            limit = branch.fork_depth
+            branch = branch.parent
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
 class GameState():
+    # Search trees hold one GameState per node, so the states carry no
+    # __dict__. Subclasses must declare __slots__ = () to keep it so.
+    __slots__ = (
+        'board',
+        'next_player',
+        'previous_state',
+        'previous_states',
+        'last_move',
+        '_previous_move',
+        '_made_moves',
+        '_legal_mask',
+        '_ko_mask',
+    )
+
     def __init__(self, board, next_player, previous, move):
         self.board = board
         self.next_player = next_player
         self.previous_state = previous
+        self._previous_move = None if previous is None \
+            else previous.last_move
+        # Undo records of make_move, created on the first one.
+        self._made_moves = None
+        self._legal_mask = None
+        self._ko_mask = None
         if previous is None:
-            self.previous_states = frozenset()
+            self.previous_states = SituationHistory()
         else:
-            self.previous_states = frozenset(
-                previous.previous_states |
-                {(previous.next_player, previous.board.zobrist_hash())})
+            self.previous_states = previous.previous_states.add(
+                (previous.next_player, previous.board.zobrist_hash()))
         self.last_move = move
 
     def apply_move(self, move):
@@ -329,7 +616,73 @@ class GameState():
             next_board.place_stone(self.next_player, move.point)
         else:
             next_board = self.board
-        return GameState(next_board, self.next_player.other, self, move)
+        return self.__class__(
+            next_board, self.next_player.other, self, move)
+
+    def make_move(self, move, undo=True):
+        """Apply the move to this GameState in place.
+
+        The board is changed without copying, and the fields the move
+        replaces are pushed as one tuple for unmake_move. No GameState is
+        built for the position before the move, so previous_state is None
+        while moves are made; previous_move and the superko history stay
+        complete. With undo=False nothing is recorded, on the state or the
+        board, and the move cannot be unmade; playouts that never take a
+        move back use it.
+        """
+        if undo:
+            if self._made_moves is None:
+                self._made_moves = []
+            self._made_moves.append((
+                self.previous_state, self.previous_states, self.last_move,
+                self._previous_move, self._legal_mask, self._ko_mask))
+        self.previous_states = self.previous_states.add(
+            (self.next_player, self.board.zobrist_hash()))
+        if move.is_play:
+            if undo:
+                self.board.make_move(self.next_player, move.point)
+            else:
+                self.board.place_stone(self.next_player, move.point)
+        self.previous_state = None
+        self.next_player = self.next_player.other
+        self._previous_move = self.last_move
+        self.last_move = move
+        self._legal_mask = None
+        self._ko_mask = None
+
+    def unmake_move(self):
+        """Take back the last move applied with make_move."""
+        assert self._made_moves, 'no move to unmake'
+        if self.last_move.is_play:
+            self.board.unmake_move()
+        self.next_player = self.next_player.other
+        (self.previous_state, self.previous_states, self.last_move,
+         self._previous_move, self._legal_mask, self._ko_mask) = \
+            self._made_moves.pop()
+
+    @property
+    def previous_move(self):
+        """The move played before last_move, or None."""
+        return self._previous_move
+
+    def detached(self):
+        """Return an equivalent GameState that owns a copy of the board.
+
+        make_move and unmake_move on the result leave this state alone.
+        The superko history is shared rather than extended, so the copy
+        costs one board copy.
+        """
+        detached = self.__class__.__new__(self.__class__)
+        detached.board = copy.deepcopy(self.board)
+        detached.next_player = self.next_player
+        detached.previous_state = self.previous_state
+        detached.previous_states = self.previous_states
+        detached.last_move = self.last_move
+        detached._previous_move = self._previous_move
+        detached._made_moves = None
+        detached._legal_mask = self._legal_mask
+        detached._ko_mask = self._ko_mask
+        return detached
 
     @classmethod
     def new_game(cls, board_size):
@@ -352,9 +705,9 @@ class GameState():
             return False
         if not self.board.will_capture(player, move.point):
             return False
-        next_board = copy.deepcopy(self.board)
-        next_board.place_stone(player, move.point)
-        next_situation = (player.other, next_board.zobrist_hash())
+        next_situation = (
+            player.other,
+            self.board.zobrist_hash_after(player, move.point))
         return next_situation in self.previous_states
 
     def is_valid_move(self, move):
@@ -362,6 +715,9 @@ class GameState():
             return False
         if move.is_pass or move.is_resign:
             return True
+        if self._legal_mask is not None:
+            return bool(
+                self._legal_mask[move.point.row - 1, move.point.col - 1])
         return (
             self.board.get(move.point) is None and
             not self.is_move_self_capture(self.next_player, move) and
@@ -372,20 +728,69 @@ class GameState():
             return False
         if self.last_move.is_resign:
             return True
-        second_last_move = self.previous_state.last_move
+        second_last_move = self._previous_move
         if second_last_move is None:
             return False
         return self.last_move.is_pass and second_last_move.is_pass
 
+    def legal_mask(self):
+        """Return a read-only (rows, cols) bool array of legal plays.
+
+        A point is legal when it is empty, is not a self capture and does
+        not violate ko. The mask is computed once per position.
+        """
+        if self._legal_mask is None:
+            self._compute_masks()
+        return self._legal_mask
+
+    def ko_mask(self):
+        """Return a read-only (rows, cols) bool array of ko violations."""
+        if self._ko_mask is None:
+            self._compute_masks()
+        return self._ko_mask
+
+    def _compute_masks(self):
+        colors, liberties = self.board.stone_arrays()
+        player = self.next_player.value
+        opponent = self.next_player.other.value
+        empty = colors == 0
+        capturable = (colors == opponent) & (liberties == 1)
+        # A neighbor that keeps a new stone alive: an empty point, an
+        # opponent string it captures or a friendly string with liberties
+        # to spare.
+        breathing = empty | capturable | \
+            ((colors == player) & (liberties != 1))
+
+        def any_neighbor(plane):
+            return plane[:-2, 1:-1] | plane[2:, 1:-1] | \
+                plane[1:-1, :-2] | plane[1:-1, 2:]
+
+        empty = empty[1:-1, 1:-1]
+        captures = empty & any_neighbor(capturable)
+        legal = empty & any_neighbor(breathing)
+
+        # Only a capturing move can repeat an earlier position.
+        ko = np.zeros(legal.shape, dtype=bool)
+        moves = self.board.point_table.moves
+        for idx in np.flatnonzero(captures).tolist():
+            if self.does_move_violate_ko(self.next_player, moves[idx]):
+                ko.flat[idx] = True
+                legal.flat[idx] = False
+
+        if self.is_over():
+            legal[:] = False
+        legal.flags.writeable = False
+        ko.flags.writeable = False
+        self._legal_mask = legal
+        self._ko_mask = ko
+
     def legal_moves(self):
         if self.is_over():
             return []
-        moves = []
-        for row in range(1, self.board.num_rows + 1):
-            for col in range(1, self.board.num_cols + 1):
-                move = Move.play(Point(row, col))
-                if self.is_valid_move(move):
-                    moves.append(move)
+        point_moves = self.board.point_table.moves
+        moves = [
+            point_moves[idx]
+            for idx in np.flatnonzero(self.legal_mask()).tolist()]
         # These two moves are always legal.
         moves.append(Move.pass_turn())
         moves.append(Move.resign())
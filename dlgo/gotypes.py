@@ -11,6 +11,8 @@ class Player(enum.Enum):
 
 
 class Point(namedtuple('Point', 'row col')):
+    __slots__ = ()
+
     def neighbors(self):
         return[
             Point(self.row -1, self.col),
@@ -1,35 +1,165 @@
-import random, math
+import functools, random, math, time, warnings
+import numpy as np
 from dlgo.gotypes import Player
+from dlgo.agent import light_playout
 from dlgo.agent.base import Agent
 from dlgo.agent.naive_fast import FastRandomBot
+from dlgo.mcts.rollout import RolloutCutoff
+from dlgo.mcts.transposition import TranspositionTable, position_key
+from dlgo.scoring import compute_playout_result
+
+class WinCounts(object):
+    """
+    プレイヤーごとの勝ったロールアウトの数
+    以前の{Player: int}の辞書と同じくwin_counts[Player.black]で読み書きできる
+    ノードごとに1つ作られるので，辞書ではなく2つのスロットに持つ
+    """
+    __slots__ = ('black', 'white')
+
+    def __init__(self, black=0, white=0):
+        self.black = black
+        self.white = white
+
+    def __getitem__(self, player):
+        if player == Player.black:
+            return self.black
+        if player == Player.white:
+            return self.white
+        raise KeyError(player)
+
+    def __setitem__(self, player, count):
+        if player == Player.black:
+            self.black = count
+        elif player == Player.white:
+            self.white = count
+        else:
+            raise KeyError(player)
+
+    def __iter__(self):
+        return iter((Player.black, Player.white))
+
+    def __len__(self):
+        return 2
+
+    def keys(self):
+        return [Player.black, Player.white]
+
+    def values(self):
+        return [self.black, self.white]
+
+    def items(self):
+        return [(Player.black, self.black), (Player.white, self.white)]
+
+    def __eq__(self, other):
+        return dict(self.items()) == dict(other.items()) \
+            if hasattr(other, 'items') else NotImplemented
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
 
 class MCTSNode(object):
+    # 木には大量のノードが作られるので，__dict__を持たせずにメモリを節約する
+    __slots__ = (
+        'game_state',
+        'parent',
+        'move',
+        'win_counts',
+        'num_rollouts',
+        'children',
+        'unvisited_moves',
+        'child_moves',
+        'child_rollouts',
+        'child_wins',
+        'total_child_rollouts',
+        'child_points',
+        'amaf_rollouts',
+        'amaf_wins',
+    )
+
     def __init__(self, game_state, parent=None, move=None):
         self.game_state = game_state # 現在のゲーム状態
         self.parent = parent # 親のMCTSNode, NoneならRoot
         self.move = move # このノードに繋がった直前の着手
 
         # このノードから開始しtあロールアウトに関する統計情報
-        self.win_counts = {
-            Player.black: 0,
-            Player.white: 0,
-        }
+        # 辞書と同じくPlayerで引けるが，辞書より小さいWinCountsで持つ
+        self.win_counts = WinCounts()
         self.num_rollouts = 0
 
         # 全ての子のノードのリスト
         self.children = []
 
+        # 子への枝ごとの着手と統計を子の順番に並べたもの
+        # (select_childで一度に計算するため)
+        # child_winsはこの局面で手番のプレイヤーから見た子の勝ち数
+        # 置換表を使うと一つの子を複数の親が共有するので，着手も枝の側に持つ
+        # 葉のノードには子が無いので，最初の子を追加する時に確保する
+        self.child_moves = None
+        self.child_rollouts = None
+        self.child_wins = None
+        self.total_child_rollouts = 0
+
+        # RAVEを使う時だけ作る，点ごとのAMAF(all-moves-as-first)の統計と
+        # 子の着手の点の番号(パスと投了はどの点でもない最後の番号)
+        self.child_points = None
+        self.amaf_rollouts = None
+        self.amaf_wins = None
+
         # まだ木に追加されていない，この局面から伸びる全ての合法手のリスト
-        self.unvisited_moves = game_state.legal_moves()
+        # 一度しか訪れない葉も多いので，合法手は2回目に訪れて子を追加する
+        # 時まで作らない(Noneはまだ作っていないことを表す)
+        self.unvisited_moves = None
 
-    def add_random_child(self):
+    def untried_moves(self):
+        """
+        まだ木に追加されていない合法手のリストを返す
+        最初に呼ばれた時に合法手を作る
+        """
+        if self.unvisited_moves is None:
+            self.unvisited_moves = self.game_state.legal_moves()
+        return self.unvisited_moves
+
+    def add_random_child(self, table=None):
         """
         新しい子をランダムに選び，木に追加する
         """
-        index = random.randint(0, len(self.unvisited_moves) - 1)
-        new_move = self.unvisited_moves.pop(index)
+        index = random.randint(0, len(self.untried_moves()) - 1)
+        return self.add_child(index, table)
+
+    def add_child(self, index, table=None):
+        """
+        untried_movesのindex番目の手を子として木に追加する
+        table(TranspositionTable)に同じ局面のノードがあれば，それを子にする
+        その枝の統計は共有するノードの統計から始める
+        """
+        unvisited_moves = self.untried_moves()
+        new_move = unvisited_moves.pop(index)
         new_game_state = self.game_state.apply_move(new_move)
-        new_node = MCTSNode(new_game_state, self, new_move)
+        if self.child_rollouts is None:
+            # 子の数は最初の合法手の数を超えない
+            capacity = len(unvisited_moves) + 1
+            self.child_moves = []
+            self.child_rollouts = np.zeros(capacity, dtype=np.int32)
+            self.child_wins = np.zeros(capacity, dtype=np.int32)
+        slot = len(self.children)
+
+        key = None
+        new_node = None
+        # 終局した局面は手順によって勝者が変わるので共有しない
+        if table is not None and not new_game_state.is_over():
+            key = position_key(new_game_state)
+            new_node = table.get(key)
+        if new_node is None:
+            new_node = MCTSNode(new_game_state, self, new_move)
+            if key is not None:
+                table.put(key, new_node)
+        else:
+            self.child_rollouts[slot] = new_node.num_rollouts
+            self.child_wins[slot] = \
+                new_node.win_counts[self.game_state.next_player]
+            self.total_child_rollouts += new_node.num_rollouts
+        self.child_moves.append(new_move)
         self.children.append(new_node)
         return new_node
     
@@ -39,12 +169,21 @@ class MCTSNode(object):
         """
         self.win_counts[winner] += 1
         self.num_rollouts += 1
+
+    def record_child_win(self, index, winner):
+        """
+        index番目の子への枝の統計を更新
+        """
+        self.child_rollouts[index] += 1
+        self.total_child_rollouts += 1
+        if winner == self.game_state.next_player:
+            self.child_wins[index] += 1
     
     def can_add_child(self):
         """
         この局面にまだ木に追加されていない合法手があるかどうかを返す
         """
-        return len(self.unvisited_moves) > 0
+        return len(self.untried_moves()) > 0
     
     def is_terminal(self):
         """
@@ -59,70 +198,334 @@ class MCTSNode(object):
         return float(self.win_counts[player]) / float(self.num_rollouts)
     
 class MCTSAgent(Agent):
-    def __init__(self, num_rounds, temperature):
+    def __init__(self, num_rounds, temperature, playout='python',
+                 reuse_tree=False, time_budget_ms=None, max_nodes=None,
+                 transposition_size=None, rave=False, rave_equivalence=1000,
+                 rollout_max_moves=None, rollout_margin=None):
+        """
+        num_rounds, time_budget_ms, max_nodes: 探索を打ち切る条件
+            どれか一つに達した時点でそれまでの結果から手を選ぶ
+            使わない条件はNoneにする(少なくとも一つは必要)
+            time_budget_ms 1手あたりの経過時間(ミリ秒)
+            max_nodes      木のノード数(再利用した部分木も含む)
+        playout: ロールアウトの実装
+            'python' FastRandomBot同士でGameStateを進める
+            'light'  空点リストを持つLightPlayoutPolicyで盤面をその場で進める
+            'numba'  numbaでコンパイルしたプレイアウト(playout_numba)
+                     numbaが無ければ'python'に戻す
+        reuse_tree: Trueなら前回の探索木を残しておき，実際に打たれた手を
+            辿った先の部分木を次の探索の根として使う
+            手と手の間も木をメモリに持ち続け，再利用した統計で選ぶ手も
+            変わるので，既定のFalseでは毎回新しい木から探索する
+        transposition_size: 置換表(TranspositionTable)に入れる局面の数
+            Noneなら置換表を使わず，手順が違えば別のノードにする
+            置換表を使うと木は同じ局面を共有するDAGになる
+        rave: TrueならRAVEを使う．ロールアウトで打たれた手も含め，各ノードの
+            手番のプレイヤーがその後に打った全ての手をその局面で最初に打った
+            ものとみなして(AMAF)統計を取り，子を選ぶ時の勝率に混ぜる
+            打たれた手を返せない'numba'のプレイアウトとは使えない
+        rave_equivalence: AMAFの勝率と子の勝率を同じ重みにするロールアウト数
+            子のロールアウト数nに対してAMAFの重みは sqrt(k / (3n + k))
+        rollout_max_moves, rollout_margin: ロールアウトの打ち切り
+            (RolloutCutoff)．手数がrollout_max_movesに達するか，石の数と
+            1目の地の見積もりでrollout_marginより大差になったら止めて，
+            見積もりで勝者を決める．打ち切りの回数はself.cutoffに数える
+            'numba'のプレイアウトは手数の上限だけ使える
+        """
+        if num_rounds is None and time_budget_ms is None and \
+                max_nodes is None:
+            raise ValueError('MCTSAgent needs at least one search budget')
         self.num_rounds = num_rounds
+        self.time_budget_ms = time_budget_ms
+        self.max_nodes = max_nodes
+        # 直前のselect_moveで実際に行えたラウンド数
+        self.rounds_completed = 0
         self.temperature = temperature
+        self.reuse_tree = reuse_tree
+        self.root = None
+        self.table = None
+        if transposition_size is not None:
+            self.table = TranspositionTable(transposition_size)
+        # 直前のselect_moveで再利用した部分木が持っていたロールアウト数
+        self.reused_rollouts = 0
+        self.rave = rave
+        self.rave_equivalence = rave_equivalence
+        if rave and playout == 'numba':
+            raise ValueError('RAVE needs a python or light playout')
+        self.playout, self.simulate = get_simulator(playout)
+        self.cutoff = None
+        if rollout_max_moves is not None or rollout_margin is not None:
+            if self.playout != 'numba':
+                self.cutoff = RolloutCutoff(rollout_max_moves, rollout_margin)
+            elif rollout_margin is not None:
+                raise ValueError('The numba playout only takes a move limit')
+            else:
+                self.simulate = functools.partial(
+                    self.simulate, max_moves=rollout_max_moves)
 
     def select_move(self, game_state):
         """
         MCTSによって最善の枝(手)を選択する
         """
+        root = self.search(game_state)
+
+        # シミュレーションを行なった手の中から，最大の勝率を持つ手を選び，返す        
+        best_move = None
+        best_pct = -1.0
+        for move, child in zip(root.child_moves or [], root.children):
+            child_pct = child.winning_pct(game_state.next_player)
+            if child_pct > best_pct:
+                best_pct = child_pct
+                best_move = move
+        return best_move
+
+    def search(self, game_state):
+        """
+        game_stateを根とする木を予算の分だけ育てて，その根を返す
+        """
+        # 時間の予算は根の準備も含めたselect_move全体に対して数える
+        deadline = None
+        if self.time_budget_ms is not None:
+            deadline = time.perf_counter() + self.time_budget_ms / 1000.0
 
-        # 現在のゲーム状態を根とする新しい木を生成
-        root = MCTSNode(game_state)
+        # 前回の木の中に現在の局面があればそれを根にし，無ければ新しい木を生成
+        root = self.find_subtree(game_state) if self.reuse_tree else None
+        if root is None:
+            root = MCTSNode(game_state)
+        self.reused_rollouts = root.num_rollouts
+        if self.table is not None:
+            self.fill_table(root)
 
-        # 固定数の幅を持つ木を作る(固定数の時間でも良い)
-        for i in range(self.num_rounds):
+        num_nodes = 0
+        if self.max_nodes is not None:
+            num_nodes = self.count_nodes(root)
+
+        # 予算(ラウンド数・時間・ノード数)のどれかを使い切るまで木を作る
+        # どの予算でも最低1ラウンドは行い，選べる手があるようにする
+        rounds = 0
+        while rounds == 0 or \
+                not self.budget_exhausted(rounds, deadline, num_nodes):
             node = root
+            # 辿った枝(親ノード, 子の位置)の列
+            # 置換表を使うとノードの親が一つとは限らないので，逆伝播はこれを使う
+            path = []
 
             # 合法手が存在し，かつゲームが終了していないノードを見つける
             while (not node.can_add_child()) and \
                   (not node.is_terminal()):
 
                 # UCTスコアに応じて次に探索を行うノードが選ばれる
-                node = self.select_child(node)
+                index = self.select_child_index(node)
+                path.append((node, index))
+                node = node.children[index]
+                if self.table is not None and \
+                        any(parent is node for parent, _ in path):
+                    # 別の手順の局面を共有した結果，同じ局面に戻ってきたので，
+                    # 一つ前のノードからロールアウトする
+                    node, _ = path.pop()
+                    break
 
             # そのノードに，ランダムに新たなノードを追加する
             if node.can_add_child():
-                node = node.add_random_child()
+                path.append((node, len(node.children)))
+                if self.rave and node.amaf_rollouts is not None:
+                    node = node.add_child(
+                        self.select_amaf_move(node), self.table)
+                else:
+                    node = node.add_random_child(self.table)
+                num_nodes += 1
 
             # その手を行なった時に勝利するプレイヤーを導く
-            winner = self.simulate_random_game(node.game_state)
+            played = [] if self.rave else None
+            if played is None and self.cutoff is None:
+                winner = self.simulate(node.game_state)
+            else:
+                winner = self.simulate(node.game_state, played, self.cutoff)
 
-            # 木を辿り，スコアを伝播させる
-            while node is not None:
-                node.record_win(winner)
-                node = node.parent
+            # 辿った道を戻り，スコアを伝播させる
+            node.record_win(winner)
+            for parent, index in path:
+                parent.record_win(winner)
+                parent.record_child_win(index, winner)
+            if self.rave:
+                self.record_amaf(path, played, winner)
+            rounds += 1
 
-        # シミュレーションを行なった手の中から，最大の勝率を持つ手を選び，返す        
-        best_move = None
-        best_pct = -1.0
-        for child in root.children:
-            child_pct = child.winning_pct(game_state.next_player)
-            if child_pct > best_pct:
-                best_pct = child_pct
-                best_move = child.move
-        return best_move
+        self.rounds_completed = rounds
+        if self.reuse_tree:
+            self.root = root
+        return root
     
+    def budget_exhausted(self, rounds, deadline, num_nodes):
+        """
+        探索の予算のどれかを使い切ったかどうかを返す
+        ロールアウト1回に比べれば十分軽いので，毎ラウンド確認する
+        """
+        if self.num_rounds is not None and rounds >= self.num_rounds:
+            return True
+        if self.max_nodes is not None and num_nodes >= self.max_nodes:
+            return True
+        return deadline is not None and time.perf_counter() >= deadline
+
+    @staticmethod
+    def iter_nodes(root):
+        """
+        rootから辿れる全てのノードを返す
+        置換表で共有されたノードも一度だけ返す
+        """
+        seen = set()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            yield node
+            stack.extend(node.children)
+
+    @classmethod
+    def count_nodes(cls, root):
+        """
+        rootを根とする木のノード数を返す
+        """
+        return sum(1 for _ in cls.iter_nodes(root))
+
+    def fill_table(self, root):
+        """
+        置換表をrootから辿れるノードだけで作り直す
+        前回の木の外のノードを置換表が持ち続けないようにする
+        """
+        self.table.clear()
+        for node in self.iter_nodes(root):
+            if len(self.table) >= self.table.max_size:
+                break
+            if not node.is_terminal():
+                self.table.put(position_key(node.game_state), node)
+
+    def find_subtree(self, game_state):
+        """
+        前回の木の中からgame_stateと同じ局面のノードを探し，新しい根として返す
+        game_stateから前の局面を遡って前回の根の局面を見つけ，そこから実際に
+        打たれた手の順に子を辿る．見つからなければNoneを返す
+        根の外の部分(兄弟の部分木や祖先)は参照を切って解放させる
+        """
+        root = self.root
+        self.root = None
+        if root is None:
+            return None
+        key = (root.game_state.next_player,
+               root.game_state.board.zobrist_hash())
+        moves = []
+        state = game_state
+        while state is not None and \
+                (state.next_player, state.board.zobrist_hash()) != key:
+            moves.append(state.last_move)
+            state = state.previous_state
+        if state is None:
+            return None
+
+        node = root
+        for move in reversed(moves):
+            for child_move, child in zip(node.child_moves or [],
+                                         node.children):
+                if child_move == move:
+                    node = child
+                    break
+            else:
+                return None
+        node.parent = None
+        return node
+
     def select_child(self, node):
         """
         最大のUTCスコアを持つノードを返す
         次に探索を行うノードを選ぶのに使う
         """
-        total_rollouts = sum(child.num_rollouts for child in node.children)
-        best_score = -1
-        best_child = None
-        for child in node.children:
-            score = self.uct_score(
-                total_rollouts,
-                child.num_rollouts,
-                child.winning_pct(node.game_state.next_player),
-                self.temperature
-            )
-            if score > best_score:
-                best_score = score
-                best_child = child
-        return best_child
+        return node.children[self.select_child_index(node)]
+
+    def select_child_index(self, node):
+        """
+        最大のUTCスコアを持つ子の位置を返す
+        子の統計はnodeが配列で持っているので，全ての子のスコアを一度に計算する
+        """
+        num_children = len(node.children)
+        rollouts = node.child_rollouts[:num_children]
+        win_pcts = node.child_wins[:num_children] / rollouts
+        if self.rave and node.amaf_rollouts is not None:
+            win_pcts = self.blend_amaf(node, rollouts, win_pcts)
+        scores = self.uct_scores(
+            node.total_child_rollouts,
+            rollouts,
+            win_pcts,
+            self.temperature
+        )
+        return int(scores.argmax())
+
+    def blend_amaf(self, node, rollouts, win_pcts):
+        """
+        子の勝率にAMAFの勝率を混ぜる
+        子のロールアウトが少ないうちはAMAFの重みが大きく，増えるにつれて
+        子自身の勝率に移っていく
+        """
+        if node.child_points is None:
+            # 子を選ぶのは全ての合法手が子になった後なので，子はもう増えない
+            point_index = node.game_state.board.point_table.index
+            no_point = len(point_index)
+            node.child_points = np.array(
+                [point_index[move.point] if move.is_play else no_point
+                 for move in node.child_moves], dtype=np.int32)
+        amaf_rollouts = node.amaf_rollouts[node.child_points]
+        amaf_pcts = node.amaf_wins[node.child_points] / \
+            np.maximum(amaf_rollouts, 1)
+        k = self.rave_equivalence
+        beta = np.where(
+            amaf_rollouts > 0, np.sqrt(k / (3.0 * rollouts + k)), 0.0)
+        return (1.0 - beta) * win_pcts + beta * amaf_pcts
+
+    @staticmethod
+    def select_amaf_move(node):
+        """
+        まだ子にしていない手のうち，AMAFの勝率が一番高い手の位置を返す
+        RAVEでは子を追加する順番もAMAFで決める
+        AMAFの統計の無い手は勝率1/2とみなし，同じ値の手からはランダムに選ぶ
+        """
+        point_index = node.game_state.board.point_table.index
+        no_point = len(point_index)
+        points = np.array(
+            [point_index[move.point] if move.is_play else no_point
+             for move in node.untried_moves()], dtype=np.int32)
+        amaf_pcts = (node.amaf_wins[points] + 1.0) / \
+            (node.amaf_rollouts[points] + 2.0)
+        amaf_pcts += np.random.random_sample(len(points)) * 1e-6
+        return int(amaf_pcts.argmax())
+
+    @staticmethod
+    def record_amaf(path, played, winner):
+        """
+        辿った枝とロールアウトで打たれた手からAMAFの統計を更新する
+        各ノードでは，その手番のプレイヤーがそれ以降に打った全ての点を数える
+        """
+        if not path:
+            return
+        point_index = path[0][0].game_state.board.point_table.index
+        size = len(point_index) + 1
+        played_after = {
+            Player.black: np.zeros(size, dtype=bool),
+            Player.white: np.zeros(size, dtype=bool),
+        }
+        for player, point in played:
+            played_after[player][point_index[point]] = True
+        for parent, index in reversed(path):
+            player = parent.game_state.next_player
+            move = parent.child_moves[index]
+            if move.is_play:
+                played_after[player][point_index[move.point]] = True
+            if parent.amaf_rollouts is None:
+                parent.amaf_rollouts = np.zeros(size, dtype=np.int32)
+                parent.amaf_wins = np.zeros(size, dtype=np.int32)
+            parent.amaf_rollouts[played_after[player]] += 1
+            if winner == player:
+                parent.amaf_wins[played_after[player]] += 1
 
     @staticmethod
     def uct_score(parent_rollouts, child_rollouts, win_pct, temperature):
@@ -130,19 +533,68 @@ class MCTSAgent(Agent):
         return win_pct + temperature * exploration
 
     @staticmethod
-    def simulate_random_game(game):
+    def uct_scores(parent_rollouts, child_rollouts, win_pcts, temperature):
+        """
+        uct_scoreを子の配列に対してまとめて計算する
+        """
+        exploration = np.sqrt(math.log(parent_rollouts) / child_rollouts)
+        return win_pcts + temperature * exploration
+
+    @staticmethod
+    def simulate_random_game(game, played=None, cutoff=None):
         """
-        このノードからロールアウトを開始
-        is_over終了まで待つと異常に時間がかかるだろう
-        winnerも内部で使っているcompute_game_resultが未実装なので動かない
+        gameの局面から，両者ともFastRandomBotで終局まで打ち進め，勝者を返す
+        終局した盤面はcompute_playout_resultで数える
+        playedがリストなら，打たれた石の(プレイヤー, 点)を順に追加する
+        cutoff(RolloutCutoff)があれば，手数や形勢で途中で打ち切り，
+        見積もった勝者を返す
         """
+        # 投了で終わった局面は盤面を数えても勝者が決まらない
+        if game.is_over():
+            return game.winner()
+
         bots = {
             Player.black: FastRandomBot(),
             Player.white: FastRandomBot(),
         }
 
+        # ロールアウトでは着手の経過手数を使わないので記録を止める
+        game = game.detached()
+        game.board.disable_move_ages()
+
+        num_moves = 0
         while not game.is_over():
+            if cutoff is not None:
+                winner = cutoff.check(game, num_moves)
+                if winner is not None:
+                    cutoff.record(num_moves)
+                    return winner
             bot_move = bots[game.next_player].select_move(game)
+            if played is not None and bot_move.is_play:
+                played.append((game.next_player, bot_move.point))
             game = game.apply_move(bot_move)
-        
-        return game.winner()
\ No newline at end of file
+            num_moves += 1
+        if cutoff is not None:
+            cutoff.record(num_moves)
+
+        return compute_playout_result(game).winner
+
+
+def get_simulator(playout):
+    """
+    ロールアウトの実装の名前(MCTSAgentのplayout)から，
+    (実際に使う実装の名前, 局面を受け取って勝者を返す関数)を返す
+    numbaが無ければ'python'に戻す
+    """
+    if playout not in ('python', 'light', 'numba'):
+        raise ValueError('Unknown playout backend: %r' % (playout,))
+    if playout == 'numba':
+        # numbaのimportは重いので，'numba'を選んだ時だけ読み込む
+        from dlgo.mcts import playout_numba
+        if playout_numba.available:
+            return playout, playout_numba.simulate_random_game
+        warnings.warn('numba is not installed; using Python playouts')
+        playout = 'python'
+    if playout == 'light':
+        return playout, light_playout.simulate_random_game
+    return playout, MCTSAgent.simulate_random_game
@@ -0,0 +1,435 @@
+import numpy as np
+from dlgo.gotypes import Player
+import dlgo.zobrist as zobrist
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+"""
+    numbaでコンパイルしたランダムプレイアウト
+    GameStateを平らな配列(盤面，ゾブリストハッシュの差分，過去の局面の
+    ハッシュ)に書き出し，FastRandomBot同士の対局と同じ規則
+    (合法手，超劫，is_point_an_eyeの眼の判定)で終局まで打って，
+    evaluate_territoryと同じ数え方で勝者を決める
+    numbaが無い環境ではavailableがFalseになり，MCTSAgentは
+    Pythonのプレイアウトを使う
+"""
+
+__all__ = [
+    'available',
+    'export_game_state',
+    'simulate_random_game',
+]
+
+available = numba is not None
+
+EMPTY = 0
+BLACK = Player.black.value
+WHITE = Player.white.value
+BORDER = 3
+KOMI = 7.5
+
+# Padded (rows + 2) * (cols + 2) hash deltas, by board size.
+_hash_deltas = {}
+
+
+def _padded_hash_deltas(num_rows, num_cols):
+    dim = (num_rows, num_cols)
+    if dim not in _hash_deltas:
+        width = num_cols + 2
+        deltas = np.zeros(((num_rows + 2) * width, 3), dtype=np.int64)
+        table = zobrist.hash_deltas(num_rows, num_cols)
+        for r in range(num_rows):
+            for c in range(num_cols):
+                deltas[(r + 1) * width + c + 1] = table[r * num_cols + c]
+        _hash_deltas[dim] = deltas
+    return _hash_deltas[dim]
+
+
+def export_game_state(game_state):
+    """Return the arrays the compiled playout starts from.
+
+    grid is the padded flat board (Player.value, 0 for empty, 3 off the
+    board) and history holds the situation hashes of every earlier
+    position, as zobrist.situation_hash combines them.
+    """
+    board = game_state.board
+    colors, _ = board.stone_arrays()
+    grid = colors.ravel().copy()
+    history = np.array(
+        [zobrist.situation_hash(board_hash, player)
+         for player, board_hash in game_state.previous_states],
+        dtype=np.int64)
+    num_passes = 0
+    move = game_state.last_move
+    if move is not None and move.is_pass:
+        num_passes = 1
+        previous_move = game_state.previous_move
+        if previous_move is not None and previous_move.is_pass:
+            num_passes = 2
+    return (grid, _padded_hash_deltas(board.num_rows, board.num_cols),
+            board.zobrist_hash(), history, game_state.next_player.value,
+            num_passes)
+
+
+def _string_liberties(grid, next_stone, stamp, mark, root, width):
+    """Count the distinct empty points next to the string at root."""
+    mark[0] += 1
+    current = mark[0]
+    count = 0
+    stone = root
+    while True:
+        for neighbor in (stone - width, stone + width, stone - 1, stone + 1):
+            if grid[neighbor] == EMPTY and stamp[neighbor] != current:
+                stamp[neighbor] = current
+                count += 1
+        stone = next_stone[stone]
+        if stone == root:
+            return count
+
+
+def _join(string_id, next_stone, num_stones, root, other):
+    """Merge the string at other into the string at root."""
+    stone = other
+    while True:
+        string_id[stone] = root
+        stone = next_stone[stone]
+        if stone == other:
+            break
+    next_stone[root], next_stone[other] = next_stone[other], next_stone[root]
+    num_stones[root] += num_stones[other]
+
+
+def _build_strings(grid, string_id, next_stone, num_stones, liberties,
+                   stamp, mark, width):
+    for point in range(len(grid)):
+        color = grid[point]
+        if color != BLACK and color != WHITE:
+            continue
+        string_id[point] = point
+        next_stone[point] = point
+        num_stones[point] = 1
+        for neighbor in (point - width, point - 1):
+            if grid[neighbor] == color:
+                root = string_id[point]
+                other = string_id[neighbor]
+                if root == other:
+                    continue
+                if num_stones[root] < num_stones[other]:
+                    root, other = other, root
+                _join(string_id, next_stone, num_stones, root, other)
+    for point in range(len(grid)):
+        if string_id[point] == point:
+            liberties[point] = _string_liberties(
+                grid, next_stone, stamp, mark, point, width)
+
+
+def _hash_after(grid, string_id, next_stone, liberties, deltas, board_hash,
+                point, color, width):
+    """Return the board hash after color plays point."""
+    other = BLACK + WHITE - color
+    next_hash = board_hash ^ deltas[point, color]
+    captured = np.full(4, -1, dtype=np.int64)
+    num_captured = 0
+    for neighbor in (point - width, point + width, point - 1, point + 1):
+        if grid[neighbor] != other:
+            continue
+        root = string_id[neighbor]
+        if liberties[root] != 1:
+            continue
+        seen = False
+        for i in range(num_captured):
+            if captured[i] == root:
+                seen = True
+        if seen:
+            continue
+        captured[num_captured] = root
+        num_captured += 1
+        stone = root
+        while True:
+            next_hash ^= deltas[stone, other]
+            stone = next_stone[stone]
+            if stone == root:
+                break
+    return next_hash
+
+
+def _is_legal(grid, string_id, next_stone, liberties, deltas, board_hash,
+              history, history_len, white_to_play, point, color, width):
+    """Empty, not a self capture and not a superko violation."""
+    other = BLACK + WHITE - color
+    breathing = False
+    captures = False
+    for neighbor in (point - width, point + width, point - 1, point + 1):
+        neighbor_color = grid[neighbor]
+        if neighbor_color == EMPTY:
+            breathing = True
+        elif neighbor_color == other:
+            if liberties[string_id[neighbor]] == 1:
+                captures = True
+        elif neighbor_color == color:
+            if liberties[string_id[neighbor]] != 1:
+                breathing = True
+    if not (breathing or captures):
+        return False
+    if not captures:
+        return True
+    # Only a capturing move can repeat an earlier position.
+    situation = _hash_after(grid, string_id, next_stone, liberties, deltas,
+                            board_hash, point, color, width)
+    if other == WHITE:
+        situation ^= white_to_play
+    for i in range(history_len):
+        if history[i] == situation:
+            return False
+    return True
+
+
+def _is_eye(grid, point, color, width):
+    """Same rule as helpers_fast.is_point_an_eye."""
+    for neighbor in (point - width, point + width, point - 1, point + 1):
+        if grid[neighbor] != color and grid[neighbor] != BORDER:
+            return False
+    friendly_corners = 0
+    off_board_corners = 0
+    for corner in (point - width - 1, point - width + 1,
+                   point + width - 1, point + width + 1):
+        if grid[corner] == BORDER:
+            off_board_corners += 1
+        elif grid[corner] == color:
+            friendly_corners += 1
+    if off_board_corners > 0:
+        return off_board_corners + friendly_corners == 4
+    return friendly_corners >= 3
+
+
+def _place_stone(grid, string_id, next_stone, num_stones, liberties, stamp,
+                 mark, deltas, board_hash, point, color, width):
+    """Play a legal move and return the new board hash."""
+    other = BLACK + WHITE - color
+    grid[point] = color
+    string_id[point] = point
+    next_stone[point] = point
+    num_stones[point] = 1
+    board_hash ^= deltas[point, color]
+    root = point
+    for neighbor in (point - width, point + width, point - 1, point + 1):
+        if grid[neighbor] == color and string_id[neighbor] != root:
+            other_root = string_id[neighbor]
+            if num_stones[root] < num_stones[other_root]:
+                root, other_root = other_root, root
+            _join(string_id, next_stone, num_stones, root, other_root)
+
+    # Each adjacent opponent string loses this point as a liberty once.
+    mark[0] += 1
+    current = mark[0]
+    for neighbor in (point - width, point + width, point - 1, point + 1):
+        if grid[neighbor] != other:
+            continue
+        other_root = string_id[neighbor]
+        if stamp[other_root] == current:
+            continue
+        stamp[other_root] = current
+        liberties[other_root] -= 1
+        if liberties[other_root] == 0:
+            board_hash = _remove_string(
+                grid, string_id, next_stone, liberties, deltas, board_hash,
+                other_root, other, width)
+    liberties[root] = _string_liberties(
+        grid, next_stone, stamp, mark, root, width)
+    return board_hash
+
+
+def _remove_string(grid, string_id, next_stone, liberties, deltas,
+                   board_hash, root, color, width):
+    other = BLACK + WHITE - color
+    stone = root
+    while True:
+        grid[stone] = EMPTY
+        string_id[stone] = -1
+        board_hash ^= deltas[stone, color]
+        stone = next_stone[stone]
+        if stone == root:
+            break
+    # Every removed stone is a new liberty of each string next to it.
+    while True:
+        touched = np.full(4, -1, dtype=np.int64)
+        num_touched = 0
+        for neighbor in (stone - width, stone + width, stone - 1, stone + 1):
+            if grid[neighbor] != other:
+                continue
+            neighbor_root = string_id[neighbor]
+            seen = False
+            for i in range(num_touched):
+                if touched[i] == neighbor_root:
+                    seen = True
+            if not seen:
+                touched[num_touched] = neighbor_root
+                num_touched += 1
+                liberties[neighbor_root] += 1
+        stone = next_stone[stone]
+        if stone == root:
+            break
+    return board_hash
+
+
+def _area_winner(grid, width, komi):
+    """Score like scoring.compute_game_result and return the winner."""
+    size = len(grid)
+    visited = np.zeros(size, dtype=np.bool_)
+    stack = np.empty(size, dtype=np.int64)
+    black = 0
+    white = 0
+    for start in range(size):
+        color = grid[start]
+        if color == BLACK:
+            black += 1
+            continue
+        if color == WHITE:
+            white += 1
+            continue
+        if color != EMPTY or visited[start]:
+            continue
+        visited[start] = True
+        stack[0] = start
+        top = 1
+        region = 0
+        borders_black = False
+        borders_white = False
+        while top > 0:
+            top -= 1
+            point = stack[top]
+            region += 1
+            for neighbor in (point - width, point + width,
+                             point - 1, point + 1):
+                neighbor_color = grid[neighbor]
+                if neighbor_color == EMPTY:
+                    if not visited[neighbor]:
+                        visited[neighbor] = True
+                        stack[top] = neighbor
+                        top += 1
+                elif neighbor_color == BLACK:
+                    borders_black = True
+                elif neighbor_color == WHITE:
+                    borders_white = True
+        if borders_black and not borders_white:
+            black += region
+        elif borders_white and not borders_black:
+            white += region
+    if black > white + komi:
+        return BLACK
+    return WHITE
+
+
+def _playout(grid, deltas, board_hash, initial_history, next_player,
+             num_passes, white_to_play, width, komi, max_moves, seed):
+    """Play FastRandomBot moves until two passes and return the winner.
+
+    A max_moves of 0 or more stops the game after that many moves and
+    scores the board as it stands; a negative max_moves has no limit.
+    """
+    if seed >= 0:
+        np.random.seed(seed)
+    size = len(grid)
+    string_id = np.full(size, -1, dtype=np.int64)
+    next_stone = np.zeros(size, dtype=np.int64)
+    num_stones = np.zeros(size, dtype=np.int64)
+    liberties = np.zeros(size, dtype=np.int64)
+    stamp = np.zeros(size, dtype=np.int64)
+    mark = np.zeros(1, dtype=np.int64)
+    _build_strings(grid, string_id, next_stone, num_stones, liberties,
+                   stamp, mark, width)
+
+    history = np.empty(
+        len(initial_history) + max(max_moves, size), dtype=np.int64)
+    history[:len(initial_history)] = initial_history
+    history_len = len(initial_history)
+
+    points = np.empty(size, dtype=np.int64)
+    num_points = 0
+    for point in range(size):
+        if grid[point] != BORDER:
+            points[num_points] = point
+            num_points += 1
+
+    color = next_player
+    num_moves = 0
+    while num_passes < 2 and num_moves != max_moves:
+        if history_len == len(history):
+            grown = np.empty(2 * len(history), dtype=np.int64)
+            grown[:history_len] = history
+            history = grown
+        situation = board_hash
+        if color == WHITE:
+            situation ^= white_to_play
+        history[history_len] = situation
+        history_len += 1
+
+        # Try the points in random order, as FastRandomBot does.
+        chosen = -1
+        for i in range(num_points - 1, -1, -1):
+            j = np.random.randint(0, i + 1)
+            point = points[j]
+            points[j] = points[i]
+            points[i] = point
+            if grid[point] != EMPTY:
+                continue
+            if _is_eye(grid, point, color, width):
+                continue
+            if _is_legal(grid, string_id, next_stone, liberties, deltas,
+                         board_hash, history, history_len, white_to_play,
+                         point, color, width):
+                chosen = point
+                break
+        if chosen < 0:
+            num_passes += 1
+        else:
+            num_passes = 0
+            board_hash = _place_stone(
+                grid, string_id, next_stone, num_stones, liberties, stamp,
+                mark, deltas, board_hash, chosen, color, width)
+        color = BLACK + WHITE - color
+        num_moves += 1
+    return _area_winner(grid, width, komi)
+
+
+if numba is not None:
+    _jit = numba.njit(cache=True)
+    _string_liberties = _jit(_string_liberties)
+    _join = _jit(_join)
+    _build_strings = _jit(_build_strings)
+    _hash_after = _jit(_hash_after)
+    _is_legal = _jit(_is_legal)
+    _is_eye = _jit(_is_eye)
+    _remove_string = _jit(_remove_string)
+    _place_stone = _jit(_place_stone)
+    _area_winner = _jit(_area_winner)
+    _playout = _jit(_playout)
+
+
+def simulate_random_game(game_state, komi=KOMI, max_moves=None, seed=None):
+    """Play a random game from game_state in compiled code.
+
+    Returns the winning Player, like GameState.winner() at the end of a
+    FastRandomBot game. The game goes on until both players pass unless
+    max_moves is given; then it stops after that many moves and the
+    board is scored as it stands. Without numba this runs the same code
+    as plain Python, which is correct but slow.
+    """
+    if game_state.is_over():
+        return game_state.winner()
+    grid, deltas, board_hash, history, next_player, num_passes = \
+        export_game_state(game_state)
+    if max_moves is None:
+        max_moves = -1
+    if seed is None:
+        # The compiled code has its own random state; plain Python shares
+        # np.random, which must not be reseeded on every playout.
+        seed = np.random.randint(0, 2 ** 31 - 1) if available else -1
+    width = game_state.board.num_cols + 2
+    winner = _playout(grid, deltas, board_hash, history, next_player,
+                      num_passes, zobrist.WHITE_TO_PLAY, width, komi,
+                      max_moves, seed)
+    return Player(winner)
@@ -0,0 +1,233 @@
+import math
+import random
+
+import numpy as np
+from dlgo.agent.base import Agent
+from dlgo.goboard_fast import Move
+from dlgo.mcts.mcts import get_simulator
+
+"""
+    ノード数に上限のあるMCTS
+    ノードはMCTSNodeのオブジェクトではなく，最初に確保した配列
+    (統計，親の番号，着手の番号，子と兄弟の番号)の1行で表す
+    ノードはGameStateを持たず，探索のたびに根の局面から着手を打ち直して
+    局面を作る
+    空きが無くなったら，根と探索中の道以外で訪問回数の少ないノードから
+    部分木ごと解放する．解放した手は親にとってまた未展開の手になる
+    解放しても空きができなければ，そのラウンドは展開せずに今の葉から
+    ロールアウトする
+"""
+
+__all__ = [
+    'NodePool',
+    'PooledMCTSAgent',
+]
+
+NO_NODE = -1
+
+
+class NodePool():
+    """Fixed-size arrays holding every node of one search tree.
+
+    Node i has made move[i] (a point_table index, or the pass and resign
+    codes after the points) as player[i], and wins[i] counts rollouts
+    player[i] won. Children form a linked list through first_child and
+    next_sibling. expanded[i] is set once every legal move of node i has
+    a child.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.parent = np.full(capacity, NO_NODE, dtype=np.int32)
+        self.first_child = np.full(capacity, NO_NODE, dtype=np.int32)
+        self.next_sibling = np.full(capacity, NO_NODE, dtype=np.int32)
+        self.move = np.zeros(capacity, dtype=np.int32)
+        self.player = np.zeros(capacity, dtype=np.int8)
+        self.visits = np.zeros(capacity, dtype=np.int32)
+        self.wins = np.zeros(capacity, dtype=np.int32)
+        self.expanded = np.zeros(capacity, dtype=bool)
+        self.in_use = np.zeros(capacity, dtype=bool)
+        # Highest index first, so nodes are handed out from 0 upwards.
+        self._free = list(range(capacity - 1, -1, -1))
+        self.num_pruned = 0
+
+    def __len__(self):
+        return self.capacity - len(self._free)
+
+    def is_full(self):
+        return not self._free
+
+    def allocate(self, parent, move, player):
+        """Return a new node for move played by player below parent.
+
+        The pool must not be full.
+        """
+        node = self._free.pop()
+        self.parent[node] = parent
+        self.first_child[node] = NO_NODE
+        self.move[node] = move
+        self.player[node] = player
+        self.visits[node] = 0
+        self.wins[node] = 0
+        self.expanded[node] = False
+        self.in_use[node] = True
+        if parent == NO_NODE:
+            self.next_sibling[node] = NO_NODE
+        else:
+            self.next_sibling[node] = self.first_child[parent]
+            self.first_child[parent] = node
+        return node
+
+    def children(self, node):
+        """Return the child indices of node as a list."""
+        children = []
+        child = self.first_child[node]
+        while child != NO_NODE:
+            children.append(int(child))
+            child = self.next_sibling[child]
+        return children
+
+    def free_subtree(self, node):
+        """Unlink node from its parent and free it and its descendants."""
+        parent = self.parent[node]
+        if parent != NO_NODE:
+            if self.first_child[parent] == node:
+                self.first_child[parent] = self.next_sibling[node]
+            else:
+                sibling = self.first_child[parent]
+                while self.next_sibling[sibling] != node:
+                    sibling = self.next_sibling[sibling]
+                self.next_sibling[sibling] = self.next_sibling[node]
+            # The move is untried again.
+            self.expanded[parent] = False
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            stack.extend(self.children(current))
+            self.in_use[current] = False
+            self.parent[current] = NO_NODE
+            self._free.append(current)
+            self.num_pruned += 1
+
+    def prune(self, fraction, keep):
+        """Free the least visited subtrees until fraction of the pool is free.
+
+        Nodes in keep (the root and the path being searched) and their
+        ancestors are never freed.
+        """
+        target = max(1, int(self.capacity * fraction))
+        candidates = np.flatnonzero(self.in_use)
+        candidates = candidates[np.argsort(
+            self.visits[candidates], kind='stable')]
+        for node in candidates.tolist():
+            if len(self._free) >= target:
+                break
+            if not self.in_use[node] or node in keep:
+                continue
+            self.free_subtree(node)
+
+
+class PooledMCTSAgent(Agent):
+    """MCTSAgent with its tree held in a NodePool of max_nodes nodes.
+
+    Nodes keep only their move; each round replays the moves from the
+    root position to rebuild the state it needs. When the pool is full,
+    the least visited subtrees are pruned until prune_fraction of the
+    pool is free again; if nothing can be freed, the round rolls out from
+    its leaf without expanding it. max_nodes must hold at least the root
+    and one child for every move at the root.
+    """
+
+    def __init__(self, num_rounds, temperature, max_nodes, playout='light',
+                 prune_fraction=0.25):
+        if max_nodes < 2:
+            raise ValueError(
+                'max_nodes must hold the root and its children, got %d' %
+                (max_nodes,))
+        Agent.__init__(self)
+        self.num_rounds = num_rounds
+        self.temperature = temperature
+        self.max_nodes = max_nodes
+        self.prune_fraction = prune_fraction
+        self.playout, self.simulate = get_simulator(playout)
+        self.pool = None
+
+    def select_move(self, game_state):
+        pool, root, moves = self.search(game_state)
+        best_move = None
+        best_pct = -1.0
+        for child in pool.children(root):
+            pct = float(pool.wins[child]) / float(pool.visits[child])
+            if pct > best_pct:
+                best_pct = pct
+                best_move = moves[pool.move[child]]
+        return best_move
+
+    def search(self, game_state):
+        """Run num_rounds rounds from game_state.
+
+        Returns the pool, the root index and the move of every move code.
+        """
+        point_table = game_state.board.point_table
+        moves = list(point_table.moves) + [Move.pass_turn(), Move.resign()]
+        pool = NodePool(self.max_nodes)
+        self.pool = pool
+        root = pool.allocate(NO_NODE, 0, game_state.next_player.other.value)
+        if not game_state.is_over():
+            # 根の子が全部入らないと，枝刈りで根の統計が失われ続ける
+            num_root_moves = len(
+                self.untried_moves(pool, root, game_state, point_table))
+            if self.max_nodes < 1 + num_root_moves:
+                raise ValueError(
+                    'max_nodes=%d cannot hold the root and its %d children' %
+                    (self.max_nodes, num_root_moves))
+
+        for _ in range(self.num_rounds):
+            # 根の局面から着手を打ち直しながら降りる
+            state = game_state.detached()
+            path = [root]
+            node = root
+            while pool.expanded[node] and not state.is_over():
+                node = self.select_child(pool, node)
+                state.make_move(moves[pool.move[node]])
+                path.append(node)
+
+            if not state.is_over():
+                if pool.is_full():
+                    pool.prune(self.prune_fraction, set(path))
+                # 空きが無いままなら展開せず，この葉からロールアウトする
+                if not pool.is_full():
+                    # 枝刈りでこのノードの子が消えていてもよいよう，後で数える
+                    untried = self.untried_moves(
+                        pool, node, state, point_table)
+                    move = random.choice(untried)
+                    if len(untried) == 1:
+                        pool.expanded[node] = True
+                    child = pool.allocate(
+                        node, move, state.next_player.value)
+                    state.make_move(moves[move])
+                    path.append(child)
+
+            winner = self.simulate(state)
+            for node in path:
+                pool.visits[node] += 1
+                if winner.value == pool.player[node]:
+                    pool.wins[node] += 1
+        return pool, root, moves
+
+    @staticmethod
+    def untried_moves(pool, node, state, point_table):
+        """Return the move codes of state's legal moves node has no child for."""
+        num_points = len(point_table.points)
+        tried = set(pool.move[child] for child in pool.children(node))
+        codes = np.flatnonzero(state.legal_mask()).tolist()
+        codes.extend((num_points, num_points + 1))
+        return [code for code in codes if code not in tried]
+
+    def select_child(self, pool, node):
+        """Return the child of node with the best UCT score."""
+        children = np.array(pool.children(node), dtype=np.int64)
+        visits = pool.visits[children]
+        scores = pool.wins[children] / visits + self.temperature * \
+            np.sqrt(math.log(visits.sum()) / visits)
+        return int(children[scores.argmax()])
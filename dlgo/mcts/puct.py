@@ -0,0 +1,197 @@
+import math
+
+import numpy as np
+from dlgo.agent.base import Agent
+from dlgo.agent.predict import DeepLearningAgent
+from dlgo.goboard_fast import Move
+from dlgo.mcts.mcts import get_simulator
+
+"""
+    方策ネットワークで導くPUCT探索
+    DeepLearningAgentのmodelが出す着手の確率を子の事前確率にし，
+    Q + c_puct * P * sqrt(N) / (1 + n) の最大の子を辿る
+    葉はbatch_size個ずつ集めて一度のmodel.predictで評価する．同じ葉ばかり
+    集まらないよう，辿った枝には評価が終わるまで仮想的な負け(virtual loss)を
+    足しておく
+    葉の勝ち負けはMCTSAgentと同じロールアウトで決める
+"""
+
+__all__ = [
+    'PUCTAgent',
+    'PUCTNode',
+]
+
+
+class PUCTNode():
+    """A position in the PUCT tree with per-move arrays for its edges.
+
+    moves is None until the network has evaluated the position. After
+    expand() it lists the legal moves by falling prior, and priors,
+    visits, wins and virtual hold one entry per move. wins are counted
+    for the player to move here. children[i] is created the first time
+    move i is chosen.
+    """
+
+    __slots__ = (
+        'game_state',
+        'moves',
+        'priors',
+        'visits',
+        'wins',
+        'virtual',
+        'children',
+        'pending',
+    )
+
+    def __init__(self, game_state):
+        self.game_state = game_state
+        self.moves = None
+        self.priors = None
+        self.visits = None
+        self.wins = None
+        self.virtual = None
+        self.children = None
+        # True while the node waits in a batch for its evaluation.
+        self.pending = False
+
+    def expand(self, priors, moves):
+        """Give the node its moves and their priors, best first."""
+        order = np.argsort(-priors, kind='stable')
+        self.moves = [moves[i] for i in order]
+        self.priors = priors[order]
+        self.visits = np.zeros(len(moves))
+        self.wins = np.zeros(len(moves))
+        self.virtual = np.zeros(len(moves))
+        self.children = [None] * len(moves)
+
+
+class PUCTAgent(Agent):
+    """Search guided by the policy of a DeepLearningAgent model.
+
+    num_rounds leaves are evaluated per move, batch_size at a time. The
+    move played is the most visited child of the root.
+    """
+
+    def __init__(self, model, encoder, num_rounds, c_puct=1.5,
+                 batch_size=8, virtual_loss=1, playout='light'):
+        Agent.__init__(self)
+        self.network = DeepLearningAgent(model, encoder)
+        self.num_rounds = num_rounds
+        self.c_puct = c_puct
+        self.batch_size = batch_size
+        self.virtual_loss = virtual_loss
+        self.playout, self.simulate = get_simulator(playout)
+        # Encoder index of every point_table index, by board size.
+        self._encoder_index = {}
+        # Statistics of the last select_move.
+        self.rounds_completed = 0
+        self.num_batches = 0
+
+    def select_move(self, game_state):
+        root = self.search(game_state)
+        if not root.moves:
+            return None
+        return root.moves[int(root.visits.argmax())]
+
+    def search(self, game_state):
+        """Grow a tree from game_state for num_rounds leaves; return it."""
+        root = PUCTNode(game_state)
+        self.num_batches = 0
+        if not game_state.is_over():
+            self.evaluate([root])
+        rounds = 0
+        while rounds < self.num_rounds:
+            leaves = []
+            while len(leaves) < min(self.batch_size,
+                                    self.num_rounds - rounds):
+                path, leaf = self.descend(root)
+                if leaf is None:
+                    # Every path now ends in a leaf already in this batch.
+                    break
+                leaf.pending = True
+                leaves.append((path, leaf))
+
+            self.evaluate([leaf for _, leaf in leaves
+                           if leaf.moves is None and
+                           not leaf.game_state.is_over()])
+            for path, leaf in leaves:
+                leaf.pending = False
+                self.backup(path, self.simulate(leaf.game_state))
+            rounds += len(leaves)
+        self.rounds_completed = rounds
+        return root
+
+    def descend(self, root):
+        """Follow the best PUCT edges from root to a leaf.
+
+        Returns the (node, move index) path and the leaf, adding virtual
+        loss along the way. If the leaf is already waiting in the batch
+        the virtual loss is taken back and the leaf is None.
+        """
+        path = []
+        node = root
+        while node.moves and not node.pending:
+            index = self.select_index(node)
+            node.virtual[index] += self.virtual_loss
+            path.append((node, index))
+            child = node.children[index]
+            if child is None:
+                child = PUCTNode(
+                    node.game_state.apply_move(node.moves[index]))
+                node.children[index] = child
+                return path, child
+            node = child
+        if node.pending:
+            for parent, index in path:
+                parent.virtual[index] -= self.virtual_loss
+            return path, None
+        return path, node
+
+    def select_index(self, node):
+        """Return the index of the move with the best PUCT score.
+
+        Virtual losses count as visits that were lost. Moves that were
+        never visited score 0 for Q, so they are tried in prior order.
+        """
+        visits = node.visits + node.virtual
+        q = node.wins / np.maximum(visits, 1)
+        u = self.c_puct * node.priors * math.sqrt(visits.sum() + 1) / \
+            (1 + visits)
+        return int((q + u).argmax())
+
+    def backup(self, path, winner):
+        for node, index in path:
+            node.virtual[index] -= self.virtual_loss
+            node.visits[index] += 1
+            if winner == node.game_state.next_player:
+                node.wins[index] += 1
+
+    def evaluate(self, nodes):
+        """Expand nodes with priors from one batched model.predict."""
+        if not nodes:
+            return
+        self.num_batches += 1
+        move_probs = self.network.predict_batch(
+            [node.game_state for node in nodes])
+        for node, probs in zip(nodes, move_probs):
+            game_state = node.game_state
+            point_table = game_state.board.point_table
+            legal = np.flatnonzero(game_state.legal_mask())
+            priors = probs[self.encoder_index(point_table)[legal]]
+            # The network has no output for passing; give it the prior
+            # of a uniform policy.
+            priors = np.append(priors, 1.0 / len(point_table.points))
+            priors = priors / priors.sum()
+            moves = [point_table.moves[idx] for idx in legal.tolist()]
+            moves.append(Move.pass_turn())
+            node.expand(priors, moves)
+
+    def encoder_index(self, point_table):
+        """Return the encoder index of every point, in point_table order."""
+        key = len(point_table.points)
+        if key not in self._encoder_index:
+            encoder = self.network.encoder
+            self._encoder_index[key] = np.array(
+                [encoder.encode_point(point) for point in point_table.points],
+                dtype=np.int64)
+        return self._encoder_index[key]
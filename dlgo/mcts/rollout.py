@@ -0,0 +1,74 @@
+from dlgo.gotypes import Player
+from dlgo.scoring import estimate_result
+
+"""
+    ロールアウトの打ち切り
+    手数の上限に達した時や，途中の形勢(石の数と1目の地の見積もり)が
+    大差になった時にロールアウトを止めて，見積もりで勝者を決める
+    打ち切った回数や打った手数を数えておき，速さと正確さの兼ね合いを
+    測れるようにする
+"""
+
+__all__ = [
+    'RolloutCutoff',
+]
+
+
+class RolloutCutoff():
+    """When a rollout may stop early, and how often that happened.
+
+    max_moves stops a rollout after that many moves. margin stops it once
+    estimate_result puts one side more than margin points ahead; that is
+    checked every check_every moves, since the estimate looks at the
+    whole board. Either may be None.
+    """
+
+    def __init__(self, max_moves=None, margin=None, check_every=8,
+                 komi=7.5):
+        self.max_moves = max_moves
+        self.margin = margin
+        self.check_every = check_every
+        self.komi = komi
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.num_rollouts = 0
+        self.num_moves = 0
+        self.cut_by_moves = 0
+        self.cut_by_margin = 0
+
+    def check(self, game_state, num_moves):
+        """Return the estimated winner if the rollout should stop here.
+
+        num_moves is how many moves the rollout has played so far.
+        Returns None while it should go on.
+        """
+        if self.max_moves is not None and num_moves >= self.max_moves:
+            self.cut_by_moves += 1
+            return estimate_result(game_state, self.komi).winner
+        if self.margin is not None and num_moves > 0 and \
+                num_moves % self.check_every == 0:
+            result = estimate_result(game_state, self.komi)
+            lead = result.b - (result.w + result.komi)
+            if abs(lead) > self.margin:
+                self.cut_by_margin += 1
+                return Player.black if lead > 0 else Player.white
+        return None
+
+    def record(self, num_moves):
+        """Count one finished or truncated rollout of num_moves moves."""
+        self.num_rollouts += 1
+        self.num_moves += num_moves
+
+    @property
+    def cut_rate(self):
+        if self.num_rollouts == 0:
+            return 0.0
+        return float(self.cut_by_moves + self.cut_by_margin) / \
+            float(self.num_rollouts)
+
+    @property
+    def moves_per_rollout(self):
+        if self.num_rollouts == 0:
+            return 0.0
+        return float(self.num_moves) / float(self.num_rollouts)
@@ -0,0 +1,192 @@
+import importlib
+import multiprocessing
+import random
+import weakref
+
+import numpy as np
+from dlgo.agent.base import Agent
+from dlgo.goboard_fast import Move
+from dlgo.gotypes import Player, Point
+from dlgo.mcts.mcts import MCTSAgent
+
+"""
+    ルート並列のMCTS
+    プロセスプールの各ワーカーが同じ局面から別々の乱数の種で独立に探索し，
+    根の子(手)ごとのロールアウト数と勝ち数を返す．親はそれを手ごとに
+    足し合わせて手を選ぶ
+    プールは一度作ったら使い回し，局面はprevious_stateの連鎖ごとpickle
+    せずに，今の石と直前の2手，超劫の判定に使う過去の局面のハッシュだけの
+    小さなタプルにして送る．make_moveで進めてprevious_stateを持たない
+    局面もそのまま送れる
+"""
+
+__all__ = [
+    'RootParallelMCTSAgent',
+    'decode_position',
+    'encode_position',
+]
+
+
+def _encode_move(move):
+    if move.is_play:
+        return (move.point.row, move.point.col)
+    return 'pass' if move.is_pass else 'resign'
+
+
+def _decode_move(move):
+    if move == 'pass':
+        return Move.pass_turn()
+    if move == 'resign':
+        return Move.resign()
+    return Move.play(Point(*move))
+
+
+def encode_position(game_state):
+    """Return game_state as a small picklable tuple.
+
+    The tuple holds the board module, the board size, the stones, the
+    player to move, the last two moves and the (player, hash) situations
+    of the superko history. It is built from previous_states rather than
+    the previous_state chain, which make_move leaves empty.
+    """
+    board = game_state.board
+    setup = []
+    for point in board.point_table.points:
+        color = board.get(point)
+        if color is not None:
+            setup.append((point.row, point.col, color.value))
+    moves = tuple(
+        None if move is None else _encode_move(move)
+        for move in (game_state.previous_move, game_state.last_move))
+    situations = tuple(
+        (player.value, board_hash)
+        for player, board_hash in game_state.previous_states)
+    return (type(game_state).__module__, (board.num_rows, board.num_cols),
+            tuple(setup), game_state.next_player.value, moves, situations)
+
+
+def decode_position(position):
+    """Rebuild the GameState of encode_position.
+
+    The result has no previous_state, as after make_move, but the same
+    stones, superko history and last two moves.
+    """
+    module, board_size, setup, next_player, moves, situations = position
+    game_state = importlib.import_module(module).GameState.new_game(
+        board_size)
+    for row, col, color in setup:
+        game_state.board.place_stone(Player(color), Point(row, col))
+    game_state.next_player = Player(next_player)
+    history = game_state.previous_states
+    for player, board_hash in situations:
+        history = history.add((Player(player), board_hash))
+    game_state.previous_states = history
+    previous_move, last_move = [
+        None if move is None else _decode_move(move) for move in moves]
+    game_state._previous_move = previous_move
+    game_state.last_move = last_move
+    return game_state
+
+
+# Per-process state of a pool worker, set up once by _init_worker.
+_worker_agent = None
+
+
+def _init_worker(agent_args):
+    global _worker_agent
+    _worker_agent = MCTSAgent(**agent_args)
+
+
+def _search(position, seed):
+    """Run one search in a worker and return its root statistics.
+
+    Returns the rounds completed and (move, rollouts, wins) for every
+    child of the root, wins counted for the player to move.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    game_state = decode_position(position)
+    root = _worker_agent.search(game_state)
+    player = game_state.next_player
+    stats = [(_encode_move(move), child.num_rollouts,
+              child.win_counts[player])
+             for move, child in zip(root.child_moves or [], root.children)]
+    return _worker_agent.rounds_completed, stats
+
+
+class RootParallelMCTSAgent(Agent):
+    """MCTSAgent searches run side by side in a process pool.
+
+    Every worker searches the same position with its own seed and the
+    per-move rollouts and wins of the roots are summed before the move
+    with the best winning rate is chosen, as MCTSAgent chooses it. The
+    pool is started on the first select_move and kept until close(), the
+    end of a with block, or the agent being garbage collected. Budgets
+    apply to each worker's search, so num_workers searches cost about
+    num_workers times one search on a single core; any gain in speed
+    needs that many free cores and has not been measured.
+    """
+
+    def __init__(self, num_workers, num_rounds, temperature,
+                 playout='python', time_budget_ms=None, max_nodes=None,
+                 seed=None):
+        Agent.__init__(self)
+        self.num_workers = num_workers
+        self._agent_args = dict(
+            num_rounds=num_rounds, temperature=temperature, playout=playout,
+            reuse_tree=False, time_budget_ms=time_budget_ms,
+            max_nodes=max_nodes)
+        # Build one agent here so bad arguments fail before the pool starts.
+        MCTSAgent(**self._agent_args)
+        self._rng = random.Random(seed)
+        self._pool = None
+        self._finalizer = None
+        # Rounds completed by all workers in the last select_move.
+        self.rounds_completed = 0
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(
+                self.num_workers, _init_worker, (self._agent_args,))
+            # Stop the workers if the agent is dropped without close().
+            self._finalizer = weakref.finalize(self, self._pool.terminate)
+        return self._pool
+
+    def select_move(self, game_state):
+        position = encode_position(game_state)
+        tasks = [(position, self._rng.randint(0, 2 ** 31 - 1))
+                 for _ in range(self.num_workers)]
+        results = self._get_pool().starmap(_search, tasks)
+
+        merged = {}
+        self.rounds_completed = 0
+        for rounds, stats in results:
+            self.rounds_completed += rounds
+            for move, rollouts, wins in stats:
+                total = merged.setdefault(move, [0, 0])
+                total[0] += rollouts
+                total[1] += wins
+
+        best_move = None
+        best_pct = -1.0
+        for move, (rollouts, wins) in merged.items():
+            pct = float(wins) / float(rollouts)
+            if pct > best_pct:
+                best_pct = pct
+                best_move = _decode_move(move)
+        return best_move
+
+    def close(self):
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._finalizer.detach()
+            self._finalizer = None
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+"""
+    MCTSの置換表
+    別の手順で同じ局面に着いた時に同じMCTSNodeを使い，統計を共有する
+    局面はゾブリストハッシュ・手番・直前の手がパスかどうかで見分ける
+    (同じ盤面でも直前がパスなら次のパスで終局するので別の局面として扱う)
+    大きさに上限を設け，一番長く使われていない局面から追い出す
+"""
+
+__all__ = [
+    'TranspositionTable',
+    'position_key',
+]
+
+
+def position_key(game_state):
+    """Return the key the table stores game_state's node under."""
+    last_move = game_state.last_move
+    return (game_state.board.zobrist_hash(), game_state.next_player,
+            last_move is not None and last_move.is_pass)
+
+
+class TranspositionTable():
+    """Bounded map from position_key to MCTSNode with LRU eviction.
+
+    Evicted nodes stay in the tree; they just can't be found again by
+    another move order. hits and lookups count get() calls since the
+    table was made or cleared.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._nodes = OrderedDict()
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def get(self, key):
+        """Return the node stored under key, or None."""
+        self.lookups += 1
+        node = self._nodes.get(key)
+        if node is not None:
+            self.hits += 1
+            self._nodes.move_to_end(key)
+        return node
+
+    def put(self, key, node):
+        """Store node under key, evicting the least recently used node."""
+        self._nodes[key] = node
+        self._nodes.move_to_end(key)
+        if len(self._nodes) > self.max_size:
+            self._nodes.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._nodes.clear()
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+
+    @property
+    def hit_rate(self):
+        if self.lookups == 0:
+            return 0.0
+        return float(self.hits) / float(self.lookups)
@@ -1,8 +1,11 @@
 
 # tag::scoring_imports[]
 from __future__ import absolute_import
+import functools
 from collections import namedtuple
 
+import numpy as np
+
 from dlgo.gotypes import Player, Point
 # end::scoring_imports[]
 
@@ -29,6 +32,23 @@ class Territory:
                 self.num_dame += 1
                 self.dame_points.append(point)
 
+    @classmethod
+    def from_masks(cls, black, white, territory_b, territory_w, dame):
+        """Build a Territory from (rows, cols) bool arrays of each status."""
+        territory = cls({})
+        territory.num_black_stones = int(black.sum())
+        territory.num_white_stones = int(white.sum())
+        territory.num_black_territory = int(territory_b.sum())
+        territory.num_white_territory = int(territory_w.sum())
+        territory.num_dame = int(dame.sum())
+        # goboard_fast imports this module, so its point tables can only
+        # be imported once both modules are loaded.
+        from dlgo.goboard_fast import get_point_table
+        points = get_point_table(dame.shape).points
+        territory.dame_points = [
+            points[idx] for idx in np.flatnonzero(dame).tolist()]
+        return territory
+
 # <1> A `territory_map` splits the board into stones, territory and neutral points (dame).
 # <2> Depending on the status of a point, we increment the respective counter.
 # end::scoring_territory[]
@@ -67,66 +87,142 @@ trivially dead groups.
 # tag::scoring_evaluate_territory[]
 def evaluate_territory(board):
 
-    status = {}
-    for r in range(1, board.num_rows + 1):
-        for c in range(1, board.num_cols + 1):
-            p = Point(row=r, col=c)
-            if p in status:  # <1>
-                continue
-            stone = board.get(p)
-            if stone is not None:  # <2>
-                status[p] = board.get(p)
-            else:
-                group, neighbors = _collect_region(p, board)
-                if len(neighbors) == 1:  # <3>
-                    neighbor_stone = neighbors.pop()
-                    stone_str = 'b' if neighbor_stone == Player.black else 'w'
-                    fill_with = 'territory_' + stone_str
-                else:
-                    fill_with = 'dame'  # <4>
-                for pos in group:
-                    status[pos] = fill_with
-    return Territory(status)
-
-# <1> Skip the point, if you already visited this as part of a different group.
-# <2> If the point is a stone, add it as status.
-# <3> If a point is completely surrounded by black or white stones, count it as territory.
-# <4> Otherwise the point has to be a neutral point, so we add it to dame.
+    colors = _color_grid(board)  # <1>
+    black = colors == Player.black.value
+    white = colors == Player.white.value
+    empty = colors == 0
+    reached = _region_reach(colors)  # <2>
+    territory_b = empty & (reached == Player.black.value)  # <3>
+    territory_w = empty & (reached == Player.white.value)
+    dame = empty & ~(territory_b | territory_w)  # <4>
+
+    inner = (slice(1, -1), slice(1, -1))
+    return Territory.from_masks(
+        black[inner], white[inner],
+        territory_b[inner], territory_w[inner], dame[inner])
+
+# <1> Read the board into a padded array: Player.value for stones, 0 for empty points, 3 off the board.
+# <2> Find which colors border every empty region: one flood fill per region, or array dilation without numba.
+# <3> An empty region reached by only one color is that color's territory.
+# <4> Otherwise (reached by both colors, or by none) the region is neutral, so it is dame.
 # end::scoring_evaluate_territory[]
 
 
-""" _collect_region:
+""" _reach:
+
+Grow the stones of both colors through the empty points, one step at a
+time, until nothing changes. Player.value doubles as a bit flag (1 for
+black, 2 for white), so an empty point ends up with the bits of every
+color that reaches it. This replaces the recursive _collect_region:
+there is no recursion limit and each step is a handful of array
+operations over the whole board.
+"""
+
+
+# tag::scoring_reach[]
+def _reach(colors):
 
-Find the contiguous section of a board containing a point. Also
-identify all the boundary points.
+    reached = np.where(colors == 3, 0, colors).astype(np.uint8)
+    passable = np.where(colors == 0, 3, reached).astype(np.uint8)  # <1>
+    while True:
+        grown = reached.copy()
+        grown[1:, :] |= reached[:-1, :]
+        grown[:-1, :] |= reached[1:, :]
+        grown[:, 1:] |= reached[:, :-1]
+        grown[:, :-1] |= reached[:, 1:]
+        grown &= passable
+        if (grown == reached).all():
+            return reached
+        reached = grown
+
+# <1> Empty points let both colors through; a stone only lets its own color through.
+# end::scoring_reach[]
+
+
+""" _flood_reach:
+
+The same result as _reach in a single pass: flood every empty region
+once with an explicit stack, OR together the colors of the stones it
+touches and write those bits to each of its points. The loop is only
+fast once numba compiles it, so evaluate_territory falls back to _reach
+when numba is not installed.
 """
 
 
-# tag::scoring_collect_region[]
-def _collect_region(start_pos, board, visited=None):
-
-    if visited is None:
-        visited = {}
-    if start_pos in visited:
-        return [], set()
-    all_points = [start_pos]
-    all_borders = set()
-    visited[start_pos] = True
-    here = board.get(start_pos)
-    deltas = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    for delta_r, delta_c in deltas:
-        next_p = Point(row=start_pos.row + delta_r, col=start_pos.col + delta_c)
-        if not board.is_on_grid(next_p):
+def _flood_reach(colors):
+    num_rows, width = colors.shape
+    flat = colors.ravel()
+    size = flat.size
+    reached = np.zeros(size, dtype=np.uint8)
+    seen = np.zeros(size, dtype=np.bool_)
+    stack = np.empty(size, dtype=np.int64)
+    region = np.empty(size, dtype=np.int64)
+    for start in range(size):
+        color = flat[start]
+        if color != 0:
+            if color != 3:
+                reached[start] = color
+            continue
+        if seen[start]:
             continue
-        neighbor = board.get(next_p)
-        if neighbor == here:
-            points, borders = _collect_region(next_p, board, visited)
-            all_points += points
-            all_borders |= borders
-        else:
-            all_borders.add(neighbor)
-    return all_points, all_borders
-# end::scoring_collect_region[]
+        seen[start] = True
+        stack[0] = start
+        top = 1
+        num_points = 0
+        bits = 0
+        while top > 0:
+            top -= 1
+            point = stack[top]
+            region[num_points] = point
+            num_points += 1
+            # Empty points are never on the ring, so no neighbor is off
+            # the array.
+            for neighbor in (point - width, point + width,
+                             point - 1, point + 1):
+                neighbor_color = flat[neighbor]
+                if neighbor_color == 0:
+                    if not seen[neighbor]:
+                        seen[neighbor] = True
+                        stack[top] = neighbor
+                        top += 1
+                elif neighbor_color != 3:
+                    bits |= neighbor_color
+        for i in range(num_points):
+            reached[region[i]] = bits
+    return reached.reshape(num_rows, width)
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_flood_reach():
+    """Compile _flood_reach on first use; None if numba is missing.
+
+    numba is imported here rather than at the top because every board
+    module imports scoring and the import alone takes a quarter second.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(cache=True)(_flood_reach)
+
+
+def _region_reach(colors):
+    flood_reach = _compiled_flood_reach()
+    if flood_reach is None:
+        return _reach(colors)
+    return flood_reach(colors)
+
+
+def _color_grid(board):
+    """Return the padded (rows + 2, cols + 2) color array of a board."""
+    if hasattr(board, 'color_array'):
+        return board.color_array()
+    colors = np.full((board.num_rows + 2, board.num_cols + 2), 3, dtype=np.int8)
+    for r in range(1, board.num_rows + 1):
+        for c in range(1, board.num_cols + 1):
+            stone = board.get(Point(row=r, col=c))
+            colors[r, c] = 0 if stone is None else stone.value
+    return colors
 
 
 # tag::scoring_compute_game_result[]
@@ -136,4 +232,53 @@ def compute_game_result(game_state):
         territory.num_black_territory + territory.num_black_stones,
         territory.num_white_territory + territory.num_white_stones,
         komi=7.5)
-# end::scoring_compute_game_result[]
\ No newline at end of file
+# end::scoring_compute_game_result[]
+
+
+""" compute_playout_result:
+Score the end of a random playout.
+
+Gives the same result as compute_game_result for any board, but only
+the area of each color is needed, so no Territory or dame list is
+built. _region_reach already leaves every stone with its own color and
+every empty region with the color that alone surrounds it (dame has
+both bits or none), so one bincount of it counts the area of both
+colors.
+"""
+
+
+def compute_playout_result(game_state):
+    reached = _region_reach(_color_grid(game_state.board))
+    area = np.bincount(reached.ravel(), minlength=4)
+    return GameResult(
+        int(area[Player.black.value]), int(area[Player.white.value]),
+        komi=7.5)
+
+
+""" estimate_result:
+Cheaply estimate the score of a position that is still being played.
+
+Counts every stone plus the empty points whose neighbors are all stones
+of one color. Larger empty regions count for nobody, so the estimate
+is only close once most of the board is settled; truncated rollouts
+use it to stop early.
+"""
+
+
+def estimate_result(game_state, komi=7.5):
+    colors = game_state.board.color_array()
+    center = colors[1:-1, 1:-1]
+    sides = (colors[:-2, 1:-1], colors[2:, 1:-1],
+             colors[1:-1, :-2], colors[1:-1, 2:])
+    black_only = center == 0
+    white_only = black_only.copy()
+    # color_array marks the ring of off-board points with 3.
+    for side in sides:
+        black_only &= (side == Player.black.value) | (side == 3)
+        white_only &= (side == Player.white.value) | (side == 3)
+    return GameResult(
+        int((center == Player.black.value).sum() +
+            (black_only & ~white_only).sum()),
+        int((center == Player.white.value).sum() +
+            (white_only & ~black_only).sum()),
+        komi=komi)
@@ -53,17 +53,57 @@ def coords_from_point(point):
 
 
 class MoveAge():
+    """
+    石ごとの「置かれた時の手数」を記録し，年齢は読み出し時に
+    現在の手数との差として計算する．石を置くたびに盤面全体を
+    更新しなくて済むので，記録のコストは1手あたりO(1)になる
+    盤面ごとに1つ持つので，手数はint32に収めてメモリを節約する
+    """
+
+    __slots__ = ('move_number', 'placed_at')
+
     def __init__(self, board):
-        self.move_ages = - np.ones((board.num_rows, board.num_cols))
+        self.move_number = 0
+        self.placed_at = - np.ones((board.num_rows, board.num_cols), dtype=np.int32)
+
+    @property
+    def move_ages(self):
+        """ 全ての点の年齢．石が無い点は-1 """
+        return np.where(self.placed_at > -1, self.move_number - self.placed_at, -1)
 
     def get(self, row, col):
-        return self.move_ages[row, col]
+        placed_at = self.placed_at[row, col]
+        if placed_at < 0:
+            return -1
+        return self.move_number - placed_at
 
     def reset_age(self, point):
-        self.move_ages[point.row - 1, point.col - 1] = -1
+        self.placed_at[point.row - 1, point.col - 1] = -1
 
     def add(self, point):
-        self.move_ages[point.row - 1, point.col - 1] = 0
+        self.placed_at[point.row - 1, point.col - 1] = self.move_number
 
     def increment_all(self):
-        self.move_ages[self.move_ages > -1] += 1
+        self.move_number += 1
+
+    def copy(self):
+        copied = MoveAge.__new__(MoveAge)
+        copied.move_number = self.move_number
+        copied.placed_at = self.placed_at.copy()
+        return copied
+
+    def state(self, points):
+        """
+        unmake_moveで戻すための状態．手数と，これから変わる点
+        (置く点と取られる石)の置かれた時の手数だけを記録する
+        """
+        placed_at = self.placed_at
+        return self.move_number, [
+            (point, placed_at[point.row - 1, point.col - 1])
+            for point in points]
+
+    def restore(self, state):
+        self.move_number, cells = state
+        placed_at = self.placed_at
+        for point, placed in cells:
+            placed_at[point.row - 1, point.col - 1] = placed
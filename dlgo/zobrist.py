@@ -1,1090 +1,91 @@
-from .gotypes import Player, Point
+import numpy as np
+from .gotypes import Player
 
-__all__ = ['HASH_CODE', 'EMPTY_BOARD']
+"""
+    ゾブリストハッシュの表
+    起動時に固定のシードから生成するので，実行ごとに同じ値になる
+    TABLE[row - 1, col - 1, color]を点と色(0: 空点, 1: 黒, 2: 白)で引く
+    25路までの任意の大きさの碁盤で使える
+"""
+
+__all__ = [
+    'HASH_CODE',
+    'EMPTY_BOARD',
+    'MAX_BOARD_SIZE',
+    'TABLE',
+    'WHITE_TO_PLAY',
+    'hash_deltas',
+    'hash_table',
+    'situation_hash',
+]
+
+MAX_BOARD_SIZE = 25
+SEED = 20190101
+MAX63 = 0x7fffffffffffffff
+
+_rng = np.random.RandomState(SEED)
+TABLE = _rng.randint(
+    0, MAX63, size=(MAX_BOARD_SIZE, MAX_BOARD_SIZE, 3), dtype=np.uint64)
+TABLE.flags.writeable = False
+
+# Side-to-move key: XOR it in when white is to play.
+WHITE_TO_PLAY = int(_rng.randint(0, MAX63, dtype=np.uint64))
 
-HASH_CODE = {
-    (Point(row=1, col=1), Player.black): 3762189251963480799,
-    (Point(row=1, col=1), Player.white): 1243882706794297662,
-    (Point(row=1, col=1), None): 8526197868438571463,
-    (Point(row=1, col=2), Player.black): 5144894384873087839,
-    (Point(row=1, col=2), Player.white): 8301181254415794176,
-    (Point(row=1, col=2), None): 9038514871710117917,
-    (Point(row=1, col=3), Player.black): 1744893515934034207,
-    (Point(row=1, col=3), Player.white): 6709257702710949998,
-    (Point(row=1, col=3), None): 391287827377376338,
-    (Point(row=1, col=4), Player.black): 1328034091471722101,
-    (Point(row=1, col=4), Player.white): 7906795538061749761,
-    (Point(row=1, col=4), None): 7353219053701810371,
-    (Point(row=1, col=5), Player.black): 8130523816044591319,
-    (Point(row=1, col=5), Player.white): 1518338053750793916,
-    (Point(row=1, col=5), None): 2225549645793999580,
-    (Point(row=1, col=6), Player.black): 2947605355335344227,
-    (Point(row=1, col=6), Player.white): 8745390409286645717,
-    (Point(row=1, col=6), None): 5431384911238783879,
-    (Point(row=1, col=7), Player.black): 4706163627463555098,
-    (Point(row=1, col=7), Player.white): 4395976164088609657,
-    (Point(row=1, col=7), None): 2822442063227223078,
-    (Point(row=1, col=8), Player.black): 6790404935185206253,
-    (Point(row=1, col=8), Player.white): 6936776514726105982,
-    (Point(row=1, col=8), None): 5086434695399622423,
-    (Point(row=1, col=9), Player.black): 6719819962368148862,
-    (Point(row=1, col=9), Player.white): 4912880337225856341,
-    (Point(row=1, col=9), None): 1664096817437426511,
-    (Point(row=1, col=10), Player.black): 2423329883615414551,
-    (Point(row=1, col=10), Player.white): 4498706169383699655,
-    (Point(row=1, col=10), None): 7231672939189405782,
-    (Point(row=1, col=11), Player.black): 6869133557885686549,
-    (Point(row=1, col=11), Player.white): 8774537417030597899,
-    (Point(row=1, col=11), None): 2424650541997100183,
-    (Point(row=1, col=12), Player.black): 6119483862114550774,
-    (Point(row=1, col=12), Player.white): 9126730194077606097,
-    (Point(row=1, col=12), None): 7635966798414523916,
-    (Point(row=1, col=13), Player.black): 3041872013265276488,
-    (Point(row=1, col=13), Player.white): 3938617213956569155,
-    (Point(row=1, col=13), None): 5629211098977813524,
-    (Point(row=1, col=14), Player.black): 7068468718101176047,
-    (Point(row=1, col=14), Player.white): 9107187262816047838,
-    (Point(row=1, col=14), None): 1264352603134024091,
-    (Point(row=1, col=15), Player.black): 375813831944832312,
-    (Point(row=1, col=15), Player.white): 8482121483283935432,
-    (Point(row=1, col=15), None): 8875202481874721188,
-    (Point(row=1, col=16), Player.black): 8233427394197350960,
-    (Point(row=1, col=16), Player.white): 5677614830497941638,
-    (Point(row=1, col=16), None): 9141411002175761202,
-    (Point(row=1, col=17), Player.black): 1390172815110015006,
-    (Point(row=1, col=17), Player.white): 1144374274407541130,
-    (Point(row=1, col=17), None): 5189781258278705759,
-    (Point(row=1, col=18), Player.black): 7752969523557879209,
-    (Point(row=1, col=18), Player.white): 9168063999015601704,
-    (Point(row=1, col=18), None): 4745064211670649382,
-    (Point(row=1, col=19), Player.black): 1503990304932737325,
-    (Point(row=1, col=19), Player.white): 7798815487566425694,
-    (Point(row=1, col=19), None): 5709708724244856362,
-    (Point(row=2, col=1), Player.black): 8649394698129323055,
-    (Point(row=2, col=1), Player.white): 5826724963162349643,
-    (Point(row=2, col=1), None): 4999339036679412909,
-    (Point(row=2, col=2), Player.black): 3538142498226583285,
-    (Point(row=2, col=2), Player.white): 5512428191745614860,
-    (Point(row=2, col=2), None): 2466457011726020226,
-    (Point(row=2, col=3), Player.black): 3271700442428614319,
-    (Point(row=2, col=3), Player.white): 2301429229157724233,
-    (Point(row=2, col=3), None): 836783561634614431,
-    (Point(row=2, col=4), Player.black): 8370129021899423818,
-    (Point(row=2, col=4), Player.white): 8720901471049790823,
-    (Point(row=2, col=4), None): 8614461499095549158,
-    (Point(row=2, col=5), Player.black): 9079539978581476658,
-    (Point(row=2, col=5), Player.white): 2056447025280473636,
-    (Point(row=2, col=5), None): 7431110328682996862,
-    (Point(row=2, col=6), Player.black): 8599532674601935201,
-    (Point(row=2, col=6), Player.white): 5745218444125482436,
-    (Point(row=2, col=6), None): 9117649232647471157,
-    (Point(row=2, col=7), Player.black): 7089899328425601132,
-    (Point(row=2, col=7), Player.white): 2354767369686833129,
-    (Point(row=2, col=7), None): 5012018724497700328,
-    (Point(row=2, col=8), Player.black): 8789454210628140826,
-    (Point(row=2, col=8), Player.white): 939183457742935685,
-    (Point(row=2, col=8), None): 6051821796683114778,
-    (Point(row=2, col=9), Player.black): 2488598291656711673,
-    (Point(row=2, col=9), Player.white): 2843975830697649079,
-    (Point(row=2, col=9), None): 7965263772821080254,
-    (Point(row=2, col=10), Player.black): 7483952697094359617,
-    (Point(row=2, col=10), Player.white): 6921698458214275956,
-    (Point(row=2, col=10), None): 4964420164583487083,
-    (Point(row=2, col=11), Player.black): 5766935863478314700,
-    (Point(row=2, col=11), Player.white): 2476074032273966688,
-    (Point(row=2, col=11), None): 2671266844951614191,
-    (Point(row=2, col=12), Player.black): 6957770930838825885,
-    (Point(row=2, col=12), Player.white): 4748600479383684786,
-    (Point(row=2, col=12), None): 1578677113947988283,
-    (Point(row=2, col=13), Player.black): 6787154531988531551,
-    (Point(row=2, col=13), Player.white): 6120132626589222977,
-    (Point(row=2, col=13), None): 8599765927372199428,
-    (Point(row=2, col=14), Player.black): 2383906980605888245,
-    (Point(row=2, col=14), Player.white): 1759694231519636095,
-    (Point(row=2, col=14), None): 8935340192009468741,
-    (Point(row=2, col=15), Player.black): 6697281101815067911,
-    (Point(row=2, col=15), Player.white): 1687913945690959508,
-    (Point(row=2, col=15), None): 1255387731858127378,
-    (Point(row=2, col=16), Player.black): 5745559623760946582,
-    (Point(row=2, col=16), Player.white): 5646865144227540471,
-    (Point(row=2, col=16), None): 6863997221800323596,
-    (Point(row=2, col=17), Player.black): 8947351541302055618,
-    (Point(row=2, col=17), Player.white): 4883602600350986690,
-    (Point(row=2, col=17), None): 6664550468932148567,
-    (Point(row=2, col=18), Player.black): 6378040232554029007,
-    (Point(row=2, col=18), Player.white): 6188602788971676654,
-    (Point(row=2, col=18), None): 5340180348773693374,
-    (Point(row=2, col=19), Player.black): 232716742526552059,
-    (Point(row=2, col=19), Player.white): 6911592030732183005,
-    (Point(row=2, col=19), None): 1707912418473413547,
-    (Point(row=3, col=1), Player.black): 2742547583003904568,
-    (Point(row=3, col=1), Player.white): 941184054158837039,
-    (Point(row=3, col=1), None): 1256280481189444364,
-    (Point(row=3, col=2), Player.black): 6689389799985347059,
-    (Point(row=3, col=2), Player.white): 1664455128232058629,
-    (Point(row=3, col=2), None): 4404139054291272283,
-    (Point(row=3, col=3), Player.black): 1817064167563490790,
-    (Point(row=3, col=3), Player.white): 3325710232424974385,
-    (Point(row=3, col=3), None): 9187206709609539969,
-    (Point(row=3, col=4), Player.black): 4681152314276374110,
-    (Point(row=3, col=4), Player.white): 6127387267067339056,
-    (Point(row=3, col=4), None): 2095248279819118198,
-    (Point(row=3, col=5), Player.black): 4013791016374694710,
-    (Point(row=3, col=5), Player.white): 6939590624015230136,
-    (Point(row=3, col=5), None): 1512838601574505933,
-    (Point(row=3, col=6), Player.black): 7519755274179365481,
-    (Point(row=3, col=6), Player.white): 5480764388177082199,
-    (Point(row=3, col=6), None): 6125438967449662385,
-    (Point(row=3, col=7), Player.black): 4653369171816878830,
-    (Point(row=3, col=7), Player.white): 8722336070014854826,
-    (Point(row=3, col=7), None): 3695826247649602844,
-    (Point(row=3, col=8), Player.black): 698491179166209579,
-    (Point(row=3, col=8), Player.white): 173580697655867167,
-    (Point(row=3, col=8), None): 2266145395678137569,
-    (Point(row=3, col=9), Player.black): 4441863770916741827,
-    (Point(row=3, col=9), Player.white): 3049180354222426714,
-    (Point(row=3, col=9), None): 2596902270162983607,
-    (Point(row=3, col=10), Player.black): 873438767565812999,
-    (Point(row=3, col=10), Player.white): 1612175056968445606,
-    (Point(row=3, col=10), None): 2726041362513601091,
-    (Point(row=3, col=11), Player.black): 1637395555369727046,
-    (Point(row=3, col=11), Player.white): 3765014332227699355,
-    (Point(row=3, col=11), None): 8358353845313530506,
-    (Point(row=3, col=12), Player.black): 960826815747417715,
-    (Point(row=3, col=12), Player.white): 7512609133923203201,
-    (Point(row=3, col=12), None): 97097403326644518,
-    (Point(row=3, col=13), Player.black): 605581337346982906,
-    (Point(row=3, col=13), Player.white): 4664689274870222009,
-    (Point(row=3, col=13), None): 9193222755010974784,
-    (Point(row=3, col=14), Player.black): 4950672380090110755,
-    (Point(row=3, col=14), Player.white): 8980015915233535341,
-    (Point(row=3, col=14), None): 6140968709620863442,
-    (Point(row=3, col=15), Player.black): 2936829419676788403,
-    (Point(row=3, col=15), Player.white): 154014400253104525,
-    (Point(row=3, col=15), None): 2260060047512498993,
-    (Point(row=3, col=16), Player.black): 5391532891329698634,
-    (Point(row=3, col=16), Player.white): 4644571821864414793,
-    (Point(row=3, col=16), None): 510046444771329424,
-    (Point(row=3, col=17), Player.black): 4543467724367814987,
-    (Point(row=3, col=17), Player.white): 3740566051640654880,
-    (Point(row=3, col=17), None): 5263379154167600206,
-    (Point(row=3, col=18), Player.black): 2788359520132373564,
-    (Point(row=3, col=18), Player.white): 4497995680408442176,
-    (Point(row=3, col=18), None): 8093245160833705839,
-    (Point(row=3, col=19), Player.black): 5427692642870208771,
-    (Point(row=3, col=19), Player.white): 3698911120060671621,
-    (Point(row=3, col=19), None): 6905625279093655781,
-    (Point(row=4, col=1), Player.black): 7468969053716303703,
-    (Point(row=4, col=1), Player.white): 2554236913696761496,
-    (Point(row=4, col=1), None): 7865795202214476261,
-    (Point(row=4, col=2), Player.black): 718299982173059957,
-    (Point(row=4, col=2), Player.white): 2635982165340219767,
-    (Point(row=4, col=2), None): 2281261420406009978,
-    (Point(row=4, col=3), Player.black): 8430449528468144911,
-    (Point(row=4, col=3), Player.white): 7802415513067544742,
-    (Point(row=4, col=3), None): 660479323198051720,
-    (Point(row=4, col=4), Player.black): 9012681343141413718,
-    (Point(row=4, col=4), Player.white): 3051344660968761233,
-    (Point(row=4, col=4), None): 8647474643611192564,
-    (Point(row=4, col=5), Player.black): 2490898216968443147,
-    (Point(row=4, col=5), Player.white): 3541712998731941747,
-    (Point(row=4, col=5), None): 8085277613259902031,
-    (Point(row=4, col=6), Player.black): 3864407531597160868,
-    (Point(row=4, col=6), Player.white): 4479823462352268442,
-    (Point(row=4, col=6), None): 1686802956351900162,
-    (Point(row=4, col=7), Player.black): 5507735850453970728,
-    (Point(row=4, col=7), Player.white): 7981056233351957521,
-    (Point(row=4, col=7), None): 2084461624091293546,
-    (Point(row=4, col=8), Player.black): 8677080829949109938,
-    (Point(row=4, col=8), Player.white): 765924860950584396,
-    (Point(row=4, col=8), None): 8602549889099770082,
-    (Point(row=4, col=9), Player.black): 9070709999199349766,
-    (Point(row=4, col=9), Player.white): 1961681217914867636,
-    (Point(row=4, col=9), None): 202499412382267066,
-    (Point(row=4, col=10), Player.black): 4264666756279326305,
-    (Point(row=4, col=10), Player.white): 8719647607250848399,
-    (Point(row=4, col=10), None): 8503344414247650012,
-    (Point(row=4, col=11), Player.black): 3174236569986188613,
-    (Point(row=4, col=11), Player.white): 3322340326286696557,
-    (Point(row=4, col=11), None): 2534609569047308537,
-    (Point(row=4, col=12), Player.black): 3669874687576546272,
-    (Point(row=4, col=12), Player.white): 7095935970138144868,
-    (Point(row=4, col=12), None): 2951679980841527643,
-    (Point(row=4, col=13), Player.black): 6766473097213675169,
-    (Point(row=4, col=13), Player.white): 4308631065312343683,
-    (Point(row=4, col=13), None): 3005562161707964100,
-    (Point(row=4, col=14), Player.black): 4320878116789064407,
-    (Point(row=4, col=14), Player.white): 5709113603875309413,
-    (Point(row=4, col=14), None): 8665070134576712246,
-    (Point(row=4, col=15), Player.black): 4112782255161557826,
-    (Point(row=4, col=15), Player.white): 3816616165246421094,
-    (Point(row=4, col=15), None): 4485306842750480004,
-    (Point(row=4, col=16), Player.black): 2941520832601250739,
-    (Point(row=4, col=16), Player.white): 7560822627485364839,
-    (Point(row=4, col=16), None): 5356641284518499644,
-    (Point(row=4, col=17), Player.black): 6151291053198281552,
-    (Point(row=4, col=17), Player.white): 2180118417315925500,
-    (Point(row=4, col=17), None): 7847997311353710183,
-    (Point(row=4, col=18), Player.black): 136214702997109399,
-    (Point(row=4, col=18), Player.white): 7787202216156451587,
-    (Point(row=4, col=18), None): 8320167908324824859,
-    (Point(row=4, col=19), Player.black): 5743006166188255451,
-    (Point(row=4, col=19), Player.white): 9200399940409206782,
-    (Point(row=4, col=19), None): 1064059987508135398,
-    (Point(row=5, col=1), Player.black): 7904029586598416778,
-    (Point(row=5, col=1), Player.white): 2646854574737049762,
-    (Point(row=5, col=1), None): 4809037583408246533,
-    (Point(row=5, col=2), Player.black): 1869637738785187937,
-    (Point(row=5, col=2), Player.white): 1251386815467511836,
-    (Point(row=5, col=2), None): 2109958258170650064,
-    (Point(row=5, col=3), Player.black): 6101987118464239708,
-    (Point(row=5, col=3), Player.white): 2324339909648808597,
-    (Point(row=5, col=3), None): 8923032548606403694,
-    (Point(row=5, col=4), Player.black): 3095580795293780025,
-    (Point(row=5, col=4), Player.white): 6712202365687222025,
-    (Point(row=5, col=4), None): 3519030931947214617,
-    (Point(row=5, col=5), Player.black): 4857657923773416949,
-    (Point(row=5, col=5), Player.white): 5246191093753700577,
-    (Point(row=5, col=5), None): 2023943643741371058,
-    (Point(row=5, col=6), Player.black): 1255762925904402640,
-    (Point(row=5, col=6), Player.white): 7410444851924864753,
-    (Point(row=5, col=6), None): 1503197864125718782,
-    (Point(row=5, col=7), Player.black): 5894953885834733472,
-    (Point(row=5, col=7), Player.white): 6337992657334954214,
-    (Point(row=5, col=7), None): 806967003186497245,
-    (Point(row=5, col=8), Player.black): 7862016800330556024,
-    (Point(row=5, col=8), Player.white): 6771640188824552005,
-    (Point(row=5, col=8), None): 543143225952123072,
-    (Point(row=5, col=9), Player.black): 8119746247675437433,
-    (Point(row=5, col=9), Player.white): 2195976878642650268,
-    (Point(row=5, col=9), None): 6320621150840644737,
-    (Point(row=5, col=10), Player.black): 4707026863015293431,
-    (Point(row=5, col=10), Player.white): 366785680659337008,
-    (Point(row=5, col=10), None): 4766300672568466012,
-    (Point(row=5, col=11), Player.black): 5495255747076903084,
-    (Point(row=5, col=11), Player.white): 4760095988956052234,
-    (Point(row=5, col=11), None): 4660242250127870614,
-    (Point(row=5, col=12), Player.black): 742384931352880262,
-    (Point(row=5, col=12), Player.white): 375939120463489641,
-    (Point(row=5, col=12), None): 5670489777070771046,
-    (Point(row=5, col=13), Player.black): 2949790083806963430,
-    (Point(row=5, col=13), Player.white): 4044046941061673464,
-    (Point(row=5, col=13), None): 8845015252315654277,
-    (Point(row=5, col=14), Player.black): 155222783999680808,
-    (Point(row=5, col=14), Player.white): 4743903873128545393,
-    (Point(row=5, col=14), None): 6869343123520566523,
-    (Point(row=5, col=15), Player.black): 891848230709173450,
-    (Point(row=5, col=15), Player.white): 6451377489978991306,
-    (Point(row=5, col=15), None): 6463796825828106443,
-    (Point(row=5, col=16), Player.black): 1596882164098492528,
-    (Point(row=5, col=16), Player.white): 2468307536534308323,
-    (Point(row=5, col=16), None): 3379710443946460808,
-    (Point(row=5, col=17), Player.black): 2251879834317601082,
-    (Point(row=5, col=17), Player.white): 1356181501477798928,
-    (Point(row=5, col=17), None): 2099448720827536935,
-    (Point(row=5, col=18), Player.black): 315808890389196819,
-    (Point(row=5, col=18), Player.white): 3272019795508112872,
-    (Point(row=5, col=18), None): 266649384510178408,
-    (Point(row=5, col=19), Player.black): 6195648612504854201,
-    (Point(row=5, col=19), Player.white): 7661515452010948490,
-    (Point(row=5, col=19), None): 22791820383724226,
-    (Point(row=6, col=1), Player.black): 666808641199938544,
-    (Point(row=6, col=1), Player.white): 7197068934155033779,
-    (Point(row=6, col=1), None): 8759290531933496720,
-    (Point(row=6, col=2), Player.black): 6929689840940648660,
-    (Point(row=6, col=2), Player.white): 3622571693707336082,
-    (Point(row=6, col=2), None): 2034492406685863097,
-    (Point(row=6, col=3), Player.black): 8581744257160279906,
-    (Point(row=6, col=3), Player.white): 7887317055143770644,
-    (Point(row=6, col=3), None): 7508091227762269246,
-    (Point(row=6, col=4), Player.black): 106731621291613604,
-    (Point(row=6, col=4), Player.white): 847839910580759688,
-    (Point(row=6, col=4), None): 6047291607991716018,
-    (Point(row=6, col=5), Player.black): 7335643378238420262,
-    (Point(row=6, col=5), Player.white): 5141614248445343061,
-    (Point(row=6, col=5), None): 8380552751981595461,
-    (Point(row=6, col=6), Player.black): 6887120713025771501,
-    (Point(row=6, col=6), Player.white): 8099978996475985264,
-    (Point(row=6, col=6), None): 789727738697220424,
-    (Point(row=6, col=7), Player.black): 8258669547052662650,
-    (Point(row=6, col=7), Player.white): 607353988439252810,
-    (Point(row=6, col=7), None): 405393145786916592,
-    (Point(row=6, col=8), Player.black): 3899450674030790564,
-    (Point(row=6, col=8), Player.white): 1037905923738005342,
-    (Point(row=6, col=8), None): 5252693844767779357,
-    (Point(row=6, col=9), Player.black): 2342581150679791033,
-    (Point(row=6, col=9), Player.white): 5138954361802929564,
-    (Point(row=6, col=9), None): 2939246337706008980,
-    (Point(row=6, col=10), Player.black): 8556806490647226854,
-    (Point(row=6, col=10), Player.white): 2008180101946838289,
-    (Point(row=6, col=10), None): 307370397317156372,
-    (Point(row=6, col=11), Player.black): 197532866206439934,
-    (Point(row=6, col=11), Player.white): 544284795475203720,
-    (Point(row=6, col=11), None): 8989717270311927374,
-    (Point(row=6, col=12), Player.black): 2395381659705808994,
-    (Point(row=6, col=12), Player.white): 4663967996381422537,
-    (Point(row=6, col=12), None): 1007798867658995748,
-    (Point(row=6, col=13), Player.black): 2399154731864256528,
-    (Point(row=6, col=13), Player.white): 3085451116994455264,
-    (Point(row=6, col=13), None): 421031028179799701,
-    (Point(row=6, col=14), Player.black): 8616996706704755648,
-    (Point(row=6, col=14), Player.white): 392811484852521130,
-    (Point(row=6, col=14), None): 3198826598852783379,
-    (Point(row=6, col=15), Player.black): 7993037496999422244,
-    (Point(row=6, col=15), Player.white): 6076000137079586823,
-    (Point(row=6, col=15), None): 6964293792757176672,
-    (Point(row=6, col=16), Player.black): 308006171907046742,
-    (Point(row=6, col=16), Player.white): 9009120855029992551,
-    (Point(row=6, col=16), None): 2505993417917070554,
-    (Point(row=6, col=17), Player.black): 3749184756079691257,
-    (Point(row=6, col=17), Player.white): 5686321099097352494,
-    (Point(row=6, col=17), None): 4673481305354263047,
-    (Point(row=6, col=18), Player.black): 669234638169842341,
-    (Point(row=6, col=18), Player.white): 6314499311302613283,
-    (Point(row=6, col=18), None): 2700275424786099803,
-    (Point(row=6, col=19), Player.black): 4718248360695830320,
-    (Point(row=6, col=19), Player.white): 254553674225629273,
-    (Point(row=6, col=19), None): 8031843433954796051,
-    (Point(row=7, col=1), Player.black): 8411291185181537752,
-    (Point(row=7, col=1), Player.white): 4467055352713949148,
-    (Point(row=7, col=1), None): 6145583599655501535,
-    (Point(row=7, col=2), Player.black): 1774360565556972628,
-    (Point(row=7, col=2), Player.white): 2854504660129474289,
-    (Point(row=7, col=2), None): 1483514061899776112,
-    (Point(row=7, col=3), Player.black): 1369623306783366656,
-    (Point(row=7, col=3), Player.white): 8349607906055073274,
-    (Point(row=7, col=3), None): 8694219276589478392,
-    (Point(row=7, col=4), Player.black): 7423983694110230944,
-    (Point(row=7, col=4), Player.white): 1818223146538270005,
-    (Point(row=7, col=4), None): 7119192266601742566,
-    (Point(row=7, col=5), Player.black): 4571465628193559553,
-    (Point(row=7, col=5), Player.white): 2031179380988822586,
-    (Point(row=7, col=5), None): 3816902992567635280,
-    (Point(row=7, col=6), Player.black): 2885404626488555430,
-    (Point(row=7, col=6), Player.white): 6608246342484634498,
-    (Point(row=7, col=6), None): 1711398068025872780,
-    (Point(row=7, col=7), Player.black): 5417659018199808082,
-    (Point(row=7, col=7), Player.white): 4554910006283496580,
-    (Point(row=7, col=7), None): 1067582166205275672,
-    (Point(row=7, col=8), Player.black): 4589138424585544372,
-    (Point(row=7, col=8), Player.white): 8392793741935072793,
-    (Point(row=7, col=8), None): 2934547263319236788,
-    (Point(row=7, col=9), Player.black): 7796989120539654356,
-    (Point(row=7, col=9), Player.white): 7747039005105673378,
-    (Point(row=7, col=9), None): 1367294054928354005,
-    (Point(row=7, col=10), Player.black): 291807851452653646,
-    (Point(row=7, col=10), Player.white): 5135581506521006445,
-    (Point(row=7, col=10), None): 2972286299465828653,
-    (Point(row=7, col=11), Player.black): 4405869188868589457,
-    (Point(row=7, col=11), Player.white): 4633437235400018691,
-    (Point(row=7, col=11), None): 7821229881437017749,
-    (Point(row=7, col=12), Player.black): 3178139069240163389,
-    (Point(row=7, col=12), Player.white): 5101223626636997034,
-    (Point(row=7, col=12), None): 3930248037034514877,
-    (Point(row=7, col=13), Player.black): 5607042870719915957,
-    (Point(row=7, col=13), Player.white): 3381385156709077948,
-    (Point(row=7, col=13), None): 3423738061165753050,
-    (Point(row=7, col=14), Player.black): 2148058249644338015,
-    (Point(row=7, col=14), Player.white): 3917079183185655310,
-    (Point(row=7, col=14), None): 3057177713865598993,
-    (Point(row=7, col=15), Player.black): 890027052865926499,
-    (Point(row=7, col=15), Player.white): 3700998397919788271,
-    (Point(row=7, col=15), None): 6025151078890980866,
-    (Point(row=7, col=16), Player.black): 2821692984311624744,
-    (Point(row=7, col=16), Player.white): 3935091228391072080,
-    (Point(row=7, col=16), None): 2683108484222879445,
-    (Point(row=7, col=17), Player.black): 5865431588302382912,
-    (Point(row=7, col=17), Player.white): 8053094698902392208,
-    (Point(row=7, col=17), None): 6957349834460070747,
-    (Point(row=7, col=18), Player.black): 5023658463013636908,
-    (Point(row=7, col=18), Player.white): 1377212810141184476,
-    (Point(row=7, col=18), None): 2922253596713011509,
-    (Point(row=7, col=19), Player.black): 3036515656294456067,
-    (Point(row=7, col=19), Player.white): 316721361709759228,
-    (Point(row=7, col=19), None): 396016239876559732,
-    (Point(row=8, col=1), Player.black): 5477021959955860585,
-    (Point(row=8, col=1), Player.white): 2139311639099760925,
-    (Point(row=8, col=1), None): 3880294458190510517,
-    (Point(row=8, col=2), Player.black): 4495784884297507082,
-    (Point(row=8, col=2), Player.white): 4189742083324912847,
-    (Point(row=8, col=2), None): 6704592460565007045,
-    (Point(row=8, col=3), Player.black): 5612680901560076943,
-    (Point(row=8, col=3), Player.white): 6865052664477815174,
-    (Point(row=8, col=3), None): 644314240846929330,
-    (Point(row=8, col=4), Player.black): 6339957447782645330,
-    (Point(row=8, col=4), Player.white): 6171840851208998502,
-    (Point(row=8, col=4), None): 978974823146643752,
-    (Point(row=8, col=5), Player.black): 1740773320774090361,
-    (Point(row=8, col=5), Player.white): 7748333384745802962,
-    (Point(row=8, col=5), None): 7993158690430154891,
-    (Point(row=8, col=6), Player.black): 5460670729142925121,
-    (Point(row=8, col=6), Player.white): 7245709156429494268,
-    (Point(row=8, col=6), None): 6515237591732072205,
-    (Point(row=8, col=7), Player.black): 7154523284343341398,
-    (Point(row=8, col=7), Player.white): 7555874362541561350,
-    (Point(row=8, col=7), None): 1786410267384632907,
-    (Point(row=8, col=8), Player.black): 336243452852707904,
-    (Point(row=8, col=8), Player.white): 1845490193757385579,
-    (Point(row=8, col=8), None): 2311639197837504919,
-    (Point(row=8, col=9), Player.black): 7027777610776001694,
-    (Point(row=8, col=9), Player.white): 2616791406427256719,
-    (Point(row=8, col=9), None): 4284599135684442366,
-    (Point(row=8, col=10), Player.black): 7707932365666832442,
-    (Point(row=8, col=10), Player.white): 1853895447121149667,
-    (Point(row=8, col=10), None): 4838378826856558631,
-    (Point(row=8, col=11), Player.black): 2106233560556020662,
-    (Point(row=8, col=11), Player.white): 7330611470087560076,
-    (Point(row=8, col=11), None): 6873684817890662328,
-    (Point(row=8, col=12), Player.black): 4649127314693606651,
-    (Point(row=8, col=12), Player.white): 2112525057989528935,
-    (Point(row=8, col=12), None): 8302167064304210434,
-    (Point(row=8, col=13), Player.black): 1840393488981713516,
-    (Point(row=8, col=13), Player.white): 796805384506022485,
-    (Point(row=8, col=13), None): 8912540907269621858,
-    (Point(row=8, col=14), Player.black): 660931974565034173,
-    (Point(row=8, col=14), Player.white): 6020965754613079987,
-    (Point(row=8, col=14), None): 500048668296144213,
-    (Point(row=8, col=15), Player.black): 8396885798519213204,
-    (Point(row=8, col=15), Player.white): 7502809225854343660,
-    (Point(row=8, col=15), None): 5840612309569392142,
-    (Point(row=8, col=16), Player.black): 377508887778312944,
-    (Point(row=8, col=16), Player.white): 7325010797114147294,
-    (Point(row=8, col=16), None): 5742973755134007038,
-    (Point(row=8, col=17), Player.black): 2068581695555319361,
-    (Point(row=8, col=17), Player.white): 6233352765649606684,
-    (Point(row=8, col=17), None): 6246551411881461647,
-    (Point(row=8, col=18), Player.black): 1853952967931721581,
-    (Point(row=8, col=18), Player.white): 3657081567205077669,
-    (Point(row=8, col=18), None): 7950372892912039095,
-    (Point(row=8, col=19), Player.black): 2591251080617612434,
-    (Point(row=8, col=19), Player.white): 6755845840342543892,
-    (Point(row=8, col=19), None): 1357471989251350777,
-    (Point(row=9, col=1), Player.black): 2833981656706775450,
-    (Point(row=9, col=1), Player.white): 6280185279101288427,
-    (Point(row=9, col=1), None): 6561208710569409294,
-    (Point(row=9, col=2), Player.black): 6200186592764331550,
-    (Point(row=9, col=2), Player.white): 4056988754025341717,
-    (Point(row=9, col=2), None): 9192534008062891782,
-    (Point(row=9, col=3), Player.black): 907340209980687801,
-    (Point(row=9, col=3), Player.white): 4423587768231090219,
-    (Point(row=9, col=3), None): 3910022926581716418,
-    (Point(row=9, col=4), Player.black): 1596286964328307591,
-    (Point(row=9, col=4), Player.white): 346149545215202546,
-    (Point(row=9, col=4), None): 8403274612976272287,
-    (Point(row=9, col=5), Player.black): 6281929539355056505,
-    (Point(row=9, col=5), Player.white): 450045368036581762,
-    (Point(row=9, col=5), None): 7608632487492270056,
-    (Point(row=9, col=6), Player.black): 4421943565252235368,
-    (Point(row=9, col=6), Player.white): 7976022288424315532,
-    (Point(row=9, col=6), None): 4098621843319127984,
-    (Point(row=9, col=7), Player.black): 935988011416602591,
-    (Point(row=9, col=7), Player.white): 8468668647423584683,
-    (Point(row=9, col=7), None): 9160902913651173012,
-    (Point(row=9, col=8), Player.black): 6358357668288715906,
-    (Point(row=9, col=8), Player.white): 7166647635851481538,
-    (Point(row=9, col=8), None): 9142675872543857973,
-    (Point(row=9, col=9), Player.black): 3216647113778454231,
-    (Point(row=9, col=9), Player.white): 1849438475252213101,
-    (Point(row=9, col=9), None): 813604972774652165,
-    (Point(row=9, col=10), Player.black): 4031202363483072962,
-    (Point(row=9, col=10), Player.white): 1357975516403372794,
-    (Point(row=9, col=10), None): 5015526223888001445,
-    (Point(row=9, col=11), Player.black): 2786580109110027805,
-    (Point(row=9, col=11), Player.white): 4993894980249599329,
-    (Point(row=9, col=11), None): 7143568906389863816,
-    (Point(row=9, col=12), Player.black): 5470610768020178543,
-    (Point(row=9, col=12), Player.white): 2099371525387187595,
-    (Point(row=9, col=12), None): 5818135137383659150,
-    (Point(row=9, col=13), Player.black): 5761364949705264893,
-    (Point(row=9, col=13), Player.white): 933620157699000268,
-    (Point(row=9, col=13), None): 4303761300922248749,
-    (Point(row=9, col=14), Player.black): 6323045311186345941,
-    (Point(row=9, col=14), Player.white): 4706202456061860775,
-    (Point(row=9, col=14), None): 7247498800139780287,
-    (Point(row=9, col=15), Player.black): 2721886745200356831,
-    (Point(row=9, col=15), Player.white): 102706267243998134,
-    (Point(row=9, col=15), None): 3370186817445575560,
-    (Point(row=9, col=16), Player.black): 1167626447378520359,
-    (Point(row=9, col=16), Player.white): 282014006081960711,
-    (Point(row=9, col=16), None): 5330868456164681577,
-    (Point(row=9, col=17), Player.black): 3852672779590349500,
-    (Point(row=9, col=17), Player.white): 8214549225556822677,
-    (Point(row=9, col=17), None): 6483409292670762009,
-    (Point(row=9, col=18), Player.black): 3451590546719359931,
-    (Point(row=9, col=18), Player.white): 5788058249364676838,
-    (Point(row=9, col=18), None): 1462065295222185865,
-    (Point(row=9, col=19), Player.black): 875605117737745439,
-    (Point(row=9, col=19), Player.white): 2226781298680135200,
-    (Point(row=9, col=19), None): 3367805292899189713,
-    (Point(row=10, col=1), Player.black): 6221817005254384343,
-    (Point(row=10, col=1), Player.white): 5234401259615006597,
-    (Point(row=10, col=1), None): 8071964114721722173,
-    (Point(row=10, col=2), Player.black): 45754098877439237,
-    (Point(row=10, col=2), Player.white): 7233357862686991398,
-    (Point(row=10, col=2), None): 4301813662111839239,
-    (Point(row=10, col=3), Player.black): 4096718000217285727,
-    (Point(row=10, col=3), Player.white): 6557312011712501034,
-    (Point(row=10, col=3), None): 4294469927595617389,
-    (Point(row=10, col=4), Player.black): 1406517571496946480,
-    (Point(row=10, col=4), Player.white): 1707648326126854727,
-    (Point(row=10, col=4), None): 3704213099365844963,
-    (Point(row=10, col=5), Player.black): 1192424305587929263,
-    (Point(row=10, col=5), Player.white): 646902140449887028,
-    (Point(row=10, col=5), None): 461581074018259140,
-    (Point(row=10, col=6), Player.black): 4861929446618728032,
-    (Point(row=10, col=6), Player.white): 678031287896337037,
-    (Point(row=10, col=6), None): 7252307037129270727,
-    (Point(row=10, col=7), Player.black): 6151504470297389831,
-    (Point(row=10, col=7), Player.white): 6402983363621915713,
-    (Point(row=10, col=7), None): 726803537881976786,
-    (Point(row=10, col=8), Player.black): 7406130548175286872,
-    (Point(row=10, col=8), Player.white): 8046271387807259745,
-    (Point(row=10, col=8), None): 4578743632289597499,
-    (Point(row=10, col=9), Player.black): 183753696505571792,
-    (Point(row=10, col=9), Player.white): 5195277936287941427,
-    (Point(row=10, col=9), None): 8831201027363524162,
-    (Point(row=10, col=10), Player.black): 5246445722241542944,
-    (Point(row=10, col=10), Player.white): 3361747903970426906,
-    (Point(row=10, col=10), None): 7807596727210004839,
-    (Point(row=10, col=11), Player.black): 2132927991879973075,
-    (Point(row=10, col=11), Player.white): 9057217392958771682,
-    (Point(row=10, col=11), None): 4173187117198234811,
-    (Point(row=10, col=12), Player.black): 2651536237087445780,
-    (Point(row=10, col=12), Player.white): 7396884644312447462,
-    (Point(row=10, col=12), None): 6311935775818085209,
-    (Point(row=10, col=13), Player.black): 7029595259318389807,
-    (Point(row=10, col=13), Player.white): 2191815847800729987,
-    (Point(row=10, col=13), None): 6141433287124615639,
-    (Point(row=10, col=14), Player.black): 1494490641798374284,
-    (Point(row=10, col=14), Player.white): 3804859441434031025,
-    (Point(row=10, col=14), None): 4774042785122151693,
-    (Point(row=10, col=15), Player.black): 6749922356540676626,
-    (Point(row=10, col=15), Player.white): 1101410726194365700,
-    (Point(row=10, col=15), None): 7952986911117394968,
-    (Point(row=10, col=16), Player.black): 4948546898339993967,
-    (Point(row=10, col=16), Player.white): 6216539078069020608,
-    (Point(row=10, col=16), None): 5140745616521007756,
-    (Point(row=10, col=17), Player.black): 4830189561130452569,
-    (Point(row=10, col=17), Player.white): 3525475679657889302,
-    (Point(row=10, col=17), None): 4877744323537703236,
-    (Point(row=10, col=18), Player.black): 4439829691660538033,
-    (Point(row=10, col=18), Player.white): 6458516032230452296,
-    (Point(row=10, col=18), None): 6318475352822442196,
-    (Point(row=10, col=19), Player.black): 5269822162526771118,
-    (Point(row=10, col=19), Player.white): 562021249033987794,
-    (Point(row=10, col=19), None): 7654647387606244995,
-    (Point(row=11, col=1), Player.black): 4763372945336972854,
-    (Point(row=11, col=1), Player.white): 1621471057112763736,
-    (Point(row=11, col=1), None): 4090482172943689508,
-    (Point(row=11, col=2), Player.black): 2364073858253988774,
-    (Point(row=11, col=2), Player.white): 2829521528511733315,
-    (Point(row=11, col=2), None): 8871852211289240286,
-    (Point(row=11, col=3), Player.black): 3346484549237908111,
-    (Point(row=11, col=3), Player.white): 7607390211700344915,
-    (Point(row=11, col=3), None): 6837652539890320163,
-    (Point(row=11, col=4), Player.black): 3696611968264472227,
-    (Point(row=11, col=4), Player.white): 5331490733709088786,
-    (Point(row=11, col=4), None): 7220384183275331979,
-    (Point(row=11, col=5), Player.black): 8191857675132584066,
-    (Point(row=11, col=5), Player.white): 2097750669481064065,
-    (Point(row=11, col=5), None): 9219123881961133239,
-    (Point(row=11, col=6), Player.black): 3918485835473002745,
-    (Point(row=11, col=6), Player.white): 6389500390603379177,
-    (Point(row=11, col=6), None): 1820711209476218350,
-    (Point(row=11, col=7), Player.black): 2513005460927585438,
-    (Point(row=11, col=7), Player.white): 9068664344847958653,
-    (Point(row=11, col=7), None): 8849109683173055823,
-    (Point(row=11, col=8), Player.black): 1698969389779377970,
-    (Point(row=11, col=8), Player.white): 885210366624833864,
-    (Point(row=11, col=8), None): 8459469743612011017,
-    (Point(row=11, col=9), Player.black): 8558025018329068277,
-    (Point(row=11, col=9), Player.white): 4981023739347691564,
-    (Point(row=11, col=9), None): 380680713294124517,
-    (Point(row=11, col=10), Player.black): 3844216330499794383,
-    (Point(row=11, col=10), Player.white): 3543939928282127343,
-    (Point(row=11, col=10), None): 6263275790423249231,
-    (Point(row=11, col=11), Player.black): 4778579685058966132,
-    (Point(row=11, col=11), Player.white): 9010434934745935178,
-    (Point(row=11, col=11), None): 1227563394124292950,
-    (Point(row=11, col=12), Player.black): 54940332103014043,
-    (Point(row=11, col=12), Player.white): 4777285892223124775,
-    (Point(row=11, col=12), None): 7013710297729096325,
-    (Point(row=11, col=13), Player.black): 9014751759154855740,
-    (Point(row=11, col=13), Player.white): 340089510871923882,
-    (Point(row=11, col=13), None): 4966330740220109329,
-    (Point(row=11, col=14), Player.black): 9214851931874004753,
-    (Point(row=11, col=14), Player.white): 4341259356694508374,
-    (Point(row=11, col=14), None): 5451329558218583338,
-    (Point(row=11, col=15), Player.black): 3719580515323785575,
-    (Point(row=11, col=15), Player.white): 2140766228304138407,
-    (Point(row=11, col=15), None): 4386185966220732883,
-    (Point(row=11, col=16), Player.black): 6757129143117156040,
-    (Point(row=11, col=16), Player.white): 3331154082570852897,
-    (Point(row=11, col=16), None): 4503538047146108303,
-    (Point(row=11, col=17), Player.black): 1649844516026059179,
-    (Point(row=11, col=17), Player.white): 8615415605241928254,
-    (Point(row=11, col=17), None): 3809991055157975109,
-    (Point(row=11, col=18), Player.black): 4536826334969600224,
-    (Point(row=11, col=18), Player.white): 3467940166201482604,
-    (Point(row=11, col=18), None): 6463203547440926295,
-    (Point(row=11, col=19), Player.black): 4019421190875385013,
-    (Point(row=11, col=19), Player.white): 2146404711987345482,
-    (Point(row=11, col=19), None): 1130249343246449546,
-    (Point(row=12, col=1), Player.black): 2561400002105472428,
-    (Point(row=12, col=1), Player.white): 3461085747843044691,
-    (Point(row=12, col=1), None): 6514358924363502680,
-    (Point(row=12, col=2), Player.black): 4360069895815610866,
-    (Point(row=12, col=2), Player.white): 6500556781085332904,
-    (Point(row=12, col=2), None): 5286571795164469360,
-    (Point(row=12, col=3), Player.black): 8878064462058426389,
-    (Point(row=12, col=3), Player.white): 2858325371732134861,
-    (Point(row=12, col=3), None): 8041470291472694780,
-    (Point(row=12, col=4), Player.black): 2926933814564928952,
-    (Point(row=12, col=4), Player.white): 2350378711969925879,
-    (Point(row=12, col=4), None): 6412847090456701671,
-    (Point(row=12, col=5), Player.black): 1145875021570223133,
-    (Point(row=12, col=5), Player.white): 3730129316463398230,
-    (Point(row=12, col=5), None): 2160707593910786438,
-    (Point(row=12, col=6), Player.black): 1297932481965760843,
-    (Point(row=12, col=6), Player.white): 8030199495143300720,
-    (Point(row=12, col=6), None): 5853027979559661335,
-    (Point(row=12, col=7), Player.black): 3530489111116124661,
-    (Point(row=12, col=7), Player.white): 9015341781991144228,
-    (Point(row=12, col=7), None): 9153720990976713797,
-    (Point(row=12, col=8), Player.black): 7766134869216596748,
-    (Point(row=12, col=8), Player.white): 6491407605336114391,
-    (Point(row=12, col=8), None): 1724034296289485551,
-    (Point(row=12, col=9), Player.black): 8591860567990992356,
-    (Point(row=12, col=9), Player.white): 2615560381755971187,
-    (Point(row=12, col=9), None): 5860758694262245800,
-    (Point(row=12, col=10), Player.black): 4308120584918946847,
-    (Point(row=12, col=10), Player.white): 5157752872581719110,
-    (Point(row=12, col=10), None): 2835410982149698214,
-    (Point(row=12, col=11), Player.black): 260408022953752796,
-    (Point(row=12, col=11), Player.white): 3688711389265116674,
-    (Point(row=12, col=11), None): 7684496985436917560,
-    (Point(row=12, col=12), Player.black): 7776008388368475776,
-    (Point(row=12, col=12), Player.white): 5229643421494269242,
-    (Point(row=12, col=12), None): 3305553124146695323,
-    (Point(row=12, col=13), Player.black): 7525981538394746875,
-    (Point(row=12, col=13), Player.white): 7366639155589771906,
-    (Point(row=12, col=13), None): 4214488740347708685,
-    (Point(row=12, col=14), Player.black): 7850603389650137194,
-    (Point(row=12, col=14), Player.white): 3946196168593686066,
-    (Point(row=12, col=14), None): 1374844606074630905,
-    (Point(row=12, col=15), Player.black): 2670916108603905189,
-    (Point(row=12, col=15), Player.white): 6280081891582215407,
-    (Point(row=12, col=15), None): 4568995770474646576,
-    (Point(row=12, col=16), Player.black): 1695494449725265129,
-    (Point(row=12, col=16), Player.white): 3747228447553018507,
-    (Point(row=12, col=16), None): 5391427490822112091,
-    (Point(row=12, col=17), Player.black): 2044097321419716049,
-    (Point(row=12, col=17), Player.white): 2366059895533620038,
-    (Point(row=12, col=17), None): 4957753953669036979,
-    (Point(row=12, col=18), Player.black): 2593533196138802472,
-    (Point(row=12, col=18), Player.white): 5733687297099639505,
-    (Point(row=12, col=18), None): 6901566821763107290,
-    (Point(row=12, col=19), Player.black): 2267986110995370641,
-    (Point(row=12, col=19), Player.white): 7194757707566075192,
-    (Point(row=12, col=19), None): 3662963172870582944,
-    (Point(row=13, col=1), Player.black): 6133448933165464499,
-    (Point(row=13, col=1), Player.white): 3442062396923881116,
-    (Point(row=13, col=1), None): 4794369207125536970,
-    (Point(row=13, col=2), Player.black): 8201990891578071230,
-    (Point(row=13, col=2), Player.white): 5298106628516966936,
-    (Point(row=13, col=2), None): 6075607119619048568,
-    (Point(row=13, col=3), Player.black): 292622234256793743,
-    (Point(row=13, col=3), Player.white): 1262734540271512120,
-    (Point(row=13, col=3), None): 3886425741052280696,
-    (Point(row=13, col=4), Player.black): 4359932779099298235,
-    (Point(row=13, col=4), Player.white): 6747598651191828231,
-    (Point(row=13, col=4), None): 3983635448510558478,
-    (Point(row=13, col=5), Player.black): 7404444750156381465,
-    (Point(row=13, col=5), Player.white): 7490344885713430364,
-    (Point(row=13, col=5), None): 2819377871712203770,
-    (Point(row=13, col=6), Player.black): 1652535495502462477,
-    (Point(row=13, col=6), Player.white): 6943427357386235975,
-    (Point(row=13, col=6), None): 3017199942279277540,
-    (Point(row=13, col=7), Player.black): 6841948712319747035,
-    (Point(row=13, col=7), Player.white): 3010832382735537673,
-    (Point(row=13, col=7), None): 5337497693528966468,
-    (Point(row=13, col=8), Player.black): 8391490747163323156,
-    (Point(row=13, col=8), Player.white): 3110504411188397784,
-    (Point(row=13, col=8), None): 8227524443166009438,
-    (Point(row=13, col=9), Player.black): 4406514480515859930,
-    (Point(row=13, col=9), Player.white): 5688708150574380615,
-    (Point(row=13, col=9), None): 2482940998261210679,
-    (Point(row=13, col=10), Player.black): 201061481926373631,
-    (Point(row=13, col=10), Player.white): 5224349894158783372,
-    (Point(row=13, col=10), None): 1648983613390065781,
-    (Point(row=13, col=11), Player.black): 6101701386031636350,
-    (Point(row=13, col=11), Player.white): 8426882716855116757,
-    (Point(row=13, col=11), None): 1065576737389484726,
-    (Point(row=13, col=12), Player.black): 2845366298759793487,
-    (Point(row=13, col=12), Player.white): 2997904280448597241,
-    (Point(row=13, col=12), None): 176289045362096822,
-    (Point(row=13, col=13), Player.black): 8074224418457526270,
-    (Point(row=13, col=13), Player.white): 6976909894436622629,
-    (Point(row=13, col=13), None): 4056598616103110377,
-    (Point(row=13, col=14), Player.black): 3584631226410644372,
-    (Point(row=13, col=14), Player.white): 4929094067316644728,
-    (Point(row=13, col=14), None): 6486732255348688400,
-    (Point(row=13, col=15), Player.black): 907277430384167964,
-    (Point(row=13, col=15), Player.white): 3567599446304665709,
-    (Point(row=13, col=15), None): 7934543145755117265,
-    (Point(row=13, col=16), Player.black): 1068119460132384651,
-    (Point(row=13, col=16), Player.white): 6067284677831112313,
-    (Point(row=13, col=16), None): 6374781563070278293,
-    (Point(row=13, col=17), Player.black): 9177073097373007502,
-    (Point(row=13, col=17), Player.white): 9014355415733156146,
-    (Point(row=13, col=17), None): 8412920001104291389,
-    (Point(row=13, col=18), Player.black): 1811343081748161160,
-    (Point(row=13, col=18), Player.white): 1412699292951280363,
-    (Point(row=13, col=18), None): 3476105117744956212,
-    (Point(row=13, col=19), Player.black): 2811192602626803865,
-    (Point(row=13, col=19), Player.white): 3149794086512150389,
-    (Point(row=13, col=19), None): 2040565098925986057,
-    (Point(row=14, col=1), Player.black): 7833472668053634983,
-    (Point(row=14, col=1), Player.white): 9061298018384229613,
-    (Point(row=14, col=1), None): 587926876894042129,
-    (Point(row=14, col=2), Player.black): 5302916900735073911,
-    (Point(row=14, col=2), Player.white): 2215739070944237830,
-    (Point(row=14, col=2), None): 2987522081644532573,
-    (Point(row=14, col=3), Player.black): 370754040018192880,
-    (Point(row=14, col=3), Player.white): 172344820787183235,
-    (Point(row=14, col=3), None): 4309263799760573043,
-    (Point(row=14, col=4), Player.black): 3820611659160289598,
-    (Point(row=14, col=4), Player.white): 1915369652398319485,
-    (Point(row=14, col=4), None): 6174662792454833091,
-    (Point(row=14, col=5), Player.black): 3302743026672060535,
-    (Point(row=14, col=5), Player.white): 9028456261211381705,
-    (Point(row=14, col=5), None): 3529970911066612860,
-    (Point(row=14, col=6), Player.black): 7035362657619656391,
-    (Point(row=14, col=6), Player.white): 6966475764982208555,
-    (Point(row=14, col=6), None): 4214669158420953271,
-    (Point(row=14, col=7), Player.black): 7112741349818999483,
-    (Point(row=14, col=7), Player.white): 7686111675358048242,
-    (Point(row=14, col=7), None): 8351934753121814337,
-    (Point(row=14, col=8), Player.black): 5188750821912981830,
-    (Point(row=14, col=8), Player.white): 6438481387331595766,
-    (Point(row=14, col=8), None): 8918626326869776964,
-    (Point(row=14, col=9), Player.black): 1410717481466701073,
-    (Point(row=14, col=9), Player.white): 4432462463446622305,
-    (Point(row=14, col=9), None): 6574116295282506703,
-    (Point(row=14, col=10), Player.black): 5323049019027359006,
-    (Point(row=14, col=10), Player.white): 5633060584616839678,
-    (Point(row=14, col=10), None): 23997845466575162,
-    (Point(row=14, col=11), Player.black): 4386670696950522569,
-    (Point(row=14, col=11), Player.white): 3185804770485305988,
-    (Point(row=14, col=11), None): 3268629669406086611,
-    (Point(row=14, col=12), Player.black): 724476873403524343,
-    (Point(row=14, col=12), Player.white): 8900451812140132871,
-    (Point(row=14, col=12), None): 3055364418275968184,
-    (Point(row=14, col=13), Player.black): 9090503982008980916,
-    (Point(row=14, col=13), Player.white): 802621437508174930,
-    (Point(row=14, col=13), None): 2696334296819678898,
-    (Point(row=14, col=14), Player.black): 7745410394873213388,
-    (Point(row=14, col=14), Player.white): 6846364373476630930,
-    (Point(row=14, col=14), None): 6560785982660969418,
-    (Point(row=14, col=15), Player.black): 3194454677241824289,
-    (Point(row=14, col=15), Player.white): 8527023490473342504,
-    (Point(row=14, col=15), None): 2887829958492360172,
-    (Point(row=14, col=16), Player.black): 7623094560914729579,
-    (Point(row=14, col=16), Player.white): 1583269721205890837,
-    (Point(row=14, col=16), None): 6313463710189832701,
-    (Point(row=14, col=17), Player.black): 1748513823745659058,
-    (Point(row=14, col=17), Player.white): 5233210751476688940,
-    (Point(row=14, col=17), None): 3036921432126086103,
-    (Point(row=14, col=18), Player.black): 74888057897848042,
-    (Point(row=14, col=18), Player.white): 1673800350735022464,
-    (Point(row=14, col=18), None): 771696287816700982,
-    (Point(row=14, col=19), Player.black): 7529784459234576021,
-    (Point(row=14, col=19), Player.white): 1452525291432241270,
-    (Point(row=14, col=19), None): 8051763211966092498,
-    (Point(row=15, col=1), Player.black): 7003869187398907042,
-    (Point(row=15, col=1), Player.white): 4325555236933898052,
-    (Point(row=15, col=1), None): 1101921146285048396,
-    (Point(row=15, col=2), Player.black): 7747629834548637921,
-    (Point(row=15, col=2), Player.white): 5394516922590621356,
-    (Point(row=15, col=2), None): 8680793459447677780,
-    (Point(row=15, col=3), Player.black): 3220427114580035095,
-    (Point(row=15, col=3), Player.white): 7337163881900349121,
-    (Point(row=15, col=3), None): 5934301883226847436,
-    (Point(row=15, col=4), Player.black): 5459505881813103921,
-    (Point(row=15, col=4), Player.white): 7097214662632221678,
-    (Point(row=15, col=4), None): 4588763491988648719,
-    (Point(row=15, col=5), Player.black): 5836194286301947266,
-    (Point(row=15, col=5), Player.white): 7889115900828135753,
-    (Point(row=15, col=5), None): 7136216697056993296,
-    (Point(row=15, col=6), Player.black): 357026955895116854,
-    (Point(row=15, col=6), Player.white): 5524360904918805217,
-    (Point(row=15, col=6), None): 2394914898673585257,
-    (Point(row=15, col=7), Player.black): 7229409361328941755,
-    (Point(row=15, col=7), Player.white): 727227997028079747,
-    (Point(row=15, col=7), None): 966773319103784470,
-    (Point(row=15, col=8), Player.black): 248729003144247789,
-    (Point(row=15, col=8), Player.white): 239388432203935347,
-    (Point(row=15, col=8), None): 432337788252273406,
-    (Point(row=15, col=9), Player.black): 4950988171454514634,
-    (Point(row=15, col=9), Player.white): 1121239882494793482,
-    (Point(row=15, col=9), None): 6319738439973288320,
-    (Point(row=15, col=10), Player.black): 2879374362260521810,
-    (Point(row=15, col=10), Player.white): 1221920538403526834,
-    (Point(row=15, col=10), None): 7355233481141034825,
-    (Point(row=15, col=11), Player.black): 3755540987442186703,
-    (Point(row=15, col=11), Player.white): 6227712754101362248,
-    (Point(row=15, col=11), None): 1546573302863528397,
-    (Point(row=15, col=12), Player.black): 4785889492190126409,
-    (Point(row=15, col=12), Player.white): 2920515833505372290,
-    (Point(row=15, col=12), None): 1522498950012814958,
-    (Point(row=15, col=13), Player.black): 1444142366257244574,
-    (Point(row=15, col=13), Player.white): 4313592156430896428,
-    (Point(row=15, col=13), None): 4257676104829522792,
-    (Point(row=15, col=14), Player.black): 2940696403021532349,
-    (Point(row=15, col=14), Player.white): 634578218302040656,
-    (Point(row=15, col=14), None): 6904327938446840990,
-    (Point(row=15, col=15), Player.black): 4388968028932743137,
-    (Point(row=15, col=15), Player.white): 7206775395687259224,
-    (Point(row=15, col=15), None): 3770150248025481211,
-    (Point(row=15, col=16), Player.black): 8947041216479896500,
-    (Point(row=15, col=16), Player.white): 7973876729806988724,
-    (Point(row=15, col=16), None): 7283164328054772386,
-    (Point(row=15, col=17), Player.black): 7349466858772192775,
-    (Point(row=15, col=17), Player.white): 3812566463058932593,
-    (Point(row=15, col=17), None): 2548348944115839379,
-    (Point(row=15, col=18), Player.black): 5857453304818283290,
-    (Point(row=15, col=18), Player.white): 1924668625581728109,
-    (Point(row=15, col=18), None): 5730503413583800007,
-    (Point(row=15, col=19), Player.black): 5706450775803115118,
-    (Point(row=15, col=19), Player.white): 8078380365185639930,
-    (Point(row=15, col=19), None): 7165765280912596548,
-    (Point(row=16, col=1), Player.black): 2526810946132742290,
-    (Point(row=16, col=1), Player.white): 731170482216698653,
-    (Point(row=16, col=1), None): 6899128267032468425,
-    (Point(row=16, col=2), Player.black): 9111366424001103444,
-    (Point(row=16, col=2), Player.white): 8050239026991131656,
-    (Point(row=16, col=2), None): 8116532348406745992,
-    (Point(row=16, col=3), Player.black): 2896310462666555132,
-    (Point(row=16, col=3), Player.white): 5696941207079788773,
-    (Point(row=16, col=3), None): 2537634011249610593,
-    (Point(row=16, col=4), Player.black): 4826922666691721974,
-    (Point(row=16, col=4), Player.white): 4337854565105604807,
-    (Point(row=16, col=4), None): 2242205877721108313,
-    (Point(row=16, col=5), Player.black): 2720818269844098235,
-    (Point(row=16, col=5), Player.white): 3032572973237100004,
-    (Point(row=16, col=5), None): 270600985754308848,
-    (Point(row=16, col=6), Player.black): 3167327766508427524,
-    (Point(row=16, col=6), Player.white): 4141001864635624048,
-    (Point(row=16, col=6), None): 5867808043929929751,
-    (Point(row=16, col=7), Player.black): 8822928714970540345,
-    (Point(row=16, col=7), Player.white): 8067096877786347905,
-    (Point(row=16, col=7), None): 4134092916944352173,
-    (Point(row=16, col=8), Player.black): 4023278991795608634,
-    (Point(row=16, col=8), Player.white): 3448753166384688494,
-    (Point(row=16, col=8), None): 2828643892153741600,
-    (Point(row=16, col=9), Player.black): 2611558629267344203,
-    (Point(row=16, col=9), Player.white): 5490296941494943115,
-    (Point(row=16, col=9), None): 5980247950685141192,
-    (Point(row=16, col=10), Player.black): 3474247921524006858,
-    (Point(row=16, col=10), Player.white): 3665729698980435402,
-    (Point(row=16, col=10), None): 1328462602552349781,
-    (Point(row=16, col=11), Player.black): 543856919288742791,
-    (Point(row=16, col=11), Player.white): 4024819994220255356,
-    (Point(row=16, col=11), None): 5225740013247890759,
-    (Point(row=16, col=12), Player.black): 2756875439614072300,
-    (Point(row=16, col=12), Player.white): 1739088308590030443,
-    (Point(row=16, col=12), None): 1792751313869467198,
-    (Point(row=16, col=13), Player.black): 5093966589373477791,
-    (Point(row=16, col=13), Player.white): 6060826684759621942,
-    (Point(row=16, col=13), None): 6925348841946675207,
-    (Point(row=16, col=14), Player.black): 6194896993347609551,
-    (Point(row=16, col=14), Player.white): 2525292603171714017,
-    (Point(row=16, col=14), None): 7157305310278538288,
-    (Point(row=16, col=15), Player.black): 4284623317537843410,
-    (Point(row=16, col=15), Player.white): 6504651656540561202,
-    (Point(row=16, col=15), None): 9018717968673779647,
-    (Point(row=16, col=16), Player.black): 4413054924230152639,
-    (Point(row=16, col=16), Player.white): 6244842475862144397,
-    (Point(row=16, col=16), None): 2091994417182889533,
-    (Point(row=16, col=17), Player.black): 7637574317221715310,
-    (Point(row=16, col=17), Player.white): 631343926394782545,
-    (Point(row=16, col=17), None): 8875724850725440327,
-    (Point(row=16, col=18), Player.black): 6243250579238897666,
-    (Point(row=16, col=18), Player.white): 7720934455408246515,
-    (Point(row=16, col=18), None): 82557602590279175,
-    (Point(row=16, col=19), Player.black): 3447119931003798633,
-    (Point(row=16, col=19), Player.white): 6453436665292361617,
-    (Point(row=16, col=19), None): 650503081605961354,
-    (Point(row=17, col=1), Player.black): 2722508253474925761,
-    (Point(row=17, col=1), Player.white): 8761157470545868558,
-    (Point(row=17, col=1), None): 3154275415301564807,
-    (Point(row=17, col=2), Player.black): 1180043124726423726,
-    (Point(row=17, col=2), Player.white): 9040663814758282202,
-    (Point(row=17, col=2), None): 5442637029152299498,
-    (Point(row=17, col=3), Player.black): 6123611781341210829,
-    (Point(row=17, col=3), Player.white): 5127121219743535601,
-    (Point(row=17, col=3), None): 5768823939971375161,
-    (Point(row=17, col=4), Player.black): 5910056326829498180,
-    (Point(row=17, col=4), Player.white): 7259594293990858476,
-    (Point(row=17, col=4), None): 3437140631057640800,
-    (Point(row=17, col=5), Player.black): 8939902699397059934,
-    (Point(row=17, col=5), Player.white): 1481104885023178934,
-    (Point(row=17, col=5), None): 5211043005361045028,
-    (Point(row=17, col=6), Player.black): 4447915437285290334,
-    (Point(row=17, col=6), Player.white): 5490615625893525239,
-    (Point(row=17, col=6), None): 8728772712734695782,
-    (Point(row=17, col=7), Player.black): 7300235595612367880,
-    (Point(row=17, col=7), Player.white): 8886370991074362782,
-    (Point(row=17, col=7), None): 440188974888424591,
-    (Point(row=17, col=8), Player.black): 2964361734507084700,
-    (Point(row=17, col=8), Player.white): 363427525352455584,
-    (Point(row=17, col=8), None): 4434444210622242390,
-    (Point(row=17, col=9), Player.black): 3314621685668180728,
-    (Point(row=17, col=9), Player.white): 7808937474776890766,
-    (Point(row=17, col=9), None): 7773219006094921921,
-    (Point(row=17, col=10), Player.black): 8889912941308986856,
-    (Point(row=17, col=10), Player.white): 3621924812552178718,
-    (Point(row=17, col=10), None): 5315883401648990552,
-    (Point(row=17, col=11), Player.black): 4505499942876748266,
-    (Point(row=17, col=11), Player.white): 4735577002183225017,
-    (Point(row=17, col=11), None): 7708269433056633494,
-    (Point(row=17, col=12), Player.black): 6522405148571525745,
-    (Point(row=17, col=12), Player.white): 6608181018968798532,
-    (Point(row=17, col=12), None): 3959411623452257094,
-    (Point(row=17, col=13), Player.black): 6738487787384045391,
-    (Point(row=17, col=13), Player.white): 2953801291574031229,
-    (Point(row=17, col=13), None): 6311617844865515950,
-    (Point(row=17, col=14), Player.black): 242495466418129582,
-    (Point(row=17, col=14), Player.white): 8129163334780828790,
-    (Point(row=17, col=14), None): 3967640877707239723,
-    (Point(row=17, col=15), Player.black): 7265763733532657492,
-    (Point(row=17, col=15), Player.white): 7736781200904168950,
-    (Point(row=17, col=15), None): 7152907845053123546,
-    (Point(row=17, col=16), Player.black): 7053057209869896172,
-    (Point(row=17, col=16), Player.white): 5631194067116406953,
-    (Point(row=17, col=16), None): 2083170780441077907,
-    (Point(row=17, col=17), Player.black): 8356642364689068762,
-    (Point(row=17, col=17), Player.white): 5651714546374224629,
-    (Point(row=17, col=17), None): 4845882025616814613,
-    (Point(row=17, col=18), Player.black): 809721895249145607,
-    (Point(row=17, col=18), Player.white): 6930121202753945263,
-    (Point(row=17, col=18), None): 7730896899854331315,
-    (Point(row=17, col=19), Player.black): 3957074580200615993,
-    (Point(row=17, col=19), Player.white): 6601908618530578956,
-    (Point(row=17, col=19), None): 6114692377809132811,
-    (Point(row=18, col=1), Player.black): 8867306529631582159,
-    (Point(row=18, col=1), Player.white): 5525540241615153624,
-    (Point(row=18, col=1), None): 9114784462315682320,
-    (Point(row=18, col=2), Player.black): 7669637880413224337,
-    (Point(row=18, col=2), Player.white): 4745551060962859895,
-    (Point(row=18, col=2), None): 4156643900528528508,
-    (Point(row=18, col=3), Player.black): 4521800979027922113,
-    (Point(row=18, col=3), Player.white): 2070603905139925653,
-    (Point(row=18, col=3), None): 8513819115634332256,
-    (Point(row=18, col=4), Player.black): 7047644179684721322,
-    (Point(row=18, col=4), Player.white): 9042063185108201849,
-    (Point(row=18, col=4), None): 6063159293034418224,
-    (Point(row=18, col=5), Player.black): 5590712804000791207,
-    (Point(row=18, col=5), Player.white): 409671965774088741,
-    (Point(row=18, col=5), None): 1426448419333078327,
-    (Point(row=18, col=6), Player.black): 9062414289415404675,
-    (Point(row=18, col=6), Player.white): 3332773574685034442,
-    (Point(row=18, col=6), None): 7268477439126013263,
-    (Point(row=18, col=7), Player.black): 6788124496931259893,
-    (Point(row=18, col=7), Player.white): 6218448672409465015,
-    (Point(row=18, col=7), None): 5919663091845880350,
-    (Point(row=18, col=8), Player.black): 1270752458236868614,
-    (Point(row=18, col=8), Player.white): 7691484724410061593,
-    (Point(row=18, col=8), None): 3238155551176066053,
-    (Point(row=18, col=9), Player.black): 8082044089776231134,
-    (Point(row=18, col=9), Player.white): 2417499585030003443,
-    (Point(row=18, col=9), None): 4267304837680569509,
-    (Point(row=18, col=10), Player.black): 4558444778595395610,
-    (Point(row=18, col=10), Player.white): 2945447448206653808,
-    (Point(row=18, col=10), None): 7831207602587901005,
-    (Point(row=18, col=11), Player.black): 1146659842269684249,
-    (Point(row=18, col=11), Player.white): 1994774675475941071,
-    (Point(row=18, col=11), None): 335129597253939975,
-    (Point(row=18, col=12), Player.black): 4420632057712664296,
-    (Point(row=18, col=12), Player.white): 2923792388782283831,
-    (Point(row=18, col=12), None): 8734142863748325646,
-    (Point(row=18, col=13), Player.black): 4114992030589977833,
-    (Point(row=18, col=13), Player.white): 1030867863843733891,
-    (Point(row=18, col=13), None): 2582947606430485052,
-    (Point(row=18, col=14), Player.black): 366974167150889258,
-    (Point(row=18, col=14), Player.white): 7599888101972500703,
-    (Point(row=18, col=14), None): 7064905220591850833,
-    (Point(row=18, col=15), Player.black): 3171979828704761045,
-    (Point(row=18, col=15), Player.white): 2851939840287477990,
-    (Point(row=18, col=15), None): 4457168538045131373,
-    (Point(row=18, col=16), Player.black): 6401109608770301569,
-    (Point(row=18, col=16), Player.white): 8001316414091501458,
-    (Point(row=18, col=16), None): 7819776146004547701,
-    (Point(row=18, col=17), Player.black): 879798833734471458,
-    (Point(row=18, col=17), Player.white): 4480104325899216810,
-    (Point(row=18, col=17), None): 277132028288246673,
-    (Point(row=18, col=18), Player.black): 1116456043360602662,
-    (Point(row=18, col=18), Player.white): 6868052033329352418,
-    (Point(row=18, col=18), None): 2789150929969455967,
-    (Point(row=18, col=19), Player.black): 8935588733641613707,
-    (Point(row=18, col=19), Player.white): 5762894532205052524,
-    (Point(row=18, col=19), None): 109529841234657590,
-    (Point(row=19, col=1), Player.black): 4867280976710867552,
-    (Point(row=19, col=1), Player.white): 4920181791486992324,
-    (Point(row=19, col=1), None): 3383000458140850785,
-    (Point(row=19, col=2), Player.black): 7049056842530545447,
-    (Point(row=19, col=2), Player.white): 9024421967495544149,
-    (Point(row=19, col=2), None): 3679178815227677946,
-    (Point(row=19, col=3), Player.black): 7534799174189115015,
-    (Point(row=19, col=3), Player.white): 2208535380510898162,
-    (Point(row=19, col=3), None): 5400387401167261977,
-    (Point(row=19, col=4), Player.black): 3909437503827120662,
-    (Point(row=19, col=4), Player.white): 7106828336337613885,
-    (Point(row=19, col=4), None): 1647838534917222641,
-    (Point(row=19, col=5), Player.black): 1782714700602071665,
-    (Point(row=19, col=5), Player.white): 7375105089683180411,
-    (Point(row=19, col=5), None): 9188576386158144398,
-    (Point(row=19, col=6), Player.black): 4314194162847702935,
-    (Point(row=19, col=6), Player.white): 824828964625438096,
-    (Point(row=19, col=6), None): 7701034656972478449,
-    (Point(row=19, col=7), Player.black): 6880701498212913411,
-    (Point(row=19, col=7), Player.white): 2282242106200450456,
-    (Point(row=19, col=7), None): 2255390704438884866,
-    (Point(row=19, col=8), Player.black): 5640204121003850382,
-    (Point(row=19, col=8), Player.white): 3006711924758262429,
-    (Point(row=19, col=8), None): 403262188979288141,
-    (Point(row=19, col=9), Player.black): 7009176851554945837,
-    (Point(row=19, col=9), Player.white): 7830114569455205975,
-    (Point(row=19, col=9), None): 8938472662170637866,
-    (Point(row=19, col=10), Player.black): 8058437871397191595,
-    (Point(row=19, col=10), Player.white): 4487580339560271511,
-    (Point(row=19, col=10), None): 977848241975174416,
-    (Point(row=19, col=11), Player.black): 4555047143466318436,
-    (Point(row=19, col=11), Player.white): 2498715944101460533,
-    (Point(row=19, col=11), None): 4070273150437291636,
-    (Point(row=19, col=12), Player.black): 2541390793137988470,
-    (Point(row=19, col=12), Player.white): 8315555355545797807,
-    (Point(row=19, col=12), None): 3403075418660302903,
-    (Point(row=19, col=13), Player.black): 6884868981608697530,
-    (Point(row=19, col=13), Player.white): 2877863018310284304,
-    (Point(row=19, col=13), None): 8206057113165177976,
-    (Point(row=19, col=14), Player.black): 7026297466901085548,
-    (Point(row=19, col=14), Player.white): 5979802715200480651,
-    (Point(row=19, col=14), None): 220115616810563278,
-    (Point(row=19, col=15), Player.black): 7174410404928361530,
-    (Point(row=19, col=15), Player.white): 3613369735878629382,
-    (Point(row=19, col=15), None): 78520144431379617,
-    (Point(row=19, col=16), Player.black): 1844468542848134921,
-    (Point(row=19, col=16), Player.white): 4955393679576044904,
-    (Point(row=19, col=16), None): 5760737779546298292,
-    (Point(row=19, col=17), Player.black): 2175477201841512504,
-    (Point(row=19, col=17), Player.white): 543408644606328752,
-    (Point(row=19, col=17), None): 1937660370219524010,
-    (Point(row=19, col=18), Player.black): 5440147459539172721,
-    (Point(row=19, col=18), Player.white): 267231488012983750,
-    (Point(row=19, col=18), None): 62630166708910978,
-    (Point(row=19, col=19), Player.black): 192283441730003745,
-    (Point(row=19, col=19), Player.white): 1649321835461817954,
-    (Point(row=19, col=19), None): 4161922127693285894,
-}
 EMPTY_BOARD = 0
+
+COLOR_INDEX = {
+    None: 0,
+    Player.black: 1,
+    Player.white: 2,
+}
+
+
+def hash_table(num_rows, num_cols):
+    """Return the (num_rows * num_cols, 3) codes of a board, row-major.
+
+    Row (row - 1) * num_cols + (col - 1) holds the codes of an empty point,
+    a black stone and a white stone.
+    """
+    if not (0 < num_rows <= MAX_BOARD_SIZE and 0 < num_cols <= MAX_BOARD_SIZE):
+        raise ValueError(
+            'Zobrist tables cover boards up to %dx%d, not %dx%d' % (
+                MAX_BOARD_SIZE, MAX_BOARD_SIZE, num_rows, num_cols))
+    return TABLE[:num_rows, :num_cols].reshape(-1, 3)
+
+
+def hash_deltas(num_rows, num_cols):
+    """Return per-point XOR deltas as a row-major list of Python ints.
+
+    Entry [idx][color] turns the hash of an empty point into the hash of
+    a stone of that color (Player.value), and back again. Entry [idx][0]
+    is 0, so looking up an empty point is harmless.
+    """
+    table = hash_table(num_rows, num_cols)
+    deltas = np.zeros_like(table)
+    deltas[:, 1] = table[:, 0] ^ table[:, 1]
+    deltas[:, 2] = table[:, 0] ^ table[:, 2]
+    return [tuple(row) for row in deltas.tolist()]
+
+
+def situation_hash(board_hash, next_player):
+    """Combine a board hash with the side to move."""
+    if next_player == Player.white:
+        return board_hash ^ WHITE_TO_PLAY
+    return board_hash
+
+
+class _HashCodes():
+    """Read-only HASH_CODE[point, player] view of TABLE.
+
+    Kept for code written against the old dict literal.
+    """
+
+    def __getitem__(self, key):
+        point, state = key
+        if not (0 < point.row <= MAX_BOARD_SIZE and
+                0 < point.col <= MAX_BOARD_SIZE):
+            raise KeyError(key)
+        return int(TABLE[point.row - 1, point.col - 1, COLOR_INDEX[state]])
+
+
+HASH_CODE = _HashCodes()